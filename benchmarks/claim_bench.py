@@ -0,0 +1,58 @@
+"""Cost of serializing the claim again to check the signature of a DID token.
+
+Usage: python -m benchmarks.claim_bench [--iterations N]
+
+Compares the signed message of a decoded token, the raw claim string, to the
+claim serialized again from its dict, in time and in allocated bytes.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from magic_admin.resources.token import DecodedDIDToken
+from magic_admin.resources.token import Token
+from testing.data.did_token import future_did_token
+
+
+def bench(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    seconds = (time.perf_counter() - start) / iterations
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    token = Token.parse(future_did_token)
+    # A token built without its raw claim, like before the claim was kept.
+    reserialized_token = DecodedDIDToken(token.did_token, token.proof, token.claim)
+
+    assert token.signed_claim == reserialized_token.signed_claim
+
+    for name, func in (
+        ("raw claim", lambda: token.signed_claim),
+        ("reserialized claim", lambda: reserialized_token.signed_claim),
+    ):
+        seconds, peak = bench(func, args.iterations)
+        print(
+            "{:<20} {:>10.2f} us/token {:>8,} bytes allocated".format(
+                name,
+                seconds * 1e6,
+                peak,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
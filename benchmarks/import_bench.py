@@ -0,0 +1,46 @@
+"""Cold import time of the SDK, measured in fresh interpreters.
+
+Usage: python -m benchmarks.import_bench [--runs N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+STATEMENTS = [
+    "import magic_admin",
+    "from magic_admin.utils.signature import get_recovery_backend; "
+    "get_recovery_backend()",
+    "import web3",
+]
+
+
+def time_import(statement):
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            "import time; start = time.perf_counter(); {}; "
+            "print(time.perf_counter() - start)".format(statement),
+        ],
+    )
+
+    return float(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for statement in STATEMENTS:
+        timings = [time_import(statement) for _ in range(args.runs)]
+        print(
+            "{:>8.1f} ms  {}".format(statistics.median(timings) * 1e3, statement),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Per-token latency of the signature recovery backends.
+
+Usage: python -m benchmarks.recovery_bench [--iterations N]
+"""
+
+import argparse
+import json
+import time
+
+from magic_admin.utils.signature import RECOVERY_BACKENDS
+from testing.data.did_token import claim
+from testing.data.did_token import proof
+from testing.data.did_token import public_address
+
+
+def bench_backend(backend, message, iterations):
+    assert backend.recover(message, proof) == public_address
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        backend.recover(message, proof)
+
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    message = json.dumps(claim, separators=(",", ":"))
+    timings = {}
+
+    for backend_cls in RECOVERY_BACKENDS:
+        try:
+            backend = backend_cls()
+        except ImportError:
+            print("{:<10} not installed".format(backend_cls.name))
+            continue
+
+        timings[backend_cls.name] = bench_backend(backend, message, args.iterations)
+
+    baseline = timings.get("web3")
+
+    for name, seconds in timings.items():
+        print(
+            "{:<10} {:>10.1f} us/token{}".format(
+                name,
+                seconds * 1e6,
+                "  ({:.1f}x web3)".format(baseline / seconds) if baseline else "",
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""A local stand-in for the Magic API, so that the request benchmarks measure
+the SDK and not the network.
+"""
+
+import json
+import multiprocessing
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+
+RESPONSES = {
+    "/v1/admin/client": {
+        "data": {"client_id": "did:magic:731848cc-084e-41ff-bbdf-7f103817ea6b"},
+        "error_code": "",
+        "message": "",
+        "status": "ok",
+    },
+    "/v1/admin/user": {
+        "data": {
+            "email": "troll@goat.com",
+            "issuer": "did:ethr:0x4B73C58370AEfcEf86A6021afCDe5673511376B2",
+            "public_address": "0x4B73C58370AEfcEf86A6021afCDe5673511376B2",
+            "wallets": [],
+        },
+        "error_code": "",
+        "message": "",
+        "status": "ok",
+    },
+    "/v1/admin/user/logout": {
+        "data": {},
+        "error_code": "",
+        "message": "",
+        "status": "ok",
+    },
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Keep the connections alive, like the Magic API. Without TCP_NODELAY the
+    # body waits for the delayed ACK of the headers, ~40 ms per request.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    bodies = {path: json.dumps(resp).encode() for path, resp in RESPONSES.items()}
+
+    def _respond(self):
+        content_length = int(self.headers.get("Content-Length") or 0)
+
+        if content_length:
+            self.rfile.read(content_length)
+
+        body = self.bodies.get(self.path.split("?", 1)[0])
+        status = 200
+
+        if body is None:
+            body = b'{"status": "failed", "message": "not found"}'
+            status = 404
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(port_queue):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+class StubServer:
+    """Serve ``RESPONSES`` from another process, so that the server does not
+    compete with the benchmarked code for the GIL.
+
+    Use it as a context manager:
+
+        with StubServer() as base_url:
+            ...
+    """
+
+    def __init__(self):
+        port_queue = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_serve,
+            args=(port_queue,),
+            daemon=True,
+        )
+        self._process.start()
+        self.base_url = "http://127.0.0.1:{}".format(port_queue.get(timeout=10))
+
+    def __enter__(self):
+        return self.base_url
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._process.terminate()
+        self._process.join()
@@ -0,0 +1,245 @@
+"""Throughput and latency percentiles of the SDK hot paths, offline.
+
+Usage: python -m benchmarks.suite [--iterations N] [--filter NAME]
+                                  [--save PATH] [--compare PATH] [--threshold R]
+
+The requests go to a local stub of the Magic API. ``--save`` writes the results
+to a baseline file, and ``--compare`` reports the change from a baseline and
+exits with an error when a benchmark got slower than ``--threshold``.
+Baselines only compare runs on the same machine.
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+
+from benchmarks.stub_server import StubServer
+from magic_admin.error import DIDTokenInvalid
+from magic_admin.http_client import RequestsClient
+from magic_admin.resources.token import Token
+from magic_admin.resources.utils import Utils
+from magic_admin.resources.wallet import WalletType
+from magic_admin.utils.signature import get_recovery_backend
+from testing.data.did_token import claim
+from testing.data.did_token import future_did_token
+from testing.data.did_token import issuer
+
+
+PERCENTILES = [50, 90, 99]
+WARMUP_ITERATIONS = 20
+REGRESSION_THRESHOLD = 0.2
+
+
+def percentile(sorted_timings, percent):
+    """Nearest-rank percentile of sorted timings."""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_timings)))
+
+    return sorted_timings[rank - 1]
+
+
+def run_benchmark(func, iterations):
+    """
+    Args:
+        func (callable): The operation to time.
+        iterations (int): The number of timed calls.
+
+    Returns:
+        result (dict): The operations per second, then the latency percentiles
+            and maximum in microseconds.
+    """
+    for _ in range(WARMUP_ITERATIONS):
+        func()
+
+    clock = time.perf_counter_ns
+    timings = []
+
+    for _ in range(iterations):
+        start = clock()
+        func()
+        timings.append(clock() - start)
+
+    timings.sort()
+    result = {"ops_per_sec": iterations / (sum(timings) / 1e9)}
+
+    for percent in PERCENTILES:
+        result["p{}_us".format(percent)] = percentile(timings, percent) / 1e3
+
+    result["max_us"] = timings[-1] / 1e3
+
+    return result
+
+
+def get_benchmarks(base_url):
+    """
+    Returns:
+        benchmarks (list): (name, func, default iterations) of every hot path.
+    """
+    token = Token()
+    token.setup_client_id(claim["aud"])
+
+    cached_token = Token()
+    cached_token.setup_client_id(claim["aud"])
+    cached_token.setup_verified_token_cache(16)
+
+    # Rejected before the signature recovery.
+    other_client_token = Token()
+    other_client_token.setup_client_id("did:magic:troll_goat")
+
+    def validate_rejected():
+        try:
+            other_client_token.validate(future_did_token)
+        except DIDTokenInvalid:
+            pass
+
+    utils = Utils()
+    authorization_header = "Bearer {}".format(future_did_token)
+
+    client = RequestsClient(retries=0, timeout=5, backoff_factor=0)
+    # Serve the stub through the pooled adapter, like the Magic API.
+    client.http.mount(base_url, client._adapter)
+    user_url = base_url + "/v1/admin/user"
+    params = {"issuer": issuer, "wallet_type": WalletType.NONE}
+
+    return [
+        ("Token.decode", lambda: Token.decode(future_did_token), 20000),
+        ("Token.validate", lambda: token.validate(future_did_token), 300),
+        (
+            "Token.validate[cached]",
+            lambda: cached_token.validate(future_did_token),
+            20000,
+        ),
+        ("Token.validate[rejected]", validate_rejected, 20000),
+        (
+            "Token.try_validate[rejected]",
+            lambda: other_client_token.try_validate(future_did_token),
+            20000,
+        ),
+        (
+            "Utils.parse_authorization_header",
+            lambda: utils.parse_authorization_header(authorization_header),
+            100000,
+        ),
+        (
+            "RequestsClient.request",
+            lambda: client.request(
+                "get",
+                user_url,
+                params=params,
+                api_secret_key="sk_live_benchmark",
+            ),
+            2000,
+        ),
+    ]
+
+
+def format_change(result, baseline, threshold):
+    """
+    Returns:
+        change (str): The change of the median latency from the baseline.
+        regressed (bool): Whether it grew by more than the threshold.
+    """
+    if baseline is None:
+        return "", False
+
+    change = result["p50_us"] / baseline["p50_us"] - 1
+    regressed = change > threshold
+
+    return (
+        "{:+.1%}{}".format(change, "  REGRESSION" if regressed else ""),
+        regressed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        help="The number of timed calls of every benchmark.",
+    )
+    parser.add_argument(
+        "--filter",
+        default="",
+        help="Only run the benchmarks whose name contains this.",
+    )
+    parser.add_argument("--save", help="Save the results to this baseline file.")
+    parser.add_argument("--compare", help="Compare the results to this baseline.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=REGRESSION_THRESHOLD,
+        help="The median latency growth reported as a regression.",
+    )
+    args = parser.parse_args()
+
+    baselines = {}
+
+    if args.compare:
+        with open(args.compare) as f:
+            baselines = json.load(f)["results"]
+
+    results = {}
+    regressions = []
+
+    print(
+        "{:<34} {:>12} {:>10} {:>10} {:>10} {:>10}  {}".format(
+            "benchmark",
+            "ops/s",
+            "p50 us",
+            "p90 us",
+            "p99 us",
+            "max us",
+            "vs baseline" if args.compare else "",
+        ),
+    )
+
+    with StubServer() as base_url:
+        for name, func, iterations in get_benchmarks(base_url):
+            if args.filter not in name:
+                continue
+
+            result = run_benchmark(func, args.iterations or iterations)
+            results[name] = result
+            change, regressed = format_change(
+                result,
+                baselines.get(name),
+                args.threshold,
+            )
+
+            if regressed:
+                regressions.append(name)
+
+            print(
+                "{:<34} {:>12,.0f} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f}  {}".format(
+                    name,
+                    result["ops_per_sec"],
+                    result["p50_us"],
+                    result["p90_us"],
+                    result["p99_us"],
+                    result["max_us"],
+                    change,
+                ),
+            )
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "recovery_backend": get_recovery_backend().name,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if regressions:
+        sys.exit("Regressed: {}".format(", ".join(regressions)))
+
+
+if __name__ == "__main__":
+    main()
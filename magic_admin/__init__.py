@@ -1,8 +1,12 @@
+from magic_admin.async_magic import AsyncMagic  # noqa: F401
 from magic_admin.magic import Magic  # noqa: F401
 
 
-# Magic API secret key.
-api_secret_key = None
-
 # A grace period time in second applied to the nbf field for token validation.
 did_token_nbf_grace_period_s = 300
+
+# Deprecated: the API secret key and the client ID of the last created Magic
+# instance, for the code written when they were shared by the whole process.
+# Every Magic instance uses its own.
+api_secret_key = None
+client_id = None
@@ -0,0 +1,266 @@
+import asyncio
+import json
+import time
+
+from magic_admin.error import MagicError
+from magic_admin.http_client import BaseHTTPClient
+from magic_admin.utils.hooks import REQUEST_EVENT
+
+
+aiohttp_missing_message = (
+    "aiohttp is required for the asyncio client. Please install it with "
+    "`pip install magic-admin[aiohttp]`."
+)
+
+
+class AiohttpClient(BaseHTTPClient):
+    """An asyncio HTTP client built on a pooled ``aiohttp.ClientSession``.
+
+    The session is created on the first request, inside the running event loop,
+    and has to be released with ``close``.
+    """
+
+    def __init__(
+        self,
+        retries,
+        timeout,
+        backoff_factor,
+        pool_maxsize=100,
+        keep_alive=True,
+        rate_limit=None,
+        rate_limit_burst=None,
+        retry_policy=None,
+        hooks=None,
+    ):
+        super().__init__(
+            retries,
+            timeout,
+            backoff_factor,
+            rate_limit=rate_limit,
+            rate_limit_burst=rate_limit_burst,
+            retry_policy=retry_policy,
+            hooks=hooks,
+        )
+
+        self._pool_maxsize = pool_maxsize
+        self._keep_alive = keep_alive
+        self._session = None
+        self._retryable_errors = (asyncio.TimeoutError,)
+        # The retryable errors raised before the request was sent.
+        self._connect_errors = ()
+
+        # Counted by the client, aiohttp does not expose them.
+        self._in_flight = 0
+        self._num_connections = 0
+        self._num_requests = 0
+
+    def _setup_request_session(self):
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError(aiohttp_missing_message)
+
+        # Time the connections opened, for the request hooks.
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(
+            self._on_connection_create_start,
+        )
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self._pool_maxsize,
+                force_close=not self._keep_alive,
+            ),
+            timeout=aiohttp.ClientTimeout(total=self._timeout),
+            trace_configs=[trace_config],
+        )
+        self._retryable_errors = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+        self._connect_errors = (aiohttp.ClientConnectorError,)
+
+    @staticmethod
+    async def _on_connection_create_start(session, trace_config_ctx, params):
+        trace_config_ctx.connect_start = time.perf_counter()
+
+    async def _on_connection_create_end(self, session, trace_config_ctx, params):
+        self._num_connections += 1
+        trace_config_ctx.trace_request_ctx["connect_time"] += (
+            time.perf_counter() - trace_config_ctx.connect_start
+        )
+
+    def get_pool_stats(self):
+        """See ``RequestsClient.get_pool_stats``. aiohttp shares one connection
+        limit across hosts. The requests ``in_use`` are the ones in flight, each
+        holding a connection, and the ``idle`` connections are not known.
+        """
+        if self._session is None:
+            return []
+
+        return [
+            {
+                "host": None,
+                "maxsize": self._session.connector.limit,
+                "in_use": self._in_flight,
+                "idle": None,
+                "num_connections": self._num_connections,
+                "num_requests": self._num_requests,
+            },
+        ]
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @staticmethod
+    def _encode_params(params):
+        """Convert the query parameters the way ``requests`` does, so that both
+        clients send the same requests: None values are dropped and the other
+        values are sent as strings.
+        """
+        if not params:
+            return None
+
+        return [
+            (key, value if isinstance(value, str) else str(value))
+            for key, value in params.items()
+            if value is not None
+        ]
+
+    async def _send(self, method, url, params, data, headers, timings):
+        self._in_flight += 1
+        self._num_requests += 1
+
+        try:
+            resp = await self._session.request(
+                method,
+                url,
+                params=self._encode_params(params),
+                json=data,
+                headers=headers,
+                trace_request_ctx=timings,
+            )
+            timings["headers_received"] = time.perf_counter()
+
+            try:
+                content = await resp.read()
+            finally:
+                resp.release()
+        finally:
+            self._in_flight -= 1
+
+        return resp.status, resp.headers, content
+
+    async def request(self, method, url, params=None, data=None, api_secret_key=None):
+        headers = self._get_request_headers(api_secret_key)
+        rate_limiter = self._get_rate_limiter(api_secret_key)
+
+        if self._session is None:
+            self._setup_request_session()
+
+        retry_policy = self._retry_policy
+        start = time.perf_counter()
+        timings = {"connect_time": 0, "headers_received": None}
+        status_code = None
+        retry_number = 0
+        backoff = 0
+        waited = 0
+        request_error = None
+
+        try:
+            while True:
+                if rate_limiter is not None:
+                    await rate_limiter.acquire_async()
+
+                error = None
+                retry_after = None
+
+                try:
+                    status_code, resp_headers, content = await self._send(
+                        method,
+                        url,
+                        params,
+                        data,
+                        headers,
+                        timings,
+                    )
+                except self._retryable_errors as e:
+                    # A request that may have been sent, e.g. one that timed out
+                    # waiting for the response, is only retried if it is
+                    # idempotent.
+                    if not retry_policy.is_idempotent(method) and not isinstance(
+                        e,
+                        self._connect_errors,
+                    ):
+                        return self._handle_request_error(e)
+
+                    error = e
+                except Exception as e:
+                    return self._handle_request_error(e)
+
+                if error is None:
+                    self._update_rate_limiter(
+                        rate_limiter,
+                        status_code,
+                        resp_headers.get("Retry-After"),
+                    )
+
+                    if not retry_policy.is_retryable_status(method, status_code):
+                        break
+
+                    retry_after = retry_policy.get_retry_after(
+                        resp_headers.get("Retry-After"),
+                    )
+
+                # The waits of the ``PolicyRetry`` of the ``RequestsClient``.
+                if retry_after is None:
+                    wait = retry_policy.get_backoff(backoff)
+                else:
+                    wait = retry_after
+
+                if (
+                    retry_number >= retry_policy.retries
+                    or (
+                        retry_after is not None
+                        and not retry_policy.accepts_retry_after(retry_after)
+                    )
+                    or not retry_policy.fits_budget(waited, wait)
+                ):
+                    if error is not None:
+                        return self._handle_request_error(error)
+
+                    # Map the last response to an error.
+                    break
+
+                if retry_after is None:
+                    backoff = wait
+
+                retry_number += 1
+                waited += wait
+                retry_policy.record_retry(error)
+                await asyncio.sleep(wait)
+
+            return self._convert_to_api_response(
+                status_code,
+                content,
+                json.loads(content),
+                method.upper(),
+                params,
+                data,
+            )
+        except MagicError as e:
+            request_error = e
+            raise
+        finally:
+            if self.hooks.has_callbacks(REQUEST_EVENT):
+                headers_received = timings["headers_received"]
+                self._emit_request_event(
+                    method,
+                    url,
+                    status_code,
+                    retry_number,
+                    timings["connect_time"],
+                    None if headers_received is None else headers_received - start,
+                    start,
+                    request_error,
+                )
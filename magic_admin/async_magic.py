@@ -0,0 +1,129 @@
+from magic_admin.async_http_client import AiohttpClient
+from magic_admin.magic import BACKOFF_FACTOR
+from magic_admin.magic import KEEP_ALIVE
+from magic_admin.magic import Magic
+from magic_admin.magic import RATE_LIMIT
+from magic_admin.magic import RETRIES
+from magic_admin.magic import TIMEOUT
+from magic_admin.resources.async_utils import OWNERSHIP_CHECK_LIMIT
+from magic_admin.resources.base import AsyncResourceComponent
+from magic_admin.utils.contract import AsyncContractPool
+
+
+POOL_MAXSIZE = 100
+
+
+class AsyncMagic(Magic):
+    """The asyncio counterpart of ``Magic``. The API resources are served over a
+    pooled ``aiohttp`` session and their methods are coroutines.
+
+    Use it as an async context manager so that the client ID is fetched, when it
+    is not given, and the HTTP sessions are closed:
+
+        async with AsyncMagic(api_secret_key=...) as magic:
+            await magic.User.get_metadata_by_issuer(issuer)
+    """
+
+    def __init__(
+        self,
+        api_secret_key=None,
+        client_id=None,
+        retries=RETRIES,
+        timeout=TIMEOUT,
+        backoff_factor=BACKOFF_FACTOR,
+        pool_maxsize=POOL_MAXSIZE,
+        keep_alive=KEEP_ALIVE,
+        rate_limit=RATE_LIMIT,
+        rate_limit_burst=None,
+        retry_policy=None,
+        hooks=None,
+        ownership_check_limit=OWNERSHIP_CHECK_LIMIT,
+        request_client=None,
+    ):
+        """
+        Args:
+            pool_maxsize (int): The maximum number of connections open at once.
+            keep_alive (bool): Whether to reuse connections across requests.
+            ownership_check_limit (int): The maximum number of on-chain token
+                ownership checks in flight at once.
+            request_client (AiohttpClient): A request client to share with other
+                AsyncMagic instances. It is not closed by ``close``.
+
+        See ``Magic`` for the other arguments.
+        """
+        self._set_api_secret_key(api_secret_key)
+
+        # Whether the HTTP session and the RPC sessions are this instance's to
+        # close, rather than shared with the instance that created them.
+        self._owns_sessions = request_client is None
+        self._request_client = request_client or AiohttpClient(
+            retries,
+            timeout,
+            backoff_factor,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+            rate_limit=rate_limit,
+            rate_limit_burst=rate_limit_burst,
+            retry_policy=retry_policy,
+            hooks=hooks,
+        )
+        self.hooks = self._request_client.hooks
+
+        self._resource = AsyncResourceComponent()
+        self._resource.setup_resources(
+            self._request_client,
+            self._api_secret_key,
+            hooks=self.hooks,
+        )
+        self._resource.Token.setup_client_id(client_id)
+        self._resource.Utils.setup_ownership_check_limit(ownership_check_limit)
+
+        if self._owns_sessions:
+            self._resource.Utils.contract_pool = AsyncContractPool()
+
+    async def __aenter__(self):
+        await self.setup_client_id()
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def setup_client_id(self):
+        """Fetch the client ID used to check the "aud" field of DID tokens, if it
+        was not given to the constructor.
+        """
+        token = self._resource.Token
+
+        if token._client_id is None:
+            token.setup_client_id(
+                (
+                    await self._request_client.request(
+                        "get",
+                        self.v1_client_info,
+                        api_secret_key=self._api_secret_key,
+                    )
+                ).data["client_id"],
+            )
+
+    def for_tenant(self, api_secret_key, client_id=None):
+        """See ``Magic.for_tenant``. The instance also shares the RPC sessions
+        and the ownership check limit of this instance.
+        """
+        magic = super().for_tenant(api_secret_key, client_id=client_id)
+        magic.Utils.setup_ownership_check_limit(self.Utils.ownership_check_limit)
+        magic.Utils.contract_pool = self.Utils.contract_pool
+
+        return magic
+
+    async def close(self):
+        """Close the HTTP session and the RPC sessions of the token ownership
+        checks, if this instance created them. An instance given a request
+        client, e.g. by ``for_tenant``, closes nothing, the instance owning it
+        does.
+        """
+        if not self._owns_sessions:
+            return
+
+        await self._request_client.close()
+        await self._resource.Utils.contract_pool.disconnect()
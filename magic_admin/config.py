@@ -7,3 +7,11 @@ api_secret_api_key_missing_message = (
     "get your API secret key from https://dashboard.magic.link. If you are having "
     "trouble, please don't hesitate to reach out to us at support@magic.link"
 )
+
+client_id_missing_message = (
+    "The client ID is unknown and cannot be fetched without a request client. "
+    "Please specify it when you instantiate `Magic(client_id=<ID>)` or "
+    "`AsyncMagic(client_id=<ID>)`, or fetch it with `await "
+    "magic.setup_client_id()` before validating DID tokens with `AsyncMagic`, "
+    "which `async with AsyncMagic(...)` does."
+)
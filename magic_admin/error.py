@@ -28,6 +28,14 @@ class DIDTokenExpired(MagicError):
     pass
 
 
+class DIDTokenSignatureMismatch(DIDTokenInvalid):
+    pass
+
+
+class DIDTokenAudienceMismatch(DIDTokenInvalid):
+    pass
+
+
 class ExpectedBearerStringError(MagicError):
     pass
 
@@ -36,6 +44,10 @@ class APIConnectionError(MagicError):
     pass
 
 
+class CacheBackendError(MagicError):
+    pass
+
+
 class RequestError(MagicError):
     def __init__(
         self,
@@ -1,11 +1,17 @@
 import json
 import platform
+import threading
+import time
+from urllib.parse import urlsplit
 
 from requests import Session
+from requests.adapters import DEFAULT_POOLSIZE
 from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
+from requests.packages.urllib3.connection import HTTPConnection
+from requests.packages.urllib3.connection import HTTPSConnection
+from requests.packages.urllib3.connectionpool import HTTPConnectionPool
+from requests.packages.urllib3.connectionpool import HTTPSConnectionPool
 
-import magic_admin
 from magic_admin import version
 from magic_admin.config import api_secret_api_key_missing_message
 from magic_admin.config import base_url
@@ -14,17 +20,81 @@ from magic_admin.error import APIError
 from magic_admin.error import AuthenticationError
 from magic_admin.error import BadRequestError
 from magic_admin.error import ForbiddenError
+from magic_admin.error import MagicError
 from magic_admin.error import RateLimitingError
 from magic_admin.response import MagicResponse
+from magic_admin.utils.hooks import REQUEST_EVENT
+from magic_admin.utils.hooks import Hooks
+from magic_admin.utils.hooks import RequestEvent
+from magic_admin.utils.rate_limit import RateLimiter
+from magic_admin.utils.retry import RetryPolicy
 
 
-class RequestsClient:
-    def __init__(self, retries, timeout, backoff_factor):
+# The time the current thread spent opening connections during a request.
+_connect_timer = threading.local()
+# The rate limiter of the request sent by the current thread, for its retries.
+_request_rate_limiter = threading.local()
+
+
+def _get_request_rate_limiter():
+    return getattr(_request_rate_limiter, "value", None)
+
+
+class _TimedConnectionMixin:
+    def connect(self):
+        start = time.perf_counter()
+
+        try:
+            super().connect()
+        finally:
+            _connect_timer.elapsed = (
+                getattr(_connect_timer, "elapsed", 0) + time.perf_counter() - start
+            )
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class BaseHTTPClient:
+    """Request headers and error mapping shared by the HTTP clients."""
+
+    def __init__(
+        self,
+        retries,
+        timeout,
+        backoff_factor,
+        rate_limit=None,
+        rate_limit_burst=None,
+        retry_policy=None,
+        hooks=None,
+    ):
         self._retries = retries
         self._timeout = timeout
         self._backoff_factor = backoff_factor
+        self._rate_limit = rate_limit
+        self._rate_limit_burst = rate_limit_burst
+        self._retry_policy = retry_policy or RetryPolicy(retries, backoff_factor)
+        self.hooks = hooks if hooks is not None else Hooks()
 
-        self._setup_request_session()
+        # The request headers and rate limiters per API secret key. A client
+        # can be shared by the Magic instances of several apps, each sending
+        # its own secret key.
+        self._request_headers = {}
+        self._rate_limiters = {}
+        self._user_agent = None
 
     @staticmethod
     def _get_platform_info():
@@ -44,65 +114,119 @@ class RequestsClient:
 
         return platform_info
 
-    def _setup_request_session(self):
-        """Take advantage of the ``requests.Session``. If client is making several
-        requests to the same host, the underlying TCP connection will be reused,
-        which can result in a significant performance increase.
+    def _get_user_agent(self):
+        """The platform info does not change for the life of the process, so the
+        User-Agent is computed once per client.
         """
-        self.http = Session()
-        self.http.mount(
-            base_url,
-            HTTPAdapter(
-                max_retries=Retry(
-                    total=self._retries,
-                    backoff_factor=self._backoff_factor,
-                ),
-            ),
-        )
+        if self._user_agent is None:
+            self._user_agent = json.dumps(
+                {
+                    "language": "python",
+                    "sdk_version": version.VERSION,
+                    "publisher": "magic",
+                    "http_lib": self.__class__.__name__,
+                    **self._get_platform_info(),
+                }
+            )
 
-    def _get_request_headers(self):
-        user_agent = {
-            "language": "python",
-            "sdk_version": version.VERSION,
-            "publisher": "magic",
-            "http_lib": self.__class__.__name__,
-            **self._get_platform_info(),
-        }
+        return self._user_agent
 
-        if magic_admin.api_secret_key is None:
+    def _get_request_headers(self, api_secret_key):
+        if api_secret_key is None:
             raise AuthenticationError(api_secret_api_key_missing_message)
 
-        return {
-            "X-Magic-Secret-Key": magic_admin.api_secret_key,
-            "User-Agent": json.dumps(user_agent),
-        }
+        headers = self._request_headers.get(api_secret_key)
 
-    def request(self, method, url, params=None, data=None):
-        try:
-            api_resp = self.http.request(
-                method,
-                url,
-                params=params,
-                # Requests auto-converts this to JSON and add content-type
-                # `application/json`.
-                json=data,
-                headers=self._get_request_headers(),
-                timeout=self._timeout,
+        if headers is None:
+            headers = {
+                "X-Magic-Secret-Key": api_secret_key,
+                "User-Agent": self._get_user_agent(),
+            }
+            self._request_headers[api_secret_key] = headers
+
+        return headers
+
+    def _get_rate_limiter(self, api_secret_key):
+        """
+        Returns:
+            rate_limiter (RateLimiter): The rate limiter shared by the requests
+                sent with the API secret key, or None if the requests are not
+                rate limited.
+        """
+        if self._rate_limit is None:
+            return None
+
+        rate_limiter = self._rate_limiters.get(api_secret_key)
+
+        if rate_limiter is None:
+            rate_limiter = self._rate_limiters.setdefault(
+                api_secret_key,
+                RateLimiter(self._rate_limit, burst=self._rate_limit_burst),
             )
-        except Exception as e:
-            return self._handle_request_error(e)
 
-        return self._parse_and_convert_to_api_response(
-            api_resp,
-            params,
-            data,
+        return rate_limiter
+
+    def _update_rate_limiter(self, rate_limiter, status_code, retry_after):
+        if rate_limiter is None:
+            return
+
+        rate_limiter.on_response(
+            status_code,
+            self._retry_policy.get_retry_after(retry_after),
         )
 
-    def _parse_and_convert_to_api_response(self, resp, request_params, request_data):
-        status_code = resp.status_code
+    def _emit_request_event(
+        self,
+        method,
+        url,
+        status_code,
+        retries,
+        connect_time,
+        ttfb,
+        start,
+        error,
+    ):
+        self.hooks.emit(
+            REQUEST_EVENT,
+            RequestEvent(
+                method.upper(),
+                urlsplit(url).path,
+                status_code,
+                retries,
+                connect_time,
+                ttfb,
+                time.perf_counter() - start,
+                error=error,
+            ),
+        )
+
+    def get_retry_stats(self):
+        """See ``RetryPolicy.get_stats``."""
+        return self._retry_policy.get_stats()
 
+    def _handle_request_error(self, e):
+        message = (
+            "Unexpected error thrown while communicating to Magic. "
+            "Please reach out to support@magic.link if the problem continues. "
+            "Error message: {error_class} was raised - {error_message}".format(
+                error_class=e.__class__.__name__,
+                error_message=str(e) or "no error message.",
+            )
+        )
+
+        raise APIConnectionError(message)
+
+    def _convert_to_api_response(
+        self,
+        status_code,
+        content,
+        resp_data,
+        method,
+        request_params,
+        request_data,
+    ):
         if 200 <= status_code < 300:
-            return MagicResponse(resp.content, resp.json(), status_code)
+            return MagicResponse(content, resp_data, status_code)
 
         if status_code == 429:
             error_class = RateLimitingError
@@ -115,7 +239,6 @@ class RequestsClient:
         else:
             error_class = APIError
 
-        resp_data = resp.json()
         raise error_class(
             http_status=resp_data.get("status"),
             http_code=status_code,
@@ -124,17 +247,183 @@ class RequestsClient:
             http_error_code=resp_data.get("error_code"),
             http_request_params=request_params,
             http_request_data=request_data,
-            http_method=resp.request.method,
+            http_method=method,
         )
 
-    def _handle_request_error(self, e):
-        message = (
-            "Unexpected error thrown while communicating to Magic. "
-            "Please reach out to support@magic.link if the problem continues. "
-            "Error message: {error_class} was raised - {error_message}".format(
-                error_class=e.__class__.__name__,
-                error_message=str(e) or "no error message.",
+
+class RequestsClient(BaseHTTPClient):
+    def __init__(
+        self,
+        retries,
+        timeout,
+        backoff_factor,
+        pool_connections=DEFAULT_POOLSIZE,
+        pool_maxsize=DEFAULT_POOLSIZE,
+        pool_block=False,
+        keep_alive=True,
+        rate_limit=None,
+        rate_limit_burst=None,
+        retry_policy=None,
+        hooks=None,
+    ):
+        super().__init__(
+            retries,
+            timeout,
+            backoff_factor,
+            rate_limit=rate_limit,
+            rate_limit_burst=rate_limit_burst,
+            retry_policy=retry_policy,
+            hooks=hooks,
+        )
+
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._pool_block = pool_block
+        self._keep_alive = keep_alive
+
+        self._setup_request_session()
+
+    def _setup_request_session(self):
+        """Take advantage of the ``requests.Session``. If client is making several
+        requests to the same host, the underlying TCP connection will be reused,
+        which can result in a significant performance increase.
+        """
+        self.http = Session()
+        self._adapter = HTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            pool_block=self._pool_block,
+            max_retries=self._retry_policy.to_urllib3_retry(
+                get_rate_limiter=_get_request_rate_limiter,
+            ),
+        )
+        # Time the connections opened, for the request hooks.
+        self._adapter.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+        self.http.mount(base_url, self._adapter)
+
+        if not self._keep_alive:
+            self.http.headers["Connection"] = "close"
+
+    def get_pool_stats(self):
+        """Report how the connection pools are used, to help sizing them. A pool
+        whose ``in_use`` reaches ``maxsize`` makes requests wait (``pool_block``)
+        or open throwaway connections.
+
+        Returns:
+            pool_stats (list): A dict per host with the ``maxsize`` of its pool,
+                the connections ``in_use`` and ``idle``, and the number of
+                connections opened and requests sent so far.
+        """
+        pool_stats = []
+        pools = self._adapter.poolmanager.pools
+
+        for key in pools.keys():
+            pool = pools.get(key)
+
+            if pool is None or pool.pool is None:
+                continue
+
+            queued = list(pool.pool.queue)
+            pool_stats.append(
+                {
+                    "host": pool.host,
+                    "maxsize": pool.pool.maxsize,
+                    # The queue holds a connection or a None placeholder for
+                    # every connection that is not checked out.
+                    "in_use": pool.pool.maxsize - len(queued),
+                    "idle": sum(1 for conn in queued if conn is not None),
+                    "num_connections": pool.num_connections,
+                    "num_requests": pool.num_requests,
+                }
+            )
+
+        return pool_stats
+
+    def request(self, method, url, params=None, data=None, api_secret_key=None):
+        headers = self._get_request_headers(api_secret_key)
+        rate_limiter = self._get_rate_limiter(api_secret_key)
+
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+
+        start = time.perf_counter()
+        _connect_timer.elapsed = 0
+        _request_rate_limiter.value = rate_limiter
+        api_resp = None
+        error = None
+
+        try:
+            try:
+                api_resp = self.http.request(
+                    method,
+                    url,
+                    params=params,
+                    # Requests auto-converts this to JSON and add content-type
+                    # `application/json`.
+                    json=data,
+                    headers=headers,
+                    timeout=self._timeout,
+                )
+            except Exception as e:
+                return self._handle_request_error(e)
+
+            self._update_rate_limiter(
+                rate_limiter,
+                api_resp.status_code,
+                api_resp.headers.get("Retry-After"),
+            )
+
+            return self._parse_and_convert_to_api_response(
+                api_resp,
+                params,
+                data,
             )
+        except MagicError as e:
+            error = e
+            raise
+        finally:
+            if self.hooks.has_callbacks(REQUEST_EVENT):
+                self._emit_request_event(
+                    method,
+                    url,
+                    *self._get_response_timings(api_resp),
+                    start,
+                    error,
+                )
+
+    @staticmethod
+    def _get_response_timings(api_resp):
+        """
+        Returns:
+            status_code (int): The status of the response.
+            retries (int): The number of retries done by urllib3.
+            connect_time (float): The time spent opening connections.
+            ttfb (float): The time to the response headers.
+        """
+        connect_time = _connect_timer.elapsed
+
+        if api_resp is None:
+            return None, None, connect_time, None
+
+        retry = getattr(api_resp.raw, "retries", None)
+
+        return (
+            api_resp.status_code,
+            len(retry.history) if retry is not None else None,
+            connect_time,
+            # Measured by requests up to the parsing of the headers.
+            api_resp.elapsed.total_seconds(),
         )
 
-        raise APIConnectionError(message)
+    def _parse_and_convert_to_api_response(self, resp, request_params, request_data):
+        return self._convert_to_api_response(
+            resp.status_code,
+            resp.content,
+            resp.json(),
+            resp.request.method,
+            request_params,
+            request_data,
+        )
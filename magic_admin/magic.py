@@ -6,11 +6,20 @@ from magic_admin.config import base_url
 from magic_admin.error import AuthenticationError
 from magic_admin.http_client import RequestsClient
 from magic_admin.resources.base import ResourceComponent
+from magic_admin.resources.token import Token
 
 
 RETRIES = 3
 TIMEOUT = 10
 BACKOFF_FACTOR = 0.02
+VERIFIED_TOKEN_CACHE_SIZE = 0
+OWNERSHIP_CACHE_SIZE = 0
+METADATA_CACHE_SIZE = 0
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+POOL_BLOCK = False
+KEEP_ALIVE = True
+RATE_LIMIT = None
 
 
 class Magic:
@@ -31,23 +40,158 @@ class Magic:
         retries=RETRIES,
         timeout=TIMEOUT,
         backoff_factor=BACKOFF_FACTOR,
+        verified_token_cache_size=VERIFIED_TOKEN_CACHE_SIZE,
+        ownership_cache_size=OWNERSHIP_CACHE_SIZE,
+        metadata_cache_size=METADATA_CACHE_SIZE,
+        cache_backend=None,
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=POOL_BLOCK,
+        keep_alive=KEEP_ALIVE,
+        rate_limit=RATE_LIMIT,
+        rate_limit_burst=None,
+        retry_policy=None,
+        hooks=None,
+        request_client=None,
     ):
+        """
+        Args:
+            api_secret_key (str): Your Magic API secret key. Defaults to the
+                `MAGIC_API_SECRET_KEY` environment variable.
+            client_id (str): Your Magic client ID. When not given, it is fetched
+                from Magic the first time a DID token is validated.
+            retries (int): The number of retries of a failed request.
+            timeout (int): The request timeout in seconds.
+            backoff_factor (float): The minimum wait between retries, in
+                seconds.
+            verified_token_cache_size (int): The number of verified DID tokens
+                to remember. See ``Token.setup_verified_token_cache``.
+            ownership_cache_size (int): The number of token ownership checks to
+                remember. See ``Utils.setup_ownership_cache``.
+            metadata_cache_size (int): The number of user metadata responses to
+                remember. See ``User.setup_metadata_cache``.
+            cache_backend (CacheBackend): Where the verified token cache and the
+                user metadata cache keep their entries, e.g. a
+                ``RedisCacheBackend`` shared by every worker process. Both
+                caches are enabled when it is given, whatever their sizes.
+            pool_connections (int): The number of hosts to keep a connection
+                pool for.
+            pool_maxsize (int): The maximum number of connections kept open per
+                host. Size it to the number of threads calling Magic at once.
+            pool_block (bool): Whether to wait for a free connection when the
+                pool is exhausted, instead of opening a throwaway connection.
+            keep_alive (bool): Whether to reuse connections across requests.
+            rate_limit (float): The maximum number of requests per second sent
+                with the API secret key. The rate is halved after a 429 response
+                and grows back with the next responses, and the requests are
+                paused for the Retry-After of the 429. None disables the rate
+                limiting.
+            rate_limit_burst (int): The number of requests that can be sent at
+                once before being paced. Defaults to one second of requests.
+            retry_policy (RetryPolicy): When and how long to wait before
+                retrying a failed request. Defaults to a ``RetryPolicy`` of
+                ``retries`` and ``backoff_factor``.
+            hooks (Hooks): The callbacks notified of the requests and of the
+                DID token validations, also available as ``magic.hooks``.
+                Defaults to an empty ``Hooks``.
+            request_client (RequestsClient): A request client to share with
+                other Magic instances. The network arguments above are ignored
+                when it is given. See ``for_tenant``.
+        """
+        self._set_api_secret_key(api_secret_key)
+
+        self._request_client = request_client or RequestsClient(
+            retries,
+            timeout,
+            backoff_factor,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            rate_limit=rate_limit,
+            rate_limit_burst=rate_limit_burst,
+            retry_policy=retry_policy,
+            hooks=hooks,
+        )
+        self.hooks = self._request_client.hooks
+
         self._resource = ResourceComponent()
+        self._resource.setup_resources(
+            self._request_client,
+            self._api_secret_key,
+            hooks=self.hooks,
+        )
+        self._resource.Token.setup_client_id(client_id)
+        self._resource.Token.setup_verified_token_cache(
+            verified_token_cache_size,
+            backend=cache_backend,
+        )
+        self._resource.Utils.setup_ownership_cache(ownership_cache_size)
+        self._resource.User.setup_metadata_cache(
+            metadata_cache_size,
+            backend=cache_backend,
+        )
 
-        self._resource.setup_request_client(retries, timeout, backoff_factor)
-        self._set_api_secret_key(api_secret_key)
-        init_requests_client = RequestsClient(retries, timeout, backoff_factor)
-        magic_admin.client_id = (
-            client_id
-            or init_requests_client.request("get", self.v1_client_info).data[
-                "client_id"
-            ]
+        # Deprecated, for the code written when the credentials were module
+        # globals and ``Token.validate`` a classmethod.
+        magic_admin.api_secret_key = self._api_secret_key
+        magic_admin.client_id = client_id
+        Token._default_token = self._resource.Token
+
+    def for_tenant(self, api_secret_key, client_id=None):
+        """Create a Magic instance for another Magic app. It has its own
+        credentials, client ID and user metadata cache but shares the connection
+        pool, the hooks, the verified token cache and the ownership cache of this
+        instance, so that many apps can be served from one process.
+
+        Args:
+            api_secret_key (str): The API secret key of the other app.
+            client_id (str): The client ID of the other app. When not given, it
+                is fetched from Magic the first time a DID token is validated.
+
+        Returns:
+            magic (Magic): The Magic instance of the other app.
+        """
+        magic = self.__class__(
+            api_secret_key=api_secret_key,
+            client_id=client_id,
+            request_client=self._request_client,
+        )
+        # Cached entries only vouch for signatures. The "aud" claim is checked
+        # against the client ID of each app on every validation.
+        magic.Token.verified_token_cache = self.Token.verified_token_cache
+        # Ownership is on-chain state, the same for every app.
+        magic.Utils.ownership_cache = self.Utils.ownership_cache
+        magic.Utils.ownership_cache_ttl = self.Utils.ownership_cache_ttl
+        magic.Utils.ownership_cache_negative_ttl = (
+            self.Utils.ownership_cache_negative_ttl
         )
+        # The metadata of a user differs between apps, each app gets its own
+        # metadata cache. The ``AsyncUser`` of ``AsyncMagic`` has none.
+        metadata_cache = getattr(self.User, "metadata_cache", None)
+
+        if metadata_cache is not None:
+            magic.User.setup_metadata_cache(
+                metadata_cache.maxsize,
+                ttl=metadata_cache.ttl,
+                stale_ttl=metadata_cache.stale_ttl,
+                backend=getattr(metadata_cache.store, "backend", None),
+            )
+
+        return magic
+
+    def get_pool_stats(self):
+        """See ``RequestsClient.get_pool_stats``."""
+        return self._request_client.get_pool_stats()
+
+    def get_retry_stats(self):
+        """See ``RetryPolicy.get_stats``."""
+        return self._request_client.get_retry_stats()
 
     def _set_api_secret_key(self, api_secret_key):
-        magic_admin.api_secret_key = api_secret_key or os.environ.get(
+        self._api_secret_key = api_secret_key or os.environ.get(
             "MAGIC_API_SECRET_KEY",
         )
 
-        if magic_admin.api_secret_key is None:
+        if self._api_secret_key is None:
             raise AuthenticationError(api_secret_api_key_missing_message)
@@ -2,3 +2,5 @@ from magic_admin.resources.token import Token  # noqa: F401
 from magic_admin.resources.user import User  # noqa: F401
 from magic_admin.resources.wallet import WalletType  # noqa: F401
 from magic_admin.resources.utils import Utils  # noqa: F401
+from magic_admin.resources.async_user import AsyncUser  # noqa: F401
+from magic_admin.resources.async_utils import AsyncUtils  # noqa: F401
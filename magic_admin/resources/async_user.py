@@ -0,0 +1,95 @@
+from magic_admin.error import MagicError
+from magic_admin.resources.base import AsyncResourceComponent
+from magic_admin.resources.user import MAX_CONCURRENCY
+from magic_admin.resources.user import User
+from magic_admin.resources.user import UserRequestResult
+from magic_admin.resources.wallet import WalletType
+from magic_admin.utils.concurrency import map_concurrently_async
+from magic_admin.utils.did_token import construct_issuer_with_public_address
+
+
+class AsyncUser(AsyncResourceComponent):
+    """The asyncio counterpart of ``User``, served as ``AsyncMagic.User``."""
+
+    _resource_name = "User"
+
+    v1_user_info = User.v1_user_info
+    v1_user_logout = User.v1_user_logout
+
+    async def get_metadata_by_issuer_and_wallet(self, issuer, wallet_type):
+        return await self.request(
+            "get",
+            self.v1_user_info,
+            params={"issuer": issuer, "wallet_type": wallet_type},
+        )
+
+    async def get_metadata_by_public_address_and_wallet(
+        self,
+        public_address,
+        wallet_type,
+    ):
+        return await self.get_metadata_by_issuer_and_wallet(
+            construct_issuer_with_public_address(public_address),
+            wallet_type,
+        )
+
+    async def get_metadata_by_token_and_wallet(self, did_token, wallet_type):
+        return await self.get_metadata_by_issuer_and_wallet(
+            self.Token.get_issuer(did_token),
+            wallet_type,
+        )
+
+    async def get_metadata_by_issuer(self, issuer):
+        return await self.get_metadata_by_issuer_and_wallet(issuer, WalletType.NONE)
+
+    async def get_metadata_by_public_address(self, public_address):
+        return await self.get_metadata_by_issuer(
+            construct_issuer_with_public_address(public_address),
+        )
+
+    async def get_metadata_by_token(self, did_token):
+        return await self.get_metadata_by_issuer(self.Token.get_issuer(did_token))
+
+    async def _get_metadata_result(self, issuer, wallet_type):
+        try:
+            return UserRequestResult(
+                issuer,
+                response=await self.get_metadata_by_issuer_and_wallet(
+                    issuer,
+                    wallet_type,
+                ),
+            )
+        except MagicError as e:
+            return UserRequestResult(issuer, error=e)
+
+    def get_metadata_many(
+        self,
+        issuers,
+        wallet_type=WalletType.NONE,
+        max_concurrency=MAX_CONCURRENCY,
+        ordered=True,
+    ):
+        """See ``User.get_metadata_many``. The results are yielded by an async
+        generator.
+        """
+        return map_concurrently_async(
+            lambda issuer: self._get_metadata_result(issuer, wallet_type),
+            issuers,
+            max_concurrency,
+            ordered=ordered,
+        )
+
+    async def logout_by_issuer(self, issuer):
+        return await self.request(
+            "post",
+            self.v1_user_logout,
+            data={"issuer": issuer},
+        )
+
+    async def logout_by_public_address(self, public_address):
+        return await self.logout_by_issuer(
+            construct_issuer_with_public_address(public_address),
+        )
+
+    async def logout_by_token(self, did_token):
+        return await self.logout_by_issuer(self.Token.get_issuer(did_token))
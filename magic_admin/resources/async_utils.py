@@ -0,0 +1,160 @@
+import asyncio
+
+from magic_admin.resources.base import AsyncResourceComponent
+from magic_admin.resources.utils import Utils
+from magic_admin.utils.contract import ERC1155
+from magic_admin.utils.contract import ERC721
+from magic_admin.utils.contract import async_contract_pool
+
+
+OWNERSHIP_CHECK_LIMIT = 10
+
+
+class AsyncUtils(AsyncResourceComponent):
+    """The asyncio counterpart of ``Utils``, served as ``AsyncMagic.Utils``.
+
+    The on-chain calls go through web3's async HTTP provider and at most
+    ``ownership_check_limit`` of them are in flight at once. DID tokens are
+    validated, and ownership cached, like with ``Utils``.
+    """
+
+    _resource_name = "Utils"
+
+    ownership_cache = Utils.ownership_cache
+    ownership_cache_ttl = Utils.ownership_cache_ttl
+    ownership_cache_negative_ttl = Utils.ownership_cache_negative_ttl
+
+    parse_authorization_header = Utils.parse_authorization_header
+    setup_ownership_cache = Utils.setup_ownership_cache
+    invalidate_ownership = Utils.invalidate_ownership
+
+    _get_ownership_cache_key = staticmethod(Utils._get_ownership_cache_key)
+    _get_cached_ownership = Utils._get_cached_ownership
+    _cache_ownership = Utils._cache_ownership
+    _get_wallet_address = Utils._get_wallet_address
+    _get_ownership_response = staticmethod(Utils._get_ownership_response)
+
+    def __init__(self):
+        self.setup_ownership_check_limit(OWNERSHIP_CHECK_LIMIT)
+        # The web3 instances and contracts of the on-chain calls. ``AsyncMagic``
+        # gives its own to the resources it binds.
+        self.contract_pool = async_contract_pool
+
+    def setup_ownership_check_limit(self, limit):
+        """
+        Args:
+            limit (int): The maximum number of on-chain ownership checks in
+                flight at once.
+
+        Returns:
+            None.
+        """
+        self.ownership_check_limit = limit
+        self._ownership_check_semaphore = asyncio.Semaphore(limit)
+
+    async def _get_balance(
+        self,
+        wallet_address,
+        contract_address,
+        contract_type,
+        rpc_url,
+        token_id,
+    ):
+        if contract_type == ERC721:
+            function = self.contract_pool.get_contract(
+                rpc_url,
+                contract_address,
+                ERC721,
+            ).functions.balanceOf(wallet_address)
+        else:  # ERC1155
+            function = self.contract_pool.get_contract(
+                rpc_url,
+                contract_address,
+                ERC1155,
+            ).functions.balanceOf(wallet_address, int(token_id))
+
+        async with self._ownership_check_semaphore:
+            return await function.call()
+
+    async def _owns_token(
+        self,
+        wallet_address,
+        contract_address,
+        contract_type,
+        rpc_url,
+        token_id,
+    ):
+        ownership_check = (
+            wallet_address,
+            contract_address,
+            contract_type,
+            rpc_url,
+            token_id,
+        )
+        owns_token = self._get_cached_ownership(*ownership_check)
+
+        if owns_token is None:
+            owns_token = await self._get_balance(*ownership_check) > 0
+            self._cache_ownership(owns_token, *ownership_check)
+
+        return owns_token
+
+    async def _setup_client_id(self):
+        # ``Token`` fetches the client ID with a synchronous request, which the
+        # asyncio client cannot make. Concurrent first validations may fetch it
+        # more than once.
+        token = self.Token
+
+        if token._client_id is None:
+            token.setup_client_id(
+                (await self.request("get", token.v1_client_info)).data["client_id"],
+            )
+
+    async def validate_token_ownership(
+        self,
+        did_token,
+        contract_address,
+        contract_type,
+        rpc_url,
+        token_id=None,
+    ):
+        """See ``Utils.validate_token_ownership``. The client ID is fetched
+        first if it is unknown.
+        """
+        if contract_type == ERC1155 and not token_id:
+            raise ValueError("ERC1155 requires a tokenId")
+
+        await self._setup_client_id()
+        wallet_address, error_response = self._get_wallet_address(did_token)
+
+        if error_response is not None:
+            return error_response
+
+        return self._get_ownership_response(
+            await self._owns_token(
+                wallet_address,
+                contract_address,
+                contract_type,
+                rpc_url,
+                token_id,
+            ),
+        )
+
+    async def validate_token_ownership_many(self, ownership_validations):
+        """Run many ownership validations concurrently, within the ownership
+        check limit.
+
+        Args:
+            ownership_validations (list): The ``(did_token, contract_address,
+                contract_type, rpc_url, token_id)`` arguments of each
+                ``validate_token_ownership`` call.
+
+        Returns:
+            responses (list): The response of each validation, in order.
+        """
+        return await asyncio.gather(
+            *[
+                self.validate_token_ownership(*ownership_validation)
+                for ownership_validation in ownership_validations
+            ],
+        )
@@ -1,5 +1,4 @@
 from magic_admin.config import base_url
-from magic_admin.http_client import RequestsClient
 
 
 class ResourceMeta(type):
@@ -7,17 +6,37 @@ class ResourceMeta(type):
         if not hasattr(cls, "_registry"):
             cls._registry = {}
         else:
-            cls._registry[name] = cls()
+            # A resource can be registered under another name than its class
+            # name, e.g. ``AsyncUser`` is the ``User`` of ``AsyncMagic``.
+            cls._registry[cls_dict.get("_resource_name", name)] = cls()
 
         super().__init__(name, bases, cls_dict)
 
 
+def _bind_resources(resources, registry, request_client, api_secret_key, hooks):
+    for name, resource in registry.items():
+        bound_resource = type(resource)()
+        bound_resource._request_client = request_client
+        bound_resource._api_secret_key = api_secret_key
+        bound_resource._hooks = hooks
+        bound_resource._resources = resources
+        resources[name] = bound_resource
+
+
 class ResourceComponent(metaclass=ResourceMeta):
     _base_url = base_url
 
+    # Set on the resources bound to a Magic instance by ``setup_resources``.
+    _request_client = None
+    _api_secret_key = None
+    _hooks = None
+    _resources = None
+
     def __getattr__(self, resource_name):
-        if resource_name in self._registry:
-            return self._registry[resource_name]
+        resources = self._resources or self._registry
+
+        if resource_name in resources:
+            return resources[resource_name]
         else:
             raise AttributeError(
                 "{object_name} has no attribute '{resource_name}'".format(
@@ -26,11 +45,20 @@ class ResourceComponent(metaclass=ResourceMeta):
                 ),
             )
 
-    def setup_request_client(self, retries, timeout, backoff_factor):
-        _request_client = RequestsClient(retries, timeout, backoff_factor)
-
-        for resource in self._registry.values():
-            setattr(resource, "_request_client", _request_client)
+    def setup_resources(self, request_client, api_secret_key, hooks=None):
+        """Bind a new instance of every resource to the request client, the API
+        secret key and the hooks of a Magic instance, so that Magic instances of
+        different apps do not share any state. The request client itself can be
+        shared.
+        """
+        self._resources = {}
+        _bind_resources(
+            self._resources,
+            self._registry,
+            request_client,
+            api_secret_key,
+            hooks,
+        )
 
     def _construct_url(self, url_path):
         return "{base_url}{url_path}".format(
@@ -44,4 +72,65 @@ class ResourceComponent(metaclass=ResourceMeta):
             self._construct_url(url_path),
             params=params,
             data=data,
+            api_secret_key=self._api_secret_key,
+        )
+
+
+class AsyncResourceComponent(metaclass=ResourceMeta):
+    """Base of the asyncio resources of ``AsyncMagic``. Resources without I/O,
+    like ``Token``, have no asyncio counterpart and are shared with ``Magic``.
+    """
+
+    _base_url = base_url
+
+    _request_client = None
+    _api_secret_key = None
+    _hooks = None
+    _resources = None
+
+    _construct_url = ResourceComponent._construct_url
+
+    def __getattr__(self, resource_name):
+        for resources in (
+            self._resources or {},
+            self._registry,
+            ResourceComponent._registry,
+        ):
+            if resource_name in resources:
+                return resources[resource_name]
+
+        raise AttributeError(
+            "{object_name} has no attribute '{resource_name}'".format(
+                object_name=self.__class__.__name__,
+                resource_name=resource_name,
+            ),
+        )
+
+    def setup_resources(self, request_client, api_secret_key, hooks=None):
+        """See ``ResourceComponent.setup_resources``. The resources shared with
+        ``Magic`` are bound without a request client, as they make no requests.
+        """
+        self._resources = {}
+        _bind_resources(
+            self._resources,
+            ResourceComponent._registry,
+            None,
+            api_secret_key,
+            hooks,
+        )
+        _bind_resources(
+            self._resources,
+            self._registry,
+            request_client,
+            api_secret_key,
+            hooks,
+        )
+
+    async def request(self, method, url_path, params=None, data=None):
+        return await self._request_client.request(
+            method.lower(),
+            self._construct_url(url_path),
+            params=params,
+            data=data,
+            api_secret_key=self._api_secret_key,
         )
@@ -1,23 +1,275 @@
 import base64
+import hashlib
 import json
-
-from eth_account.messages import encode_defunct
-from web3.auto import w3
+import os
+import re
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 import magic_admin
+from magic_admin.config import client_id_missing_message
+from magic_admin.error import DIDTokenAudienceMismatch
 from magic_admin.error import DIDTokenExpired
 from magic_admin.error import DIDTokenInvalid
 from magic_admin.error import DIDTokenMalformed
+from magic_admin.error import DIDTokenSignatureMismatch
+from magic_admin.error import MagicError
 from magic_admin.resources.base import ResourceComponent
+from magic_admin.utils.cache import LRUCache
+from magic_admin.utils.cache_backend import BackendCache
 from magic_admin.utils.did_token import parse_public_address_from_issuer
+from magic_admin.utils.hooks import TOKEN_VALIDATION_EVENT
+from magic_admin.utils.hooks import TokenValidationEvent
+from magic_admin.utils.signature import get_recovery_backend
 from magic_admin.utils.time import apply_did_token_nbf_grace_period
 from magic_admin.utils.time import epoch_time_now
 
 
 EXPECTED_DID_TOKEN_CONTENT_LENGTH = 2
 
+# DID tokens are about 1 KB. Longer ones are rejected before being decoded.
+MAX_DID_TOKEN_LENGTH = 8192
+_TOO_LONG_MESSAGE = "DID token is malformed. It is longer than {} characters.".format(
+    MAX_DID_TOKEN_LENGTH,
+)
+
+# A hex encoded 65 bytes ``r || s || v`` signature.
+PROOF_PATTERN = re.compile(r"0x[0-9a-fA-F]{130}")
+
+# A ``did:method-name:method-specific-id`` issuer.
+ISSUER_PATTERN = re.compile(r"did:[a-z0-9]+:[^:]+(:.*)?")
+
+# Below this number of signatures per worker, a process pool costs more than it
+# saves. Starting one takes 15 to 25 ms, the time of 150 to 250 recoveries.
+MIN_SIGNATURES_PER_WORKER = 256
+
+# Signatures do not depend on the app, the entries are shared by every app using
+# the same cache backend.
+VERIFIED_TOKEN_CACHE_NAMESPACE = b"magic:verified:"
+
+
+def recover_signer(claim, proof):
+    """
+    Args:
+        claim (str|dict): The claim portion of the DID token, as the JSON
+            string that was signed. A dict is serialized again, which only
+            gives back the signed string for compact JSON in the same key
+            order.
+        proof (str): The signature of the claim.
+
+    Returns:
+        recovered_address (str): The address that signed the claim.
+    """
+    if not isinstance(claim, str):
+        claim = json.dumps(claim, separators=(",", ":"))
+
+    return get_recovery_backend().recover(claim, proof)
+
+
+def _recover_signer_or_error(claim_and_proof):
+    try:
+        return recover_signer(*claim_and_proof), None
+    except Exception as e:
+        return None, "{} ({})".format(e.__class__.__name__, str(e) or "<empty message>")
+
+
+def _recover_signers(claims_and_proofs, workers):
+    """
+    Args:
+        claims_and_proofs (list): (claim, proof) pairs, see ``recover_signer``.
+        workers (int): The maximum number of worker processes.
+
+    Returns:
+        recovered (list): A (recovered_address, error) pair per input pair.
+    """
+    workers = min(workers, len(claims_and_proofs) // MIN_SIGNATURES_PER_WORKER)
+
+    if workers <= 1:
+        return [_recover_signer_or_error(pair) for pair in claims_and_proofs]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                _recover_signer_or_error,
+                claims_and_proofs,
+                chunksize=max(1, len(claims_and_proofs) // (workers * 4)),
+            ),
+        )
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# The failed checks of ``Token.validate``, other than the decoding ones, as the
+# class and the message of the error raised for them.
+_MALFORMED = (
+    DIDTokenMalformed,
+    'DID token is malformed. The "proof" has to be a hex encoded signature, '
+    'the "iss" field a `did:method-name:method-specific-id` issuer, the "ext" '
+    'and "nbf" fields numbers and the "aud" field a string.',
+)
+_MISSING_EXPIRATION = (
+    DIDTokenInvalid,
+    'Please check the "ext" field and regenerate a new token with a suitable value.',
+)
+_EXPIRED = (
+    DIDTokenExpired,
+    "Given DID token has expired. Please generate a new one.",
+)
+_NOT_YET_VALID = (
+    DIDTokenInvalid,
+    "Given DID token cannot be used at this time. Please check the "
+    '"nbf" field and regenerate a new token with a suitable value.',
+)
+_AUD_MISMATCH = (
+    DIDTokenAudienceMismatch,
+    '"aud" field does not match your client. Please check your secret key.',
+)
+_SIGNATURE_MISMATCH = (
+    DIDTokenSignatureMismatch,
+    'Signature mismatch between "proof" and "claim". Please generate a new '
+    "token with an intended issuer.",
+)
+
+# The errors of a DID token failing the validation.
+_DID_TOKEN_ERRORS = (DIDTokenInvalid, DIDTokenMalformed, DIDTokenExpired)
+
+
+class TokenValidationResult:
+    """The outcome of validating one DID token with ``Token.try_validate`` or
+    ``Token.validate_many``.
+    """
+
+    VALID = "valid"
+    MALFORMED = "malformed"
+    EXPIRED = "expired"
+    INVALID = "invalid"
+
+    def __init__(
+        self,
+        did_token,
+        status=None,
+        reason=None,
+        token=None,
+        error_class=None,
+    ):
+        self.did_token = did_token
+        self.status = status
+        self.reason = reason
+        self.token = token
+        # The class of the error ``Token.validate`` raises for the DID token.
+        self.error_class = error_class
+
+    def __repr__(self):
+        return "{class_name}(status={status!r}, reason={reason!r})".format(
+            class_name=self.__class__.__name__,
+            status=self.status,
+            reason=self.reason,
+        )
+
+    @property
+    def valid(self):
+        return self.status == self.VALID
+
+    @classmethod
+    def get_status(cls, error_class):
+        """
+        Args:
+            error_class (type): The class of the error ``Token.validate``
+                raises for the DID token.
+
+        Returns:
+            status (str): ``MALFORMED``, ``EXPIRED`` or ``INVALID``.
+        """
+        if issubclass(error_class, DIDTokenMalformed):
+            return cls.MALFORMED
+
+        if issubclass(error_class, DIDTokenExpired):
+            return cls.EXPIRED
+
+        return cls.INVALID
+
+    def set_failure(self, error_class, message):
+        self.status = self.get_status(error_class)
+        self.reason = message
+        self.error_class = error_class
+
+    def set_error(self, error):
+        self.set_failure(error.__class__, str(error))
+
+
+class DecodedDIDToken:
+    """The parsed parts of a DID token.
+
+    A DID token is decoded once into this object so that validation and the
+    helpers that need the issuer or the public address can share the result
+    instead of decoding the token again.
+
+    ``raw_claim`` is the claim JSON string of the token, which the proof signs.
+    """
+
+    def __init__(
+        self,
+        did_token,
+        proof,
+        claim,
+        recovered_address=None,
+        raw_claim=None,
+    ):
+        self.did_token = did_token
+        self.proof = proof
+        self.claim = claim
+        self.recovered_address = recovered_address
+        self.raw_claim = raw_claim
+
+    @property
+    def signed_claim(self):
+        """The claim the proof is checked against: the raw claim, or the claim
+        serialized again when the token was not decoded from a string.
+        """
+        if self.raw_claim is not None:
+            return self.raw_claim
+
+        return json.dumps(self.claim, separators=(",", ":"))
+
+    @property
+    def issuer(self):
+        return self.claim["iss"]
+
+    @property
+    def public_address(self):
+        return parse_public_address_from_issuer(self.issuer)
+
+
+class _ClassOrInstanceMethod:
+    """Keep a method callable on the ``Token`` class, as it was a classmethod
+    before the resources were bound per Magic instance. Called on the class, it
+    runs on the Token of the last created ``Magic`` instance.
+    """
+
+    def __init__(self, method):
+        self._method = method
+        self.__doc__ = method.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            warnings.warn(
+                "Calling {name} on the Token class is deprecated, call it on "
+                "magic.Token instead.".format(name=self._method.__name__),
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            instance = owner._get_default_token()
+
+        return self._method.__get__(instance, owner)
+
 
 class Token(ResourceComponent):
+    v1_client_info = "/v1/admin/client"
+
     required_fields = frozenset(
         [
             "iat",
@@ -30,6 +282,215 @@ class Token(ResourceComponent):
         ]
     )
 
+    # Opt-in cache of the addresses recovered from DID tokens that passed the
+    # signature check. See ``setup_verified_token_cache``.
+    verified_token_cache = None
+
+    # The Token of the last created Magic instance, used by the methods called
+    # on the class. See ``_ClassOrInstanceMethod``.
+    _default_token = None
+
+    def __init__(self):
+        self._client_id = None
+        self._client_id_lock = threading.Lock()
+
+    @classmethod
+    def _get_default_token(cls):
+        if cls._default_token is not None:
+            return cls._default_token
+
+        token = cls()
+        token.setup_client_id(magic_admin.client_id)
+
+        return token
+
+    def setup_client_id(self, client_id):
+        """
+        Args:
+            client_id (str): The client ID that DID tokens have to be issued
+                for. When None, it is fetched from Magic on first use.
+
+        Returns:
+            None.
+        """
+        self._client_id = client_id
+
+    def setup_verified_token_cache(self, maxsize, backend=None):
+        """Remember successful signature recoveries so that validating the same
+        DID token again skips the ecrecover. Time based claims and the audience
+        are still checked on every validation, and entries are evicted once the
+        token expires.
+
+        Args:
+            maxsize (int): The maximum number of DID tokens to remember. A falsy
+                value disables the cache.
+            backend (CacheBackend): Where to keep the recovered addresses, e.g. a
+                ``RedisCacheBackend`` shared by every worker process, instead of
+                a cache of ``maxsize`` entries in this process. The cache is
+                enabled whatever ``maxsize`` is.
+
+        Returns:
+            None.
+        """
+        if backend is not None:
+            self.verified_token_cache = BackendCache(
+                backend,
+                VERIFIED_TOKEN_CACHE_NAMESPACE,
+                lambda recovered_address: recovered_address.encode("ascii"),
+                lambda data: data.decode("ascii"),
+            )
+        else:
+            self.verified_token_cache = LRUCache(maxsize) if maxsize else None
+
+    @staticmethod
+    def _get_cache_key(did_token):
+        if isinstance(did_token, str):
+            did_token = did_token.encode("utf-8")
+
+        return hashlib.sha256(did_token).digest()
+
+    def _get_verified_address(self, token):
+        """
+        Args:
+            token (DecodedDIDToken): The decoded DID token.
+
+        Returns:
+            recovered_address (str): The address recovered the last time this
+                DID token passed the signature check, or None if the token is not
+                in the verified token cache.
+        """
+        if self.verified_token_cache is None:
+            return None
+
+        recovered_address = self.verified_token_cache.get(
+            self._get_cache_key(token.did_token),
+        )
+
+        # A shared backend may hold anything, only trust an entry matching the
+        # issuer of the token. Otherwise the signature is checked again.
+        if recovered_address != token.public_address:
+            return None
+
+        return recovered_address
+
+    def _set_recovered_address(self, token, recovered_address):
+        """
+        Args:
+            token (DecodedDIDToken): The decoded DID token.
+            recovered_address (str): The address recovered from the proof.
+
+        Returns:
+            failure (tuple): ``_SIGNATURE_MISMATCH`` if the proof was not signed
+                by the issuer, else None.
+        """
+        if recovered_address != token.public_address:
+            return _SIGNATURE_MISMATCH
+
+        token.recovered_address = recovered_address
+
+        if self.verified_token_cache is not None:
+            self.verified_token_cache.set(
+                self._get_cache_key(token.did_token),
+                recovered_address,
+                expires_at=token.claim["ext"],
+            )
+
+        return None
+
+    @staticmethod
+    def _get_structure_failure(token):
+        """
+        Args:
+            token (DecodedDIDToken): The decoded DID token.
+
+        Returns:
+            failure (tuple): ``_MALFORMED`` if the proof is not a hex encoded
+                signature, the issuer is not a DID or the checked claims have
+                the wrong types, ``_MISSING_EXPIRATION`` if "ext" is null, else
+                None.
+        """
+        claim = token.claim
+
+        if claim["ext"] is None:
+            return _MISSING_EXPIRATION
+
+        if (
+            not isinstance(token.proof, str)
+            or PROOF_PATTERN.fullmatch(token.proof) is None
+            or not isinstance(claim["iss"], str)
+            or ISSUER_PATTERN.fullmatch(claim["iss"]) is None
+            or not _is_number(claim["ext"])
+            or not _is_number(claim["nbf"])
+            or not isinstance(claim["aud"], str)
+        ):
+            return _MALFORMED
+
+        return None
+
+    def get_client_id(self):
+        """The client ID that DID tokens have to be issued for. When it was not
+        given to ``Magic``, it is fetched from Magic the first time it is needed
+        and cached for the life of the Magic instance.
+
+        Returns:
+            client_id (str): Your Magic client ID.
+        """
+        if self._client_id is None:
+            # E.g. the Token of ``AsyncMagic``, which cannot make synchronous
+            # requests.
+            if self._request_client is None:
+                raise MagicError(message=client_id_missing_message)
+
+            with self._client_id_lock:
+                if self._client_id is None:
+                    self._client_id = self.request(
+                        "get",
+                        self.v1_client_info,
+                    ).data["client_id"]
+
+                    if self is Token._default_token:
+                        magic_admin.client_id = self._client_id
+
+        return self._client_id
+
+    def _get_claim_failure(self, claim):
+        """
+        Args:
+            claim (dict): A dict that represents the claim portion of the DID
+                token.
+
+        Returns:
+            failure (tuple): ``_EXPIRED``, ``_NOT_YET_VALID`` if DID token is
+                used before "nbf", ``_AUD_MISMATCH`` if it was issued for
+                another client, else None.
+        """
+        current_time_in_s = epoch_time_now()
+
+        if current_time_in_s > claim["ext"]:
+            return _EXPIRED
+
+        if current_time_in_s < apply_did_token_nbf_grace_period(claim["nbf"]):
+            return _NOT_YET_VALID
+
+        if claim["aud"] != self.get_client_id():
+            return _AUD_MISMATCH
+
+        return None
+
+    @staticmethod
+    def _get_error(failure):
+        """
+        Args:
+            failure (tuple): The class and the message of the error of a failed
+                check.
+
+        Returns:
+            error (MagicError): The error ``validate`` raises for the check.
+        """
+        error_class, message = failure
+
+        return error_class(message=message)
+
     @classmethod
     def _check_required_fields(cls, claim):
         """
@@ -65,6 +526,25 @@ class Token(ResourceComponent):
             proof (str): A signed message.
             claim (dict): A dict of unsigned message.
         """
+        proof, claim, _ = cls._decode(did_token)
+
+        return proof, claim
+
+    @classmethod
+    def _decode(cls, did_token):
+        """See ``decode``.
+
+        Returns:
+            proof (str): A signed message.
+            claim (dict): A dict of unsigned message.
+            raw_claim (str): The JSON string of the claim, as signed.
+        """
+        if (
+            isinstance(did_token, (str, bytes))
+            and len(did_token) > MAX_DID_TOKEN_LENGTH
+        ):
+            raise DIDTokenMalformed(message=_TOO_LONG_MESSAGE)
+
         try:
             decoded_did_token = json.loads(
                 base64.urlsafe_b64decode(did_token).decode("utf-8"),
@@ -78,16 +558,19 @@ class Token(ResourceComponent):
                 ),
             )
 
-        if len(decoded_did_token) != EXPECTED_DID_TOKEN_CONTENT_LENGTH:
+        if (
+            not isinstance(decoded_did_token, list)
+            or len(decoded_did_token) != EXPECTED_DID_TOKEN_CONTENT_LENGTH
+        ):
             raise DIDTokenMalformed(
                 message="DID token is malformed. It has to have two parts "
                 "[proof, claim].",
             )
 
-        proof = decoded_did_token[0]
+        proof, raw_claim = decoded_did_token
 
         try:
-            claim = json.loads(decoded_did_token[1])
+            claim = json.loads(raw_claim)
         except Exception as e:
             raise DIDTokenMalformed(
                 message="DID token is malformed. Given claim should be a JSON "
@@ -97,85 +580,385 @@ class Token(ResourceComponent):
                 ),
             )
 
+        if not isinstance(claim, dict):
+            raise DIDTokenMalformed(
+                message="DID token is malformed. Given claim should be a JSON "
+                "serialized object.",
+            )
+
         cls._check_required_fields(claim)
 
-        return proof, claim
+        return proof, claim, raw_claim
+
+    @classmethod
+    def parse(cls, did_token):
+        """
+        Args:
+            did_token (base64.str|DecodedDIDToken): Base64 encoded string. An
+                already decoded token is returned as is.
+
+        Raises:
+            DIDTokenMalformed: If token format is invalid.
+
+        Returns:
+            decoded_did_token (DecodedDIDToken): The proof and the claim of the
+                DID token.
+        """
+        if isinstance(did_token, DecodedDIDToken):
+            return did_token
+
+        proof, claim, raw_claim = cls._decode(did_token)
+
+        return DecodedDIDToken(did_token, proof, claim, raw_claim=raw_claim)
 
     @classmethod
     def get_issuer(cls, did_token):
         """
         Args:
-            did_token (base64.str): Base64 encoded string.
+            did_token (base64.str|DecodedDIDToken): Base64 encoded string.
 
         Returns:
             issuer (str): Issuer (the signer, the "user"). This field is represented
                 as a Decentralized Identifier populated with the user's Ethereum
                 public key.
         """
-        _, claim = cls.decode(did_token)
-
-        return claim["iss"]
+        return cls.parse(did_token).issuer
 
     @classmethod
     def get_public_address(cls, did_token):
         """
         Args:
-            did_token (base64.str): Base64 encoded string.
+            did_token (base64.str|DecodedDIDToken): Base64 encoded string.
 
         Returns:
             public_address (str): An Ethereum public key.
         """
-        return parse_public_address_from_issuer(cls.get_issuer(did_token))
+        return cls.parse(did_token).public_address
+
+    @_ClassOrInstanceMethod
+    def validate(self, did_token):
+        """The checks run from the cheapest to the signature recovery, so that
+        malformed, expired, not yet valid and wrong audience tokens are rejected
+        without recovering their signer.
 
-    @classmethod
-    def validate(cls, did_token):
-        """
         Args:
-            did_token (base64.str): Base64 encoded string.
+            did_token (base64.str|DecodedDIDToken): Base64 encoded string.
 
         Raises:
-            DIDTokenInvalid: If DID token fails the validation.
+            DIDTokenMalformed: If token format is invalid.
+            DIDTokenInvalid: If DID token fails the validation. It is a
+                ``DIDTokenSignatureMismatch`` or a ``DIDTokenAudienceMismatch``
+                when the proof or the "aud" field is wrong.
             DIDTokenExpired: If DID token has expired.
+            MagicError: If the client ID is unknown and cannot be fetched.
 
         Returns:
-            None.
+            decoded_did_token (DecodedDIDToken): The validated token, with the
+                address recovered from the proof. It can be passed to the other
+                methods taking a DID token to skip decoding it again.
         """
-        proof, claim = cls.decode(did_token)
+        hooks = self._get_hooks()
 
-        if claim["ext"] is None:
-            raise DIDTokenInvalid(
-                message='Please check the "ext" field and regenerate a new token '
-                "with a suitable value.",
-            )
+        if hooks is None:
+            return self._validate(did_token)
 
-        recovered_address = w3.eth.account.recover_message(
-            encode_defunct(
-                text=json.dumps(claim, separators=(",", ":")),
-            ),
-            signature=proof,
+        event = TokenValidationEvent(None, None, None, None, False)
+        start = time.perf_counter()
+
+        try:
+            token = self._validate(did_token, event)
+        except MagicError as e:
+            event.error = e
+
+            if isinstance(e, _DID_TOKEN_ERRORS):
+                event.status = TokenValidationResult.get_status(e.__class__)
+                event.outcome = TokenValidationEvent.get_outcome(e.__class__)
+
+            raise
+        else:
+            event.status = TokenValidationResult.VALID
+            event.outcome = TokenValidationEvent.VALID
+
+            return token
+        finally:
+            event.total_time = time.perf_counter() - start
+            hooks.emit(TOKEN_VALIDATION_EVENT, event)
+
+    def try_validate(self, did_token):
+        """Validate a DID token like ``validate``, but report the outcome instead
+        of raising an error, so that rejecting many tokens does not cost an
+        exception each. Only the tokens that fail to decode construct one
+        internally.
+
+        Args:
+            did_token (base64.str|DecodedDIDToken): Base64 encoded string.
+
+        Raises:
+            MagicError: If the client ID is unknown and cannot be fetched.
+
+        Returns:
+            result (TokenValidationResult): The status of the DID token and the
+                reason it is not valid. Its ``token`` is the decoded token, with
+                the recovered address when it is valid, or None if it is
+                malformed.
+        """
+        hooks = self._get_hooks()
+
+        if hooks is None:
+            return self._try_validate(did_token)
+
+        event = TokenValidationEvent(None, None, None, None, False)
+        start = time.perf_counter()
+
+        try:
+            result = self._try_validate(did_token, event)
+            event.status = result.status
+            event.outcome = TokenValidationEvent.get_outcome(result.error_class)
+        except MagicError as e:
+            event.error = e
+            raise
+        finally:
+            event.total_time = time.perf_counter() - start
+            hooks.emit(TOKEN_VALIDATION_EVENT, event)
+
+        return result
+
+    def _get_hooks(self):
+        """
+        Returns:
+            hooks (Hooks): The hooks of the Magic instance, or None if no
+                callback is registered for the validations.
+        """
+        hooks = self._hooks
+
+        if hooks is None or not hooks.has_callbacks(TOKEN_VALIDATION_EVENT):
+            return None
+
+        return hooks
+
+    def _parse(self, did_token, event=None):
+        """See ``parse``. The decode time is recorded in the event, if given."""
+        if event is None:
+            return self.parse(did_token)
+
+        start = time.perf_counter()
+        token = self.parse(did_token)
+        event.decode_time = time.perf_counter() - start
+
+        return token
+
+    def _validate(self, did_token, event=None):
+        """See ``validate``. The time of each phase is recorded in the event,
+        if given.
+        """
+        token = self._parse(did_token, event)
+        failure = self._get_validation_failure(token, event)
+
+        if failure is not None:
+            raise self._get_error(failure)
+
+        return token
+
+    def _try_validate(self, did_token, event=None):
+        """See ``try_validate`` and ``_validate``."""
+        result = TokenValidationResult(did_token)
+
+        # Spare the exception of ``decode`` to the oversized tokens.
+        if (
+            isinstance(did_token, (str, bytes))
+            and len(did_token) > MAX_DID_TOKEN_LENGTH
+        ):
+            result.set_failure(DIDTokenMalformed, _TOO_LONG_MESSAGE)
+
+            return result
+
+        try:
+            result.token = self._parse(did_token, event)
+        except DIDTokenMalformed as e:
+            result.set_error(e)
+
+            return result
+
+        failure = self._get_validation_failure(result.token, event)
+
+        if failure is None:
+            result.status = TokenValidationResult.VALID
+        else:
+            result.set_failure(*failure)
+
+        return result
+
+    def _get_check_failure(self, token, event=None):
+        """Run the checks that come before the signature recovery.
+
+        Returns:
+            failure (tuple): See ``_get_validation_failure``.
+        """
+        if event is not None:
+            start = time.perf_counter()
+
+        failure = self._get_structure_failure(token) or self._get_claim_failure(
+            token.claim,
         )
 
-        if recovered_address != cls.get_public_address(did_token):
-            raise DIDTokenInvalid(
-                message='Signature mismatch between "proof" and "claim". Please '
-                "generate a new token with an intended issuer.",
-            )
+        if event is not None:
+            event.claim_check_time = time.perf_counter() - start
 
-        current_time_in_s = epoch_time_now()
+        return failure
 
-        if current_time_in_s > claim["ext"]:
-            raise DIDTokenExpired(
-                message="Given DID token has expired. Please generate a new one.",
-            )
+    def _get_validation_failure(self, token, event=None):
+        """Check a decoded DID token, the cheap checks first.
 
-        if current_time_in_s < apply_did_token_nbf_grace_period(claim["nbf"]):
-            raise DIDTokenInvalid(
-                message="Given DID token cannot be used at this time. Please "
-                'check the "nbf" field and regenerate a new token with a suitable '
-                "value.",
-            )
+        Args:
+            token (DecodedDIDToken): The decoded DID token. The recovered
+                address is set on it when it is valid.
+            event (TokenValidationEvent): Records the time of the checks.
+
+        Returns:
+            failure (tuple): The class and the message of the error of the first
+                failed check, or None if the token is valid.
+        """
+        failure = self._get_check_failure(token, event)
+
+        if failure is not None:
+            return failure
+
+        if event is not None:
+            start = time.perf_counter()
+
+        recovered_address = self._get_verified_address(token)
+
+        if recovered_address is None:
+            try:
+                failure = self._set_recovered_address(
+                    token,
+                    recover_signer(token.signed_claim, token.proof),
+                )
+            except ValueError:
+                # The proof looks like a signature but has no signer, e.g. its
+                # recovery id is unknown.
+                failure = _SIGNATURE_MISMATCH
+        else:
+            token.recovered_address = recovered_address
+
+        if event is not None:
+            event.cached = recovered_address is not None
+            event.recover_time = time.perf_counter() - start
+
+        return failure
+
+    def validate_many(self, did_tokens, workers=None):
+        """Validate a batch of DID tokens. The signature recoveries are CPU bound,
+        so they are spread across a pool of processes.
+
+        Args:
+            did_tokens (iterable): Base64 encoded strings.
+            workers (int): The maximum number of worker processes. Defaults to
+                the number of CPUs. A worker is only started per
+                ``MIN_SIGNATURES_PER_WORKER`` signatures to recover. With a
+                single worker, the signatures are recovered in the calling
+                process.
 
-        if claim["aud"] != magic_admin.client_id:
-            raise DIDTokenInvalid(
-                message='"aud" field does not match your client. Please check your secret key.',
+        Raises:
+            MagicError: If the client ID is unknown and cannot be fetched.
+
+        Returns:
+            results (list): A ``TokenValidationResult`` per DID token, in input
+                order. Failures are reported in the results instead of raised.
+        """
+        hooks = self._get_hooks()
+        # The (result, event) of every DID token, and of the ones whose signer
+        # is left to recover.
+        validations = []
+        pending = []
+
+        for did_token in did_tokens:
+            result = TokenValidationResult(did_token)
+            event = (
+                None
+                if hooks is None
+                else TokenValidationEvent(None, None, None, None, False)
             )
+            validations.append((result, event))
+
+            try:
+                token = self._parse(did_token, event)
+            except MagicError as e:
+                result.set_error(e)
+                continue
+
+            result.token = token
+            # Reject the tokens failing the cheap checks before the recoveries.
+            failure = self._get_check_failure(token, event)
+
+            if failure is not None:
+                result.set_failure(*failure)
+                continue
+
+            if event is not None:
+                start = time.perf_counter()
+
+            recovered_address = self._get_verified_address(token)
+
+            if recovered_address is None:
+                pending.append((result, event))
+                continue
+
+            token.recovered_address = recovered_address
+            result.status = TokenValidationResult.VALID
+
+            if event is not None:
+                event.cached = True
+                event.recover_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        recovered = _recover_signers(
+            [(result.token.signed_claim, result.token.proof) for result, _ in pending],
+            workers or os.cpu_count() or 1,
+        )
+        recover_time = time.perf_counter() - start
+
+        for (result, event), (recovered_address, error) in zip(pending, recovered):
+            if event is not None:
+                event.recover_time = recover_time
+
+            if error is not None:
+                result.set_error(
+                    DIDTokenInvalid(
+                        message="Signature could not be recovered from the "
+                        '"proof". {}'.format(error),
+                    ),
+                )
+                continue
+
+            # A failure is reported on its own token, not on the whole batch.
+            try:
+                failure = self._set_recovered_address(
+                    result.token,
+                    recovered_address,
+                )
+            except MagicError as e:
+                result.set_error(e)
+                continue
+
+            if failure is None:
+                result.status = TokenValidationResult.VALID
+            else:
+                result.set_failure(*failure)
+
+        if hooks is not None:
+            for result, event in validations:
+                event.status = result.status
+                event.outcome = TokenValidationEvent.get_outcome(result.error_class)
+                event.total_time = sum(
+                    phase_time
+                    for phase_time in (
+                        event.decode_time,
+                        event.claim_check_time,
+                        event.recover_time,
+                    )
+                    if phase_time is not None
+                )
+                hooks.emit(TOKEN_VALIDATION_EVENT, event)
+
+        return [result for result, _ in validations]
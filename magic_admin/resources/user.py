@@ -1,19 +1,303 @@
+import hashlib
+import itertools
+import json
+import math
+import os
+import struct
+import zlib
+
+from magic_admin.error import MagicError
 from magic_admin.resources.base import ResourceComponent
 from magic_admin.resources.wallet import WalletType
+from magic_admin.response import MagicResponse
+from magic_admin.utils.cache import StaleWhileRevalidateCache
+from magic_admin.utils.cache_backend import BackendCache
+from magic_admin.utils.concurrency import map_concurrently
 from magic_admin.utils.did_token import construct_issuer_with_public_address
 
 
+MAX_CONCURRENCY = 10
+CHECKPOINT_INTERVAL = 100
+METADATA_CACHE_TTL = 60
+METADATA_CACHE_STALE_TTL = 300
+
+# A serialized metadata cache entry is this header, then the response content,
+# compressed when it is smaller so.
+_METADATA_ENTRY_HEADER = struct.Struct(">?QH")  # compressed, fresh_until, status
+
+
+def _serialize_metadata_entry(entry):
+    response, fresh_until = entry
+    content = response.content
+    compressed_content = zlib.compress(content)
+    compressed = len(compressed_content) < len(content)
+
+    return _METADATA_ENTRY_HEADER.pack(
+        compressed,
+        # The header holds whole seconds, the TTLs of the cache can be floats.
+        math.ceil(fresh_until),
+        response.status_code,
+    ) + (compressed_content if compressed else content)
+
+
+def _deserialize_metadata_entry(data):
+    compressed, fresh_until, status_code = _METADATA_ENTRY_HEADER.unpack_from(data)
+    content = data[_METADATA_ENTRY_HEADER.size :]
+
+    if compressed:
+        content = zlib.decompress(content)
+
+    return MagicResponse(content, json.loads(content), status_code), fresh_until
+
+
+class UserRequestResult:
+    """The outcome of the request for one user of a bulk ``User`` method."""
+
+    def __init__(self, issuer, response=None, error=None):
+        self.issuer = issuer
+        self.response = response
+        self.error = error
+
+    def __repr__(self):
+        return "{class_name}(issuer={issuer!r}, error={error!r})".format(
+            class_name=self.__class__.__name__,
+            issuer=self.issuer,
+            error=self.error,
+        )
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class BulkLogoutSummary:
+    """The progress of a bulk logout, which is also its checkpoint.
+
+    Failures are recorded with the index of the user in the input and its
+    issuer, when known. DID tokens are never written to the checkpoint.
+
+    The checkpoint is a JSON Lines file that is only appended to: each save
+    writes the failures since the previous save, then the progress.
+    """
+
+    def __init__(self, processed=0, succeeded=0, failed=None):
+        self.processed = processed
+        self.succeeded = succeeded
+        self.failed = failed if failed is not None else []
+        # The failures already written to the checkpoint.
+        self._saved_failures = 0
+
+    def __repr__(self):
+        return (
+            "{class_name}(processed={processed}, succeeded={succeeded}, "
+            "failed={failed})".format(
+                class_name=self.__class__.__name__,
+                processed=self.processed,
+                succeeded=self.succeeded,
+                failed=len(self.failed),
+            )
+        )
+
+    def add_result(self, index, result):
+        self.processed += 1
+
+        if result.ok:
+            self.succeeded += 1
+        else:
+            self.failed.append(
+                {"index": index, "issuer": result.issuer, "error": str(result.error)},
+            )
+
+    def to_dict(self):
+        return {
+            "processed": self.processed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
+
+    @classmethod
+    def load(cls, path):
+        """Load the progress of the last complete save. The lines of an
+        interrupted save are dropped from the file, so that the next saves
+        append after the last complete one.
+
+        Args:
+            path (str): The path of the checkpoint file.
+
+        Returns:
+            summary (BulkLogoutSummary): The saved progress, or a new summary if
+                the file does not exist.
+        """
+        summary = cls()
+        unsaved_failures = []
+        saved_size = size = 0
+
+        try:
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+
+                    size += len(line)
+
+                    if "processed" in record:
+                        summary.processed = record["processed"]
+                        summary.succeeded = record["succeeded"]
+                        summary.failed.extend(unsaved_failures)
+                        unsaved_failures = []
+                        saved_size = size
+                    else:
+                        unsaved_failures.append(record)
+
+            if os.path.getsize(path) > saved_size:
+                os.truncate(path, saved_size)
+        except FileNotFoundError:
+            return cls()
+
+        summary._saved_failures = len(summary.failed)
+
+        return summary
+
+    def save(self, path):
+        # Only the new failures are written, and the progress line last, so
+        # that an interrupted save is detected and dropped by ``load``.
+        lines = [
+            json.dumps(failure) + "\n"
+            for failure in self.failed[self._saved_failures :]
+        ]
+        lines.append(
+            json.dumps({"processed": self.processed, "succeeded": self.succeeded})
+            + "\n",
+        )
+
+        with open(path, "a") as f:
+            f.writelines(lines)
+
+        self._saved_failures = len(self.failed)
+
+
 class User(ResourceComponent):
     v1_user_info = "/v1/admin/user"
     v1_user_logout = "/v1/admin/user/logout"
 
-    def get_metadata_by_issuer_and_wallet(self, issuer, wallet_type):
+    # Opt-in cache of the user metadata responses. See ``setup_metadata_cache``.
+    metadata_cache = None
+
+    def setup_metadata_cache(
+        self,
+        maxsize,
+        ttl=METADATA_CACHE_TTL,
+        stale_ttl=METADATA_CACHE_STALE_TTL,
+        backend=None,
+    ):
+        """Remember the metadata of users, so that fetching it again on every
+        authenticated request does not call Magic.
+
+        Metadata older than ``ttl`` is still returned for ``stale_ttl`` more
+        seconds, while it is refreshed in the background. Logging a user out
+        with ``logout_by_issuer`` forgets their metadata.
+
+        Args:
+            maxsize (int): The maximum number of metadata responses to remember,
+                one per issuer and wallet type. A falsy value disables the
+                cache.
+            ttl (int): The number of seconds metadata is fresh for.
+            stale_ttl (int): The number of seconds stale metadata is returned
+                for while it is refreshed.
+            backend (CacheBackend): Where to keep the metadata, e.g. a
+                ``RedisCacheBackend`` shared by every worker process, instead
+                of a cache of ``maxsize`` entries in this process. The cache is
+                enabled whatever ``maxsize`` is.
+
+        Returns:
+            None.
+        """
+        if backend is not None:
+            # The metadata of a user differs between apps, so the entries of
+            # each app are kept apart.
+            namespace = "magic:metadata:{}:".format(
+                hashlib.sha256(
+                    (self._api_secret_key or "").encode("utf-8"),
+                ).hexdigest()[:16],
+            )
+            store = BackendCache(
+                backend,
+                namespace.encode("utf-8"),
+                _serialize_metadata_entry,
+                _deserialize_metadata_entry,
+            )
+        elif maxsize:
+            store = None
+        else:
+            self.metadata_cache = None
+            return
+
+        self.metadata_cache = StaleWhileRevalidateCache(
+            maxsize,
+            ttl,
+            stale_ttl,
+            store=store,
+        )
+
+    def get_metadata_cache_stats(self):
+        """See ``StaleWhileRevalidateCache.get_stats``.
+
+        Returns:
+            stats (dict): The metadata cache stats, or None if the cache is
+                disabled.
+        """
+        if self.metadata_cache is None:
+            return None
+
+        return self.metadata_cache.get_stats()
+
+    @staticmethod
+    def _get_metadata_cache_key(issuer, wallet_type):
+        if isinstance(wallet_type, WalletType):
+            wallet_type = wallet_type.value
+
+        return "{}:{}".format(issuer, wallet_type)
+
+    def invalidate_metadata(self, issuer):
+        """Forget the cached metadata of a user, for every wallet type.
+
+        Args:
+            issuer (str): The issuer of the user.
+
+        Returns:
+            None.
+        """
+        if self.metadata_cache is None:
+            return
+
+        self.metadata_cache.delete(
+            *[
+                self._get_metadata_cache_key(issuer, wallet_type)
+                for wallet_type in WalletType
+            ],
+        )
+
+    def _request_metadata(self, issuer, wallet_type):
         return self.request(
             "get",
             self.v1_user_info,
             params={"issuer": issuer, "wallet_type": wallet_type},
         )
 
+    def get_metadata_by_issuer_and_wallet(self, issuer, wallet_type):
+        if self.metadata_cache is None:
+            return self._request_metadata(issuer, wallet_type)
+
+        return self.metadata_cache.get_or_fetch(
+            self._get_metadata_cache_key(issuer, wallet_type),
+            lambda: self._request_metadata(issuer, wallet_type),
+        )
+
     def get_metadata_by_public_address_and_wallet(self, public_address, wallet_type):
         return self.get_metadata_by_issuer_and_wallet(
             construct_issuer_with_public_address(public_address),
@@ -36,8 +320,56 @@ class User(ResourceComponent):
     def get_metadata_by_token(self, did_token):
         return self.get_metadata_by_issuer(self.Token.get_issuer(did_token))
 
+    def _get_metadata_result(self, issuer, wallet_type):
+        try:
+            return UserRequestResult(
+                issuer,
+                response=self.get_metadata_by_issuer_and_wallet(issuer, wallet_type),
+            )
+        except MagicError as e:
+            return UserRequestResult(issuer, error=e)
+
+    def get_metadata_many(
+        self,
+        issuers,
+        wallet_type=WalletType.NONE,
+        max_concurrency=MAX_CONCURRENCY,
+        ordered=True,
+    ):
+        """Fetch the metadata of many users with concurrent requests over the
+        pooled connections.
+
+        Args:
+            issuers (iterable): The issuers of the users. It is consumed lazily.
+            wallet_type (WalletType): The wallet type of the metadata.
+            max_concurrency (int): The maximum number of requests in flight.
+                Keep it within the ``pool_maxsize`` of the ``Magic`` instance
+                so that every request reuses a pooled connection.
+            ordered (bool): Whether to yield the results in the order of the
+                issuers, rather than as soon as they are fetched.
+
+        Returns:
+            results (generator): A ``UserRequestResult`` per issuer. A failed
+                request does not stop the others, its error is set on its
+                result instead.
+        """
+        return map_concurrently(
+            lambda issuer: self._get_metadata_result(issuer, wallet_type),
+            issuers,
+            max_concurrency,
+            ordered=ordered,
+        )
+
     def logout_by_issuer(self, issuer):
-        return self.request("post", self.v1_user_logout, data={"issuer": issuer})
+        try:
+            return self.request(
+                "post",
+                self.v1_user_logout,
+                data={"issuer": issuer},
+            )
+        finally:
+            # A failed logout may still have been applied.
+            self.invalidate_metadata(issuer)
 
     def logout_by_public_address(self, public_address):
         return self.logout_by_issuer(
@@ -46,3 +378,130 @@ class User(ResourceComponent):
 
     def logout_by_token(self, did_token):
         return self.logout_by_issuer(self.Token.get_issuer(did_token))
+
+    def _get_logout_result(self, issuer):
+        # Rate limited logouts are retried by the retry policy of the request
+        # client, which honors the Retry-After of the responses.
+        try:
+            return UserRequestResult(issuer, response=self.logout_by_issuer(issuer))
+        except MagicError as e:
+            return UserRequestResult(issuer, error=e)
+
+    def _logout_many(
+        self,
+        users,
+        get_issuer,
+        max_concurrency,
+        checkpoint_path,
+        checkpoint_interval,
+    ):
+        if checkpoint_path is None:
+            summary = BulkLogoutSummary()
+        else:
+            summary = BulkLogoutSummary.load(checkpoint_path)
+
+        def logout(indexed_user):
+            index, user = indexed_user
+
+            try:
+                issuer = get_issuer(user)
+            except MagicError as e:
+                return index, UserRequestResult(None, error=e)
+
+            return index, self._get_logout_result(issuer)
+
+        # The results are processed in input order, so the users processed by
+        # an interrupted run are the first ``summary.processed`` ones.
+        indexed_users = enumerate(
+            itertools.islice(users, summary.processed, None),
+            start=summary.processed,
+        )
+
+        try:
+            for index, result in map_concurrently(
+                logout,
+                indexed_users,
+                max_concurrency,
+            ):
+                summary.add_result(index, result)
+
+                if (
+                    checkpoint_path is not None
+                    and summary.processed % checkpoint_interval == 0
+                ):
+                    summary.save(checkpoint_path)
+        finally:
+            if checkpoint_path is not None:
+                summary.save(checkpoint_path)
+
+        return summary
+
+    def logout_many_by_issuer(
+        self,
+        issuers,
+        max_concurrency=MAX_CONCURRENCY,
+        checkpoint_path=None,
+        checkpoint_interval=CHECKPOINT_INTERVAL,
+    ):
+        """Log out many users with concurrent requests, e.g. after a compromise.
+
+        Rate limited logouts are retried by the retry policy of the instance.
+        Failures are recorded in the summary and do not stop the run.
+
+        With a ``checkpoint_path``, the progress is saved every
+        ``checkpoint_interval`` users and when the run stops. A run given the
+        checkpoint of an interrupted run, and the same users, resumes after the
+        last user processed.
+
+        Args:
+            issuers (iterable): The issuers of the users. It is consumed lazily.
+            max_concurrency (int): The maximum number of requests in flight.
+            checkpoint_path (str): The file to save the progress to.
+            checkpoint_interval (int): The number of users processed between two
+                checkpoints.
+
+        Returns:
+            summary (BulkLogoutSummary): The number of users processed and
+                logged out, and the failures.
+        """
+        return self._logout_many(
+            issuers,
+            lambda issuer: issuer,
+            max_concurrency,
+            checkpoint_path,
+            checkpoint_interval,
+        )
+
+    def logout_many_by_public_address(
+        self,
+        public_addresses,
+        max_concurrency=MAX_CONCURRENCY,
+        checkpoint_path=None,
+        checkpoint_interval=CHECKPOINT_INTERVAL,
+    ):
+        """See ``logout_many_by_issuer``."""
+        return self._logout_many(
+            public_addresses,
+            construct_issuer_with_public_address,
+            max_concurrency,
+            checkpoint_path,
+            checkpoint_interval,
+        )
+
+    def logout_many_by_token(
+        self,
+        did_tokens,
+        max_concurrency=MAX_CONCURRENCY,
+        checkpoint_path=None,
+        checkpoint_interval=CHECKPOINT_INTERVAL,
+    ):
+        """See ``logout_many_by_issuer``. A malformed DID token is recorded as a
+        failure.
+        """
+        return self._logout_many(
+            did_tokens,
+            self.Token.get_issuer,
+            max_concurrency,
+            checkpoint_path,
+            checkpoint_interval,
+        )
@@ -1,8 +1,15 @@
 from magic_admin.resources.base import ResourceComponent
 from magic_admin.error import DIDTokenMalformed, DIDTokenExpired
 from magic_admin.error import ExpectedBearerStringError
-from web3 import Web3
-import json
+from magic_admin.utils.cache import LRUCache
+from magic_admin.utils.contract import ERC1155
+from magic_admin.utils.contract import ERC721
+from magic_admin.utils.contract import contract_pool
+from magic_admin.utils.time import epoch_time_now
+
+
+OWNERSHIP_CACHE_TTL = 30
+OWNERSHIP_CACHE_NEGATIVE_TTL = 5
 
 
 class Utils(ResourceComponent):
@@ -10,6 +17,270 @@ class Utils(ResourceComponent):
     Utility methods for Magic Admin SDK.
     """
 
+    # Remembers the outcome of on-chain ownership checks. See
+    # ``setup_ownership_cache``.
+    ownership_cache = None
+    ownership_cache_ttl = OWNERSHIP_CACHE_TTL
+    ownership_cache_negative_ttl = OWNERSHIP_CACHE_NEGATIVE_TTL
+
+    def setup_ownership_cache(
+        self,
+        maxsize,
+        ttl=OWNERSHIP_CACHE_TTL,
+        negative_ttl=OWNERSHIP_CACHE_NEGATIVE_TTL,
+    ):
+        """Remember the outcome of on-chain ownership checks for a short time,
+        so that token gating the same wallet again does not call the RPC node.
+        The DID token is still validated on every check.
+
+        Args:
+            maxsize (int): The maximum number of outcomes to remember. A falsy
+                value disables the cache.
+            ttl (int): The number of seconds to remember that a wallet owns a
+                token for.
+            negative_ttl (int): The number of seconds to remember that a wallet
+                does not own a token for. Keep it short so that a user who just
+                got the token is let in quickly.
+
+        Returns:
+            None.
+        """
+        self.ownership_cache = LRUCache(maxsize) if maxsize else None
+        self.ownership_cache_ttl = ttl
+        self.ownership_cache_negative_ttl = negative_ttl
+
+    @staticmethod
+    def _get_ownership_cache_key(
+        wallet_address,
+        contract_address,
+        contract_type,
+        rpc_url,
+        token_id,
+    ):
+        # ERC721 ownership does not depend on the token ID.
+        return (
+            rpc_url,
+            contract_address.lower(),
+            int(token_id) if contract_type == ERC1155 else None,
+            wallet_address.lower(),
+        )
+
+    def invalidate_ownership(
+        self,
+        wallet_address,
+        contract_address,
+        contract_type,
+        rpc_url,
+        token_id=None,
+    ):
+        """Forget the cached outcome of an ownership check, e.g. after the
+        wallet received or sent the token.
+
+        Args:
+            wallet_address (str): The wallet address.
+            contract_address (str): The smart contract address.
+            contract_type (str): Either 'ERC721' or 'ERC1155'.
+            rpc_url (str): The RPC endpoint URL.
+            token_id (str, optional): Required for ERC1155 contracts.
+
+        Returns:
+            None.
+        """
+        if self.ownership_cache is not None:
+            self.ownership_cache.delete(
+                self._get_ownership_cache_key(
+                    wallet_address,
+                    contract_address,
+                    contract_type,
+                    rpc_url,
+                    token_id,
+                ),
+            )
+
+    def _get_cached_ownership(self, *ownership_check):
+        if self.ownership_cache is None:
+            return None
+
+        return self.ownership_cache.get(
+            self._get_ownership_cache_key(*ownership_check),
+        )
+
+    def _cache_ownership(self, owns_token, *ownership_check):
+        if self.ownership_cache is None:
+            return
+
+        if owns_token:
+            ttl = self.ownership_cache_ttl
+        else:
+            ttl = self.ownership_cache_negative_ttl
+
+        self.ownership_cache.set(
+            self._get_ownership_cache_key(*ownership_check),
+            owns_token,
+            expires_at=epoch_time_now() + ttl,
+        )
+
+    def _get_balance(
+        self,
+        wallet_address,
+        contract_address,
+        contract_type,
+        rpc_url,
+        token_id,
+    ):
+        # Check on-chain if user owns NFT by calling contract with web3. The
+        # web3 instances and contracts are pooled across calls.
+        if contract_type == ERC721:
+            contract = contract_pool.get_contract(rpc_url, contract_address, ERC721)
+            return contract.functions.balanceOf(wallet_address).call()
+        else:  # ERC1155
+            contract = contract_pool.get_contract(rpc_url, contract_address, ERC1155)
+            return contract.functions.balanceOf(wallet_address, int(token_id)).call()
+
+    def _get_balances(self, ownership_checks, rpc_url):
+        # One balanceOf call per ERC721 check and one balanceOfBatch call per
+        # ERC1155 contract, all sent in a single JSON-RPC batch request.
+        calls = []
+        erc1155_indexes = {}
+
+        for index, (wallet_address, contract_address, contract_type, _) in enumerate(
+            ownership_checks,
+        ):
+            if contract_type == ERC721:
+                contract = contract_pool.get_contract(
+                    rpc_url,
+                    contract_address,
+                    ERC721,
+                )
+                calls.append(
+                    ([index], contract.functions.balanceOf(wallet_address), False),
+                )
+            else:  # ERC1155
+                erc1155_indexes.setdefault(contract_address, []).append(index)
+
+        for contract_address, indexes in erc1155_indexes.items():
+            contract = contract_pool.get_contract(rpc_url, contract_address, ERC1155)
+            calls.append(
+                (
+                    indexes,
+                    contract.functions.balanceOfBatch(
+                        [ownership_checks[index][0] for index in indexes],
+                        [int(ownership_checks[index][3]) for index in indexes],
+                    ),
+                    True,
+                ),
+            )
+
+        with contract_pool.get_web3(rpc_url).batch_requests() as batch:
+            for _, function, _ in calls:
+                batch.add(function)
+
+            responses = batch.execute()
+
+        balances = [None] * len(ownership_checks)
+
+        for (indexes, _, is_batch_call), response in zip(calls, responses):
+            for index, balance in zip(
+                indexes,
+                response if is_batch_call else [response],
+            ):
+                balances[index] = balance
+
+        return balances
+
+    def _owns_token(
+        self,
+        wallet_address,
+        contract_address,
+        contract_type,
+        rpc_url,
+        token_id,
+    ):
+        ownership_check = (
+            wallet_address,
+            contract_address,
+            contract_type,
+            rpc_url,
+            token_id,
+        )
+        owns_token = self._get_cached_ownership(*ownership_check)
+
+        if owns_token is None:
+            owns_token = self._get_balance(*ownership_check) > 0
+            self._cache_ownership(owns_token, *ownership_check)
+
+        return owns_token
+
+    def check_token_ownership_many(self, ownership_checks, rpc_url):
+        """Check on-chain whether many wallets own tokens, with one JSON-RPC
+        batch request to the RPC node. The checks of the same ERC1155 contract
+        are grouped in one ``balanceOfBatch`` call.
+
+        Unlike ``validate_token_ownership``, it takes wallet addresses rather
+        than DID tokens. The ownership cache is used, when it is enabled.
+
+        Args:
+            ownership_checks (list): ``(wallet_address, contract_address,
+                contract_type, token_id)`` tuples. The token ID is required for
+                ERC1155 contracts and ignored for ERC721 ones.
+            rpc_url (str): The RPC endpoint URL.
+
+        Raises:
+            ValueError: If an ERC1155 check has no token_id.
+
+        Returns:
+            owns_tokens (list): Whether each wallet owns its token, in the order
+                of the checks.
+        """
+        owns_tokens = []
+        pending_indexes = []
+
+        for index, (
+            wallet_address,
+            contract_address,
+            contract_type,
+            token_id,
+        ) in enumerate(ownership_checks):
+            if contract_type == ERC1155 and not token_id:
+                raise ValueError("ERC1155 requires a tokenId")
+
+            owns_tokens.append(
+                self._get_cached_ownership(
+                    wallet_address,
+                    contract_address,
+                    contract_type,
+                    rpc_url,
+                    token_id,
+                ),
+            )
+
+            if owns_tokens[index] is None:
+                pending_indexes.append(index)
+
+        if not pending_indexes:
+            return owns_tokens
+
+        balances = self._get_balances(
+            [ownership_checks[index] for index in pending_indexes],
+            rpc_url,
+        )
+
+        for index, balance in zip(pending_indexes, balances):
+            wallet_address, contract_address, contract_type, token_id = (
+                ownership_checks[index]
+            )
+            owns_tokens[index] = balance > 0
+            self._cache_ownership(
+                owns_tokens[index],
+                wallet_address,
+                contract_address,
+                contract_type,
+                rpc_url,
+                token_id,
+            )
+
+        return owns_tokens
+
     def parse_authorization_header(self, header: str) -> str:
         """
         Parse a raw DID Token from the given Authorization header.
@@ -42,7 +313,7 @@ class Utils(ResourceComponent):
         Token Gating function validates user ownership of wallet + NFT.
 
         Args:
-            did_token (str): The DID token to validate
+            did_token (str|DecodedDIDToken): The DID token to validate
             contract_address (str): The smart contract address
             contract_type (str): Either 'ERC721' or 'ERC1155'
             rpc_url (str): The RPC endpoint URL
@@ -61,21 +332,37 @@ class Utils(ResourceComponent):
                 }
         """
         # Make sure if ERC1155 has a tokenId
-        if contract_type == "ERC1155" and not token_id:
+        if contract_type == ERC1155 and not token_id:
             raise ValueError("ERC1155 requires a tokenId")
 
-        # Validate DID token
+        wallet_address, error_response = self._get_wallet_address(did_token)
+
+        if error_response is not None:
+            return error_response
+
+        return self._get_ownership_response(
+            self._owns_token(
+                wallet_address,
+                contract_address,
+                contract_type,
+                rpc_url,
+                token_id,
+            ),
+        )
+
+    def _get_wallet_address(self, did_token):
+        # Returns the wallet address of a valid DID token, or the response of
+        # validate_token_ownership to an invalid one.
         try:
-            self.Token.validate(did_token)
-            wallet_address = self.Token.get_public_address(did_token)
+            return self.Token.validate(did_token).public_address, None
         except DIDTokenMalformed:
-            return {
+            return None, {
                 "valid": False,
                 "error_code": "UNAUTHORIZED",
                 "message": "Invalid DID token: ERROR_MALFORMED_TOKEN",
             }
         except DIDTokenExpired:
-            return {
+            return None, {
                 "valid": False,
                 "error_code": "UNAUTHORIZED",
                 "message": "Invalid DID token: ERROR_DIDT_EXPIRED",
@@ -83,25 +370,9 @@ class Utils(ResourceComponent):
         except Exception as e:
             raise Exception(str(e))
 
-        # Check on-chain if user owns NFT by calling contract with web3
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
-
-        if contract_type == "ERC721":
-            # ERC721 ABI for balanceOf function
-            abi = json.loads(
-                '[{"constant":true,"inputs":[{"name":"owner","type":"address"}],"name":"balanceOf","outputs":[{"name":"","type":"uint256"}],"type":"function"}]'
-            )
-            contract = w3.eth.contract(address=contract_address, abi=abi)
-            balance = contract.functions.balanceOf(wallet_address).call()
-        else:  # ERC1155
-            # ERC1155 ABI for balanceOf function
-            abi = json.loads(
-                '[{"constant":true,"inputs":[{"name":"owner","type":"address"},{"name":"id","type":"uint256"}],"name":"balanceOf","outputs":[{"name":"","type":"uint256"}],"type":"function"}]'
-            )
-            contract = w3.eth.contract(address=contract_address, abi=abi)
-            balance = contract.functions.balanceOf(wallet_address, int(token_id)).call()
-
-        if balance > 0:
+    @staticmethod
+    def _get_ownership_response(owns_token):
+        if owns_token:
             return {"valid": True, "error_code": "", "message": ""}
 
         return {
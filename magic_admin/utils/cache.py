@@ -0,0 +1,236 @@
+import threading
+from collections import OrderedDict
+
+from magic_admin.utils.time import epoch_time_now
+
+
+class LRUCache:
+    """A thread safe, size bounded LRU cache whose entries can carry an
+    expiration time.
+
+    An entry set with ``expires_at`` (an epoch time in seconds) is evicted the
+    first time it is looked up after that time has passed. The lookups are
+    counted in ``hits`` and ``misses``.
+    """
+
+    def __init__(self, maxsize):
+        if maxsize <= 0:
+            raise ValueError("maxsize has to be a positive integer.")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, expires_at = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            if expires_at is not None and epoch_time_now() > expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+    def set(self, key, value, expires_at=None):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def values(self):
+        """
+        Returns:
+            values (list): The values of the entries, expired ones included.
+        """
+        with self._lock:
+            return [value for value, _ in self._entries.values()]
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class StaleWhileRevalidateCache:
+    """A thread safe LRU cache of fetched values that serves an expired value
+    for a while longer, while refreshing it in the background.
+
+    A value is fresh for ``ttl`` seconds, then stale for ``stale_ttl`` seconds.
+    Looking up a stale value returns it right away and fetches a new one in a
+    background thread, once at a time per key. A value is dropped once it is
+    neither fresh nor stale, and the next lookup fetches it again.
+
+    The ``(value, fresh_until)`` entries are kept in an ``LRUCache`` of
+    ``maxsize`` entries, or in the given ``store``, e.g. a ``BackendCache``
+    shared by several processes.
+    """
+
+    def __init__(self, maxsize, ttl, stale_ttl, store=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+        self.store = store if store is not None else LRUCache(maxsize)
+        self._refreshing = set()
+        # The fetches of the missed keys in flight, per key.
+        self._fetching = {}
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refresh_errors": 0,
+        }
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.store)
+
+    def _count(self, stat):
+        with self._lock:
+            self._stats[stat] += 1
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Args:
+            key (hashable): The cache key.
+            fetch (callable): Fetches the value of the key. Its exceptions are
+                raised on a miss, and counted as ``refresh_errors`` during a
+                background refresh.
+
+        Returns:
+            value: The cached or fetched value. A value fetched while the key
+                was deleted is returned but not cached.
+        """
+        entry = self.store.get(key)
+
+        if entry is None:
+            self._count("misses")
+            fetch_id = object()
+
+            with self._lock:
+                self._fetching.setdefault(key, set()).add(fetch_id)
+
+            try:
+                value = fetch()
+            finally:
+                deleted = self._end_fetch(key, fetch_id)
+
+            # The key was deleted during the fetch, do not bring it back.
+            if not deleted:
+                self.set(key, value)
+
+            return value
+
+        value, fresh_until = entry
+
+        if epoch_time_now() <= fresh_until:
+            self._count("hits")
+        else:
+            self._count("stale_hits")
+            self._refresh(key, fetch)
+
+        return value
+
+    def _end_fetch(self, key, fetch_id):
+        """
+        Returns:
+            deleted (bool): Whether the key was deleted during the fetch.
+        """
+        with self._lock:
+            fetch_ids = self._fetching.get(key)
+
+            if fetch_ids is None or fetch_id not in fetch_ids:
+                return True
+
+            fetch_ids.discard(fetch_id)
+
+            if not fetch_ids:
+                del self._fetching[key]
+
+        return False
+
+    def _refresh(self, key, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+
+            self._refreshing.add(key)
+
+        threading.Thread(
+            target=self._run_refresh,
+            args=(key, fetch),
+            daemon=True,
+        ).start()
+
+    def _run_refresh(self, key, fetch):
+        try:
+            value = fetch()
+        except Exception:
+            self._count("refresh_errors")
+
+            with self._lock:
+                self._refreshing.discard(key)
+
+            return
+
+        with self._lock:
+            # The key was deleted during the refresh, do not bring it back.
+            if key not in self._refreshing:
+                return
+
+            self._refreshing.discard(key)
+
+        self.set(key, value)
+
+    def set(self, key, value):
+        now = epoch_time_now()
+
+        self.store.set(
+            key,
+            (value, now + self.ttl),
+            expires_at=now + self.ttl + self.stale_ttl,
+        )
+
+    def delete(self, *keys):
+        with self._lock:
+            self._refreshing.difference_update(keys)
+
+            for key in keys:
+                self._fetching.pop(key, None)
+
+        self.store.delete(*keys)
+
+    def get_stats(self):
+        """
+        Returns:
+            stats (dict): The number of fresh ``hits``, ``stale_hits`` and
+                ``misses`` so far, the number of failed background refreshes
+                (``refresh_errors``) and the number of cached values
+                (``size``), which is None for a store that does not count
+                them.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+
+        stats["size"] = len(self.store) if hasattr(self.store, "__len__") else None
+
+        return stats
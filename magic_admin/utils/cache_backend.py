@@ -0,0 +1,381 @@
+"""Cache backends that the caches of a process can store their entries in.
+
+``InMemoryCacheBackend`` keeps the entries in the process. ``RedisCacheBackend``
+keeps them in a server speaking the Redis protocol (RESP), so that a cache hit
+in one worker process saves the call to Magic in all the others. It only needs
+the standard library.
+
+Backends store bytes. ``BackendCache`` puts a backend behind the interface of
+``LRUCache``, serializing the values and failing open: a backend error is a
+cache miss, never a failed request.
+"""
+
+import math
+import queue
+import socket
+import threading
+
+from magic_admin.error import CacheBackendError
+from magic_admin.utils.cache import LRUCache
+from magic_admin.utils.time import epoch_time_now
+
+
+IN_MEMORY_CACHE_SIZE = 10000
+
+REDIS_PORT = 6379
+REDIS_TIMEOUT = 1
+REDIS_POOL_SIZE = 10
+
+
+class CacheBackend:
+    """The interface of the cache backends. Keys and values are bytes."""
+
+    def get(self, key):
+        """
+        Args:
+            key (bytes): The key.
+
+        Raises:
+            CacheBackendError: If the backend cannot be reached.
+
+        Returns:
+            value (bytes): The value of the key, or None if it is missing or
+                expired.
+        """
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        """
+        Args:
+            key (bytes): The key.
+            value (bytes): The value.
+            ttl (float): The number of seconds to keep the value for. None
+                keeps it until it is evicted.
+
+        Raises:
+            CacheBackendError: If the backend cannot be reached.
+
+        Returns:
+            None.
+        """
+        raise NotImplementedError
+
+    def delete(self, *keys):
+        """
+        Args:
+            keys (bytes): The keys.
+
+        Raises:
+            CacheBackendError: If the backend cannot be reached.
+
+        Returns:
+            None.
+        """
+        raise NotImplementedError
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """A backend keeping at most ``maxsize`` entries in the process."""
+
+    def __init__(self, maxsize=IN_MEMORY_CACHE_SIZE):
+        self._entries = LRUCache(maxsize)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, value, ttl=None):
+        self._entries.set(
+            key,
+            value,
+            expires_at=None if ttl is None else epoch_time_now() + ttl,
+        )
+
+    def delete(self, *keys):
+        self._entries.delete(*keys)
+
+
+class RedisCacheBackend(CacheBackend):
+    """A backend storing the entries in a Redis compatible server, over a
+    thread safe pool of connections.
+
+    Only ``GET``, ``SET`` and ``DEL`` are sent, along with ``AUTH`` and
+    ``SELECT`` when a connection is opened.
+    """
+
+    def __init__(
+        self,
+        host="localhost",
+        port=REDIS_PORT,
+        db=0,
+        password=None,
+        username=None,
+        timeout=REDIS_TIMEOUT,
+        pool_size=REDIS_POOL_SIZE,
+    ):
+        """
+        Args:
+            host (str): The server host.
+            port (int): The server port.
+            db (int): The database number.
+            password (str): The password, if the server requires one.
+            username (str): The ACL user of the password.
+            timeout (float): The connect and read timeout, in seconds. Keep it
+                short, a slow cache is worse than a cache miss.
+            pool_size (int): The maximum number of idle connections kept open.
+        """
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.username = username
+        self.timeout = timeout
+
+        self._connections = queue.LifoQueue(maxsize=pool_size)
+
+    @staticmethod
+    def _encode_command(*args):
+        parts = [b"*%d\r\n" % len(args)]
+
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode("utf-8")
+            elif isinstance(arg, int):
+                arg = b"%d" % arg
+            elif not isinstance(arg, bytes):
+                raise CacheBackendError(
+                    "Cannot send a {} argument.".format(arg.__class__.__name__),
+                )
+
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+
+        return b"".join(parts)
+
+    @classmethod
+    def _read_reply(cls, rfile):
+        line = rfile.readline()
+
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("The connection was closed by the server.")
+
+        kind, payload = line[:1], line[1:-2]
+
+        if kind == b"+":
+            return payload
+        elif kind == b"-":
+            raise CacheBackendError(payload.decode("utf-8", "replace"))
+        elif kind == b":":
+            return int(payload)
+        elif kind == b"$":
+            length = int(payload)
+
+            if length < 0:
+                return None
+
+            data = rfile.read(length + 2)
+
+            if len(data) != length + 2:
+                raise ConnectionError("The connection was closed by the server.")
+
+            return data[:-2]
+        elif kind == b"*":
+            length = int(payload)
+
+            if length < 0:
+                return None
+
+            return [cls._read_reply(rfile) for _ in range(length)]
+
+        raise ValueError("Unexpected reply: {!r}".format(line))
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection = (sock, sock.makefile("rb"))
+
+        try:
+            if self.password is not None:
+                if self.username is None:
+                    self._send(connection, "AUTH", self.password)
+                else:
+                    self._send(connection, "AUTH", self.username, self.password)
+
+            if self.db:
+                self._send(connection, "SELECT", self.db)
+        except Exception:
+            self._close(connection)
+            raise
+
+        return connection
+
+    @staticmethod
+    def _close(connection):
+        sock, rfile = connection
+        rfile.close()
+        sock.close()
+
+    def _send(self, connection, *args):
+        sock, rfile = connection
+        sock.sendall(self._encode_command(*args))
+
+        return self._read_reply(rfile)
+
+    def execute(self, *args):
+        """Send a command over a pooled connection.
+
+        Raises:
+            CacheBackendError: If the server cannot be reached or answers with
+                an error.
+
+        Returns:
+            reply: The decoded reply of the server.
+        """
+        try:
+            connection = self._connections.get_nowait()
+        except queue.Empty:
+            connection = None
+
+        try:
+            if connection is None:
+                connection = self._connect()
+
+            reply = self._send(connection, *args)
+        except CacheBackendError:
+            # An error reply leaves the connection usable.
+            if connection is not None:
+                self._release(connection)
+
+            raise
+        except (OSError, ValueError) as e:
+            if connection is not None:
+                self._close(connection)
+
+            raise CacheBackendError(
+                "{} ({})".format(e.__class__.__name__, str(e) or "no error message"),
+            )
+
+        self._release(connection)
+
+        return reply
+
+    def _release(self, connection):
+        try:
+            self._connections.put_nowait(connection)
+        except queue.Full:
+            self._close(connection)
+
+    def get(self, key):
+        return self.execute("GET", key)
+
+    def set(self, key, value, ttl=None):
+        if ttl is None:
+            self.execute("SET", key, value)
+        else:
+            # EX takes whole seconds, round up to not expire early.
+            self.execute("SET", key, value, "EX", math.ceil(ttl))
+
+    def delete(self, *keys):
+        self.execute("DEL", *keys)
+
+    def close(self):
+        while True:
+            try:
+                self._close(self._connections.get_nowait())
+            except queue.Empty:
+                return
+
+
+class BackendCache:
+    """An ``LRUCache`` compatible view of a cache backend, for the caches of the
+    resources.
+
+    The keys are prefixed with ``namespace`` and the values go through the
+    ``serialize`` and ``deserialize`` functions. Backend errors are counted and
+    treated as misses, like the entries that cannot be deserialized, e.g. ones
+    corrupted or written in another format, which are deleted. The lookups are
+    counted in ``hits`` and ``misses``.
+    """
+
+    def __init__(self, backend, namespace, serialize, deserialize):
+        """
+        Args:
+            backend (CacheBackend): The backend storing the entries.
+            namespace (bytes): The prefix of the keys.
+            serialize (callable): Converts a value to bytes.
+            deserialize (callable): Converts bytes back to a value.
+        """
+        self.backend = backend
+        self.namespace = namespace
+        self._serialize = serialize
+        self._deserialize = deserialize
+
+        self.errors = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _get_key(self, key):
+        if isinstance(key, str):
+            key = key.encode("utf-8")
+
+        return self.namespace + key
+
+    def _count_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def _count_lookup(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key, default=None):
+        key = self._get_key(key)
+
+        try:
+            value = self.backend.get(key)
+        except CacheBackendError:
+            self._count_error()
+            value = None
+
+        if value is not None:
+            try:
+                value = self._deserialize(value)
+            except Exception:
+                self._count_error()
+                value = None
+                self._delete(key)
+
+        self._count_lookup(value is not None)
+
+        if value is None:
+            return default
+
+        return value
+
+    def set(self, key, value, expires_at=None):
+        if expires_at is None:
+            ttl = None
+        else:
+            ttl = math.ceil(expires_at - epoch_time_now())
+
+            if ttl <= 0:
+                return
+
+        try:
+            self.backend.set(self._get_key(key), self._serialize(value), ttl=ttl)
+        except CacheBackendError:
+            self._count_error()
+
+    def _delete(self, *keys):
+        try:
+            self.backend.delete(*keys)
+        except CacheBackendError:
+            self._count_error()
+
+    def delete(self, *keys):
+        self._delete(*[self._get_key(key) for key in keys])
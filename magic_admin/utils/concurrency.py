@@ -0,0 +1,120 @@
+"""Concurrent maps with a bounded number of calls in flight, for the bulk
+methods of the resources.
+
+The items are consumed lazily and the results are yielded as a stream, so that
+very long iterables of items can be processed in constant memory.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+
+def _get_window_size(max_concurrency):
+    # Keep more calls queued than running, so that a slow call at the head of
+    # an ordered stream does not leave the workers idle.
+    return max_concurrency * 2
+
+
+def _pop_done_futures(pending, ordered):
+    if ordered:
+        return [pending.popleft().result()]
+
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    pending.difference_update(done)
+
+    return [future.result() for future in done]
+
+
+def map_concurrently(func, items, max_concurrency, ordered=True):
+    """Call ``func`` on every item from a pool of ``max_concurrency`` threads.
+
+    Args:
+        func (callable): The function to call on every item.
+        items (iterable): The items.
+        max_concurrency (int): The maximum number of calls running at once.
+        ordered (bool): Whether to yield the results in the order of the items,
+            rather than as soon as they are ready.
+
+    Returns:
+        results (generator): The return value of every call. An exception
+            raised by a call is raised when its result is reached.
+    """
+    window_size = _get_window_size(max_concurrency)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        pending = deque() if ordered else set()
+
+        try:
+            for item in items:
+                if len(pending) >= window_size:
+                    yield from _pop_done_futures(pending, ordered)
+
+                future = executor.submit(func, item)
+
+                if ordered:
+                    pending.append(future)
+                else:
+                    pending.add(future)
+
+            while pending:
+                yield from _pop_done_futures(pending, ordered)
+        finally:
+            # The consumer stopped early, do not run the queued calls.
+            for future in pending:
+                future.cancel()
+
+
+async def _pop_done_tasks(pending, ordered):
+    if ordered:
+        return [await pending.popleft()]
+
+    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    pending.difference_update(done)
+
+    return [task.result() for task in done]
+
+
+async def map_concurrently_async(func, items, max_concurrency, ordered=True):
+    """The asyncio counterpart of ``map_concurrently``.
+
+    Args:
+        func (callable): The coroutine function to call on every item.
+        items (iterable): The items.
+        max_concurrency (int): The maximum number of calls running at once.
+        ordered (bool): Whether to yield the results in the order of the items,
+            rather than as soon as they are ready.
+
+    Returns:
+        results (async generator): The return value of every call.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    window_size = _get_window_size(max_concurrency)
+
+    async def call(item):
+        async with semaphore:
+            return await func(item)
+
+    pending = deque() if ordered else set()
+
+    try:
+        for item in items:
+            if len(pending) >= window_size:
+                for result in await _pop_done_tasks(pending, ordered):
+                    yield result
+
+            task = asyncio.ensure_future(call(item))
+
+            if ordered:
+                pending.append(task)
+            else:
+                pending.add(task)
+
+        while pending:
+            for result in await _pop_done_tasks(pending, ordered):
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,146 @@
+"""Pooled web3 instances and token contracts for token gating.
+
+Building a ``Web3`` instance opens a new HTTP session to the RPC node, and
+building a contract parses its ABI. ``ContractPool`` keeps both around so that
+repeated ownership checks against the same RPC node and contract reuse them.
+"""
+
+import threading
+
+from magic_admin.utils.cache import LRUCache
+
+
+ERC721 = "ERC721"
+ERC1155 = "ERC1155"
+
+# Only the functions called for token gating.
+TOKEN_CONTRACT_ABIS = {
+    ERC721: [
+        {
+            "constant": True,
+            "inputs": [{"name": "owner", "type": "address"}],
+            "name": "balanceOf",
+            "outputs": [{"name": "", "type": "uint256"}],
+            "type": "function",
+        },
+    ],
+    ERC1155: [
+        {
+            "constant": True,
+            "inputs": [
+                {"name": "owner", "type": "address"},
+                {"name": "id", "type": "uint256"},
+            ],
+            "name": "balanceOf",
+            "outputs": [{"name": "", "type": "uint256"}],
+            "type": "function",
+        },
+        {
+            "constant": True,
+            "inputs": [
+                {"name": "accounts", "type": "address[]"},
+                {"name": "ids", "type": "uint256[]"},
+            ],
+            "name": "balanceOfBatch",
+            "outputs": [{"name": "", "type": "uint256[]"}],
+            "type": "function",
+        },
+    ],
+}
+
+CONTRACT_POOL_SIZE = 32
+
+
+class ContractPool:
+    """A thread safe pool of ``Web3`` instances per RPC URL and of contracts per
+    RPC URL, address and contract type. Each of them keeps at most ``maxsize``
+    entries and evicts the least recently used one.
+
+    web3 is imported on the first lookup.
+    """
+
+    def __init__(self, maxsize=CONTRACT_POOL_SIZE):
+        self._web3s = LRUCache(maxsize)
+        self._contracts = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def get_web3(self, rpc_url):
+        """
+        Args:
+            rpc_url (str): The RPC endpoint URL.
+
+        Returns:
+            w3 (Web3): The pooled web3 instance of the RPC endpoint.
+        """
+        w3 = self._web3s.get(rpc_url)
+
+        if w3 is None:
+            # Check again under the lock so that concurrent first calls share
+            # a single HTTP session.
+            with self._lock:
+                w3 = self._web3s.get(rpc_url)
+
+                if w3 is None:
+                    w3 = self._create_web3(rpc_url)
+                    self._web3s.set(rpc_url, w3)
+
+        return w3
+
+    def _create_web3(self, rpc_url):
+        from web3 import Web3
+
+        # Caching lets web3 fetch the chain ID once per provider. It otherwise
+        # fetches it twice for every contract call.
+        return Web3(Web3.HTTPProvider(rpc_url, cache_allowed_requests=True))
+
+    def get_contract(self, rpc_url, contract_address, contract_type):
+        """
+        Args:
+            rpc_url (str): The RPC endpoint URL.
+            contract_address (str): The smart contract address.
+            contract_type (str): Either 'ERC721' or 'ERC1155'.
+
+        Raises:
+            KeyError: If the contract type is unknown.
+
+        Returns:
+            contract (Contract): The pooled contract.
+        """
+        key = (rpc_url, contract_address, contract_type)
+        contract = self._contracts.get(key)
+
+        if contract is None:
+            contract = self.get_web3(rpc_url).eth.contract(
+                address=contract_address,
+                abi=TOKEN_CONTRACT_ABIS[contract_type],
+            )
+            self._contracts.set(key, contract)
+
+        return contract
+
+    def clear(self):
+        self._web3s.clear()
+        self._contracts.clear()
+
+
+class AsyncContractPool(ContractPool):
+    """The ``ContractPool`` of ``AsyncWeb3`` instances and async contracts.
+
+    web3 opens one HTTP session per RPC URL and event loop. ``disconnect``
+    closes them, e.g. when the application shuts down.
+    """
+
+    def _create_web3(self, rpc_url):
+        from web3 import AsyncWeb3
+
+        return AsyncWeb3(
+            AsyncWeb3.AsyncHTTPProvider(rpc_url, cache_allowed_requests=True),
+        )
+
+    async def disconnect(self):
+        for w3 in self._web3s.values():
+            await w3.provider.disconnect()
+
+
+contract_pool = ContractPool()
+async_contract_pool = AsyncContractPool()
@@ -0,0 +1,231 @@
+"""Callbacks reporting what the SDK does, e.g. to feed tracing or metrics.
+
+Every ``Magic`` instance has a ``Hooks`` registry, shared with the instances
+created by ``for_tenant``:
+
+    def on_request(event):
+        print(event.method, event.path, event.status_code, event.total_time)
+
+    magic.hooks.register(REQUEST_EVENT, on_request)
+
+The callbacks run synchronously in the thread, or event loop, that made the
+request or validated the token, so they should be quick.
+"""
+
+import threading
+import warnings
+
+from magic_admin.error import DIDTokenAudienceMismatch
+from magic_admin.error import DIDTokenExpired
+from magic_admin.error import DIDTokenMalformed
+from magic_admin.error import DIDTokenSignatureMismatch
+
+
+REQUEST_EVENT = "request"
+TOKEN_VALIDATION_EVENT = "token_validation"
+
+EVENTS = (REQUEST_EVENT, TOKEN_VALIDATION_EVENT)
+
+
+class RequestEvent:
+    """A request sent to the Magic API. Times are in seconds.
+
+    Attributes:
+        method (str): The HTTP method.
+        path (str): The path of the endpoint, e.g. ``/v1/admin/user``.
+        status_code (int): The status of the last response, or None if no
+            response was received.
+        retries (int): The number of retries, or None if it is unknown.
+        connect_time (float): The time spent opening connections, TLS included.
+            It is 0 when a pooled connection was reused.
+        ttfb (float): The time to the first byte of the last response, from
+            the start of the request, or None if no response was received.
+        total_time (float): The time of the whole request, retries and parsing
+            included.
+        error (Exception): The error raised by the request, if any.
+    """
+
+    def __init__(
+        self,
+        method,
+        path,
+        status_code,
+        retries,
+        connect_time,
+        ttfb,
+        total_time,
+        error=None,
+    ):
+        self.method = method
+        self.path = path
+        self.status_code = status_code
+        self.retries = retries
+        self.connect_time = connect_time
+        self.ttfb = ttfb
+        self.total_time = total_time
+        self.error = error
+
+    def __repr__(self):
+        return (
+            "{class_name}(method={method!r}, path={path!r}, "
+            "status_code={status_code!r}, total_time={total_time:.6f})".format(
+                class_name=self.__class__.__name__,
+                method=self.method,
+                path=self.path,
+                status_code=self.status_code,
+                total_time=self.total_time,
+            )
+        )
+
+
+class TokenValidationEvent:
+    """The validation of a DID token by ``Token.validate``, ``try_validate`` or
+    ``validate_many``. Times are in seconds, and None for the phases that were
+    not reached.
+
+    Attributes:
+        decode_time (float): The time to decode the DID token.
+        recover_time (float): The time to recover and check the signer, or to
+            look it up in the verified token cache.
+        claim_check_time (float): The time to check the structure, the time
+            based claims and the audience, before the signature.
+        total_time (float): The time of the whole validation. For
+            ``validate_many``, the sum of the phases, where the recover time is
+            the time of the batch of recoveries the token was part of.
+        cached (bool): Whether the signer was found in the verified token
+            cache.
+        error (MagicError): The error raised by ``validate`` or by the client
+            ID fetch, if any. The other methods report failures in ``status``.
+        status (str): A ``TokenValidationResult`` status, or None if the
+            validation did not complete.
+        outcome (str): The status, or ``SIGNATURE_MISMATCH`` or
+            ``AUD_MISMATCH`` for the invalid tokens whose proof or "aud" field
+            is wrong. None if the validation did not complete.
+    """
+
+    VALID = "valid"
+    MALFORMED = "malformed"
+    EXPIRED = "expired"
+    SIGNATURE_MISMATCH = "signature_mismatch"
+    AUD_MISMATCH = "aud_mismatch"
+    INVALID = "invalid"
+
+    def __init__(
+        self,
+        decode_time,
+        recover_time,
+        claim_check_time,
+        total_time,
+        cached,
+        error=None,
+        status=None,
+        outcome=None,
+    ):
+        self.decode_time = decode_time
+        self.recover_time = recover_time
+        self.claim_check_time = claim_check_time
+        self.total_time = total_time
+        self.cached = cached
+        self.error = error
+        self.status = status
+        self.outcome = outcome
+
+    def __repr__(self):
+        return (
+            "{class_name}(total_time={total_time:.6f}, cached={cached!r}, "
+            "outcome={outcome!r}, error={error!r})".format(
+                class_name=self.__class__.__name__,
+                total_time=self.total_time,
+                cached=self.cached,
+                outcome=self.outcome,
+                error=self.error,
+            )
+        )
+
+    @classmethod
+    def get_outcome(cls, error_class):
+        """
+        Args:
+            error_class (type): The class of the error ``Token.validate``
+                raises for the DID token, or None if it is valid.
+
+        Returns:
+            outcome (str): ``VALID``, ``MALFORMED``, ``EXPIRED``,
+                ``SIGNATURE_MISMATCH``, ``AUD_MISMATCH``, or ``INVALID`` for the
+                other failures, e.g. a token used before its "nbf" field.
+        """
+        if error_class is None:
+            return cls.VALID
+
+        if issubclass(error_class, DIDTokenMalformed):
+            return cls.MALFORMED
+
+        if issubclass(error_class, DIDTokenExpired):
+            return cls.EXPIRED
+
+        if issubclass(error_class, DIDTokenSignatureMismatch):
+            return cls.SIGNATURE_MISMATCH
+
+        if issubclass(error_class, DIDTokenAudienceMismatch):
+            return cls.AUD_MISMATCH
+
+        return cls.INVALID
+
+
+class Hooks:
+    """A thread safe registry of callbacks per event.
+
+    A callback raising an exception does not fail the request or the
+    validation that emitted the event. A warning is issued instead.
+    """
+
+    def __init__(self):
+        self._callbacks = {event: () for event in EVENTS}
+        self._lock = threading.Lock()
+
+    def register(self, event, callback):
+        """
+        Args:
+            event (str): ``REQUEST_EVENT`` or ``TOKEN_VALIDATION_EVENT``.
+            callback (callable): Called with the event object.
+
+        Raises:
+            ValueError: If the event is unknown.
+
+        Returns:
+            callback (callable): The callback.
+        """
+        if event not in self._callbacks:
+            raise ValueError("Unknown event: {}".format(event))
+
+        # Replace the tuple rather than mutating it, so that ``emit`` can
+        # iterate over it without the lock.
+        with self._lock:
+            self._callbacks[event] = self._callbacks[event] + (callback,)
+
+        return callback
+
+    def unregister(self, event, callback):
+        with self._lock:
+            self._callbacks[event] = tuple(
+                registered
+                for registered in self._callbacks[event]
+                if registered != callback
+            )
+
+    def has_callbacks(self, event):
+        return bool(self._callbacks[event])
+
+    def emit(self, event, payload):
+        for callback in self._callbacks[event]:
+            try:
+                callback(payload)
+            except Exception as e:
+                warnings.warn(
+                    "A {} hook raised {}: {}".format(
+                        event,
+                        e.__class__.__name__,
+                        str(e) or "no error message",
+                    ),
+                    RuntimeWarning,
+                )
@@ -0,0 +1,446 @@
+"""Metrics of the SDK in the Prometheus text format, built from the hooks and
+the cache counters, without any dependency:
+
+    metrics = MagicMetrics()
+    metrics.instrument(magic)
+
+    # The body of the /metrics endpoint of your app, served with the
+    # ``CONTENT_TYPE`` content type.
+    body = metrics.render()
+"""
+
+import bisect
+import math
+import threading
+import weakref
+
+from magic_admin.utils.hooks import REQUEST_EVENT
+from magic_admin.utils.hooks import TOKEN_VALIDATION_EVENT
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# A cached validation takes microseconds, a signature recovery about a
+# millisecond.
+TOKEN_VALIDATION_DURATION_BUCKETS = (
+    0.00001,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    elif value == -math.inf:
+        return "-Inf"
+    elif isinstance(value, float) and math.isnan(value):
+        return "NaN"
+
+    return repr(value)
+
+
+def _escape_label_value(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+
+    return "{{{}}}".format(
+        ",".join(
+            '{}="{}"'.format(name, _escape_label_value(value)) for name, value in labels
+        ),
+    )
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _get_label_values(self, labels):
+        if len(labels) != len(self.labelnames) or not all(
+            name in labels for name in self.labelnames
+        ):
+            raise ValueError(
+                "Expected the labels {}, got {}.".format(
+                    sorted(self.labelnames),
+                    sorted(labels),
+                ),
+            )
+
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def get(self, **labels):
+        return self._values.get(self._get_label_values(labels), 0)
+
+    def samples(self):
+        """
+        Returns:
+            samples (list): (name suffix, labels, value) of every sample, the
+                labels being (name, value) pairs.
+        """
+        with self._lock:
+            values = sorted(self._values.items())
+
+        return [
+            ("", list(zip(self.labelnames, label_values)), value)
+            for label_values, value in values
+        ]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("A counter can only be incremented.")
+
+        key = self._get_label_values(labels)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value, **labels):
+        key = self._get_label_values(labels)
+
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name,
+        documentation,
+        labelnames=(),
+        buckets=REQUEST_DURATION_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._get_label_values(labels)
+        # The last count is the one of the +Inf bucket.
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            counts, total = self._values.get(
+                key,
+                ([0] * (len(self.buckets) + 1), 0),
+            )
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def get(self, **labels):
+        """
+        Returns:
+            count (int): The number of observed values.
+            sum (float): Their sum.
+        """
+        counts, total = self._values.get(
+            self._get_label_values(labels),
+            ((), 0),
+        )
+
+        return sum(counts), total
+
+    def samples(self):
+        with self._lock:
+            values = sorted(
+                (label_values, (list(counts), total))
+                for label_values, (counts, total) in self._values.items()
+            )
+
+        samples = []
+
+        for label_values, (counts, total) in values:
+            labels = list(zip(self.labelnames, label_values))
+            cumulative_count = 0
+
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative_count += count
+                samples.append(
+                    (
+                        "_bucket",
+                        labels + [("le", _format_value(float(bound)))],
+                        cumulative_count,
+                    ),
+                )
+
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, cumulative_count))
+
+        return samples
+
+
+class MetricsRegistry:
+    """A thread safe set of metrics, rendered in the Prometheus text format.
+
+    Collectors are called at every rendering and return metrics built from
+    state kept elsewhere, e.g. the counters of the caches.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """
+        Raises:
+            ValueError: If a metric of the same name is registered.
+
+        Returns:
+            metric (Counter|Gauge|Histogram): The metric.
+        """
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(
+                    "A metric is already named {}.".format(metric.name),
+                )
+
+            self._metrics[metric.name] = metric
+
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name,
+        documentation,
+        labelnames=(),
+        buckets=REQUEST_DURATION_BUCKETS,
+    ):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector):
+        """
+        Args:
+            collector (callable): Returns a list of metrics.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def collect(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        for collector in collectors:
+            metrics.extend(collector())
+
+        return metrics
+
+    def render(self):
+        """
+        Returns:
+            text (str): The metrics in the Prometheus text exposition format.
+        """
+        lines = []
+
+        for metric in self.collect():
+            lines.append(
+                "# HELP {} {}".format(
+                    metric.name,
+                    metric.documentation.replace("\\", "\\\\").replace("\n", "\\n"),
+                ),
+            )
+            lines.append("# TYPE {} {}".format(metric.name, metric.type))
+
+            for suffix, labels, value in metric.samples():
+                lines.append(
+                    "{}{}{} {}".format(
+                        metric.name,
+                        suffix,
+                        _format_labels(labels),
+                        _format_value(value),
+                    ),
+                )
+
+        return "\n".join(lines) + "\n"
+
+
+class MagicMetrics:
+    """The metrics of instrumented Magic or AsyncMagic instances:
+
+    - ``magic_api_request_duration_seconds``: a histogram of the latency of the
+      requests to the Magic API, per HTTP method and path. The paths map to the
+      resource methods, e.g. ``GET /v1/admin/user`` to the
+      ``User.get_metadata_by_*`` methods.
+    - ``magic_api_request_errors_total``: the failed requests per error class,
+      e.g. ``RateLimitingError``, ``APIConnectionError`` or
+      ``AuthenticationError``.
+    - ``magic_token_validations_total``: the DID tokens validated by
+      ``Token.validate``, ``try_validate`` and ``validate_many``, per
+      ``TokenValidationEvent`` outcome. A validation that could not complete,
+      e.g. the client ID could not be fetched, has no outcome.
+    - ``magic_token_validation_duration_seconds``: their latency.
+    - ``magic_cache_hits_total``, ``magic_cache_misses_total`` and
+      ``magic_cache_hit_ratio``: per enabled cache, i.e. ``verified_token``,
+      ``ownership`` and ``metadata``.
+    """
+
+    def __init__(self, registry=None):
+        """
+        Args:
+            registry (MetricsRegistry): The registry to add the metrics to, e.g.
+                one shared with the metrics of your app.
+        """
+        self.registry = registry if registry is not None else MetricsRegistry()
+
+        self.request_duration = self.registry.histogram(
+            "magic_api_request_duration_seconds",
+            "The latency of the requests to the Magic API, retries included.",
+            ("method", "path"),
+        )
+        self.request_errors = self.registry.counter(
+            "magic_api_request_errors_total",
+            "The failed requests to the Magic API, per error class.",
+            ("method", "path", "error"),
+        )
+        self.token_validations = self.registry.counter(
+            "magic_token_validations_total",
+            "The DID token validations, per outcome.",
+            ("outcome",),
+        )
+        self.token_validation_duration = self.registry.histogram(
+            "magic_token_validation_duration_seconds",
+            "The latency of the DID token validations.",
+            buckets=TOKEN_VALIDATION_DURATION_BUCKETS,
+        )
+        self.registry.add_collector(self._collect_cache_metrics)
+
+        self._instances = weakref.WeakSet()
+        self._hooks = weakref.WeakSet()
+
+    def instrument(self, magic):
+        """Record the metrics of a Magic instance. The instances created with
+        ``for_tenant`` share the hooks of their parent, so only their metadata
+        cache is added when they are instrumented too.
+
+        Args:
+            magic (Magic|AsyncMagic): The instance to record.
+
+        Returns:
+            magic (Magic|AsyncMagic): The instance.
+        """
+        if magic.hooks not in self._hooks:
+            self._hooks.add(magic.hooks)
+            magic.hooks.register(REQUEST_EVENT, self._on_request)
+            magic.hooks.register(TOKEN_VALIDATION_EVENT, self._on_token_validation)
+
+        self._instances.add(magic)
+
+        return magic
+
+    def render(self):
+        """See ``MetricsRegistry.render``."""
+        return self.registry.render()
+
+    def _on_request(self, event):
+        self.request_duration.observe(
+            event.total_time,
+            method=event.method,
+            path=event.path,
+        )
+
+        if event.error is not None:
+            self.request_errors.inc(
+                method=event.method,
+                path=event.path,
+                error=event.error.__class__.__name__,
+            )
+
+    def _on_token_validation(self, event):
+        if event.outcome is not None:
+            self.token_validations.inc(outcome=event.outcome)
+
+        self.token_validation_duration.observe(event.total_time)
+
+    def _get_cache_counts(self):
+        """
+        Returns:
+            counts (dict): The (hits, misses) of every enabled cache, once per
+                cache shared by several instances.
+        """
+        caches = {}
+
+        for magic in list(self._instances):
+            for name, cache in (
+                ("verified_token", getattr(magic.Token, "verified_token_cache", None)),
+                ("ownership", getattr(magic.Utils, "ownership_cache", None)),
+            ):
+                if cache is not None:
+                    caches[id(cache)] = (name, cache.hits, cache.misses)
+
+            metadata_cache = getattr(magic.User, "metadata_cache", None)
+
+            if metadata_cache is not None:
+                stats = metadata_cache.get_stats()
+                caches[id(metadata_cache)] = (
+                    "metadata",
+                    stats["hits"] + stats["stale_hits"],
+                    stats["misses"],
+                )
+
+        counts = {}
+
+        for name, hits, misses in caches.values():
+            total_hits, total_misses = counts.get(name, (0, 0))
+            counts[name] = (total_hits + hits, total_misses + misses)
+
+        return counts
+
+    def _collect_cache_metrics(self):
+        hits = Counter(
+            "magic_cache_hits_total",
+            "The lookups served by the cache.",
+            ("cache",),
+        )
+        misses = Counter(
+            "magic_cache_misses_total",
+            "The lookups missing the cache.",
+            ("cache",),
+        )
+        hit_ratio = Gauge(
+            "magic_cache_hit_ratio",
+            "The share of the lookups served by the cache.",
+            ("cache",),
+        )
+
+        for name, (cache_hits, cache_misses) in self._get_cache_counts().items():
+            hits.inc(cache_hits, cache=name)
+            misses.inc(cache_misses, cache=name)
+
+            if cache_hits + cache_misses:
+                hit_ratio.set(cache_hits / (cache_hits + cache_misses), cache=name)
+
+        return [hits, misses, hit_ratio]
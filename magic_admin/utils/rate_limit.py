@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+# Multiplicative decrease of the rate after a 429 and additive increase, as a
+# fraction of the configured rate, after every other response.
+RATE_DECREASE_FACTOR = 0.5
+RATE_INCREASE_FRACTION = 0.05
+MIN_RATE_FRACTION = 0.05
+
+# The pause after a 429 without a usable Retry-After header.
+DEFAULT_RETRY_AFTER = 1
+
+
+def parse_retry_after(retry_after):
+    """
+    Args:
+        retry_after (str): The value of a ``Retry-After`` header, either a number
+            of seconds or an HTTP date.
+
+    Returns:
+        seconds (float): The number of seconds to wait, or None if the value is
+            missing or cannot be parsed.
+    """
+    if retry_after is None:
+        return None
+
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """A thread safe token bucket pacing the requests sent with an API secret
+    key.
+
+    Up to ``burst`` requests can be sent at once, then ``rate`` requests per
+    second. A 429 response pauses every request for its ``Retry-After`` and
+    halves the rate, which then grows back by a twentieth of the configured
+    rate with every other response.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate has to be a positive number.")
+
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+
+        self._tokens = self.burst
+        # The time the tokens were last counted at. It is in the future during
+        # a Retry-After pause.
+        self._updated_at = time.monotonic()
+        self._paused_until = self._updated_at
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token.
+
+        Returns:
+            wait (float): The number of seconds to wait before sending the
+                request.
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            if now > self._updated_at:
+                self._tokens = min(
+                    self.burst,
+                    self._tokens + (now - self._updated_at) * self.rate,
+                )
+                self._updated_at = now
+
+            # The tokens can go negative: the requests are queued behind the
+            # ones that already reserved a token.
+            self._tokens -= 1
+
+            return (
+                max(0.0, self._updated_at - now) + max(0.0, -self._tokens) / self.rate
+            )
+
+    def _get_pause(self):
+        with self._lock:
+            return max(0.0, self._paused_until - time.monotonic())
+
+    def acquire(self):
+        """Wait for a token. A request that was already waiting when a 429 was
+        received also waits for the end of its Retry-After pause.
+        """
+        wait = self.reserve()
+
+        while wait > 0:
+            time.sleep(wait)
+            wait = self._get_pause()
+
+    async def acquire_async(self):
+        wait = self.reserve()
+
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self._get_pause()
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(
+                self.max_rate,
+                self.rate + self.max_rate * RATE_INCREASE_FRACTION,
+            )
+
+    def on_response(self, status_code, retry_after=None):
+        """Adapt the rate to a response, a 429 or any other.
+
+        Args:
+            status_code (int): The status of the response.
+            retry_after (float): The number of seconds to pause for after a 429.
+
+        Returns:
+            None.
+        """
+        if status_code == 429:
+            self.on_rate_limited(retry_after)
+        else:
+            self.on_success()
+
+    def on_rate_limited(self, retry_after=None):
+        """Pause the requests and slow down after a 429 response.
+
+        Args:
+            retry_after (float): The number of seconds to pause for, from the
+                ``Retry-After`` header.
+
+        Returns:
+            None.
+        """
+        if retry_after is None:
+            retry_after = DEFAULT_RETRY_AFTER
+
+        with self._lock:
+            self.rate = max(
+                self.max_rate * MIN_RATE_FRACTION,
+                self.rate * RATE_DECREASE_FACTOR,
+            )
+            self._tokens = min(self._tokens, 0)
+            self._paused_until = max(
+                self._paused_until,
+                time.monotonic() + retry_after,
+            )
+            self._updated_at = max(self._updated_at, self._paused_until)
@@ -0,0 +1,291 @@
+import random
+import threading
+
+from requests.packages.urllib3.exceptions import MaxRetryError
+from requests.packages.urllib3.exceptions import ResponseError
+from requests.packages.urllib3.util.retry import Retry
+
+from magic_admin.utils.rate_limit import parse_retry_after
+
+
+# The statuses retried per HTTP method. A POST, like a logout, may have been
+# applied by a server answering 500, so it is only retried on the statuses
+# telling that the request was not processed.
+RETRY_STATUSES = {
+    "GET": frozenset({429, 500, 502, 503, 504}),
+    "POST": frozenset({429, 503}),
+}
+
+BACKOFF_MAX = 10
+
+# The methods retried after an error raised once the request may have been sent,
+# e.g. a read timeout. The others are only retried when they could not connect.
+IDEMPOTENT_METHODS = Retry.DEFAULT_ALLOWED_METHODS
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying a request, shared by the
+    requests of an HTTP client.
+
+    Errors raised before the request was sent, e.g. a refused connection, are
+    retried for every method, the other ones, e.g. a read timeout, only for the
+    ``IDEMPOTENT_METHODS``. Responses are retried according to the statuses of
+    their method. The wait before a retry is the ``Retry-After`` of the
+    response, if any, or a decorrelated jitter backoff: a random time between
+    ``backoff_factor`` and three times the previous wait, capped at
+    ``backoff_max``. The jitter keeps clients that failed at the same time from
+    retrying at the same time. A response asking to wait longer than
+    ``backoff_max`` is not retried.
+
+    The policy counts the retries it allowed, to help tuning it.
+    """
+
+    def __init__(
+        self,
+        retries,
+        backoff_factor,
+        backoff_max=BACKOFF_MAX,
+        retry_statuses=None,
+        budget=None,
+    ):
+        """
+        Args:
+            retries (int): The maximum number of retries of a request.
+            backoff_factor (float): The minimum wait before a retry, in seconds.
+            backoff_max (float): The maximum wait before a retry, in seconds.
+            retry_statuses (dict): The statuses to retry per HTTP method.
+                Defaults to ``RETRY_STATUSES``.
+            budget (float): The maximum time to wait across all the retries of
+                a request, in seconds. None does not limit it.
+        """
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.retry_statuses = (
+            RETRY_STATUSES if retry_statuses is None else retry_statuses
+        )
+        self.budget = budget
+
+        self._stats = {
+            "status_retries": 0,
+            "error_retries": 0,
+            "budget_exhausted": 0,
+        }
+        self._lock = threading.Lock()
+
+    def is_retryable_status(self, method, status_code):
+        return status_code in self.retry_statuses.get(method.upper(), ())
+
+    def is_idempotent(self, method):
+        return method.upper() in IDEMPOTENT_METHODS
+
+    def get_backoff(self, previous_backoff=0):
+        """
+        Args:
+            previous_backoff (float): The wait before the previous retry, or 0
+                for the first retry.
+
+        Returns:
+            backoff (float): The wait before the next retry.
+        """
+        return min(
+            self.backoff_max,
+            random.uniform(
+                self.backoff_factor,
+                max(self.backoff_factor, previous_backoff * 3),
+            ),
+        )
+
+    def get_retry_after(self, retry_after):
+        """
+        Args:
+            retry_after (str): The value of the ``Retry-After`` header of a
+                response.
+
+        Returns:
+            seconds (float): The wait it asks for, or None if the value is
+                missing or cannot be parsed.
+        """
+        return parse_retry_after(retry_after)
+
+    def accepts_retry_after(self, retry_after):
+        """
+        Args:
+            retry_after (float): The wait a response asks for, in seconds.
+
+        Returns:
+            accepts (bool): Whether the response can be retried after this
+                wait, i.e. it is not longer than ``backoff_max``.
+        """
+        return retry_after <= self.backoff_max
+
+    def fits_budget(self, waited, wait):
+        """
+        Args:
+            waited (float): The time already waited for the retries of a
+                request.
+            wait (float): The wait before the next retry.
+
+        Returns:
+            fits (bool): Whether the next retry fits in the budget. It is
+                counted otherwise.
+        """
+        if self.budget is None or waited + wait <= self.budget:
+            return True
+
+        with self._lock:
+            self._stats["budget_exhausted"] += 1
+
+        return False
+
+    def record_retry(self, error=None):
+        with self._lock:
+            if error is None:
+                self._stats["status_retries"] += 1
+            else:
+                self._stats["error_retries"] += 1
+
+    def get_stats(self):
+        """
+        Returns:
+            stats (dict): The number of ``status_retries`` and ``error_retries``
+                performed so far, and the number of retries given up on because
+                of the budget (``budget_exhausted``).
+        """
+        with self._lock:
+            stats = dict(self._stats)
+
+        stats["retries"] = stats["status_retries"] + stats["error_retries"]
+
+        return stats
+
+    def to_urllib3_retry(self, get_rate_limiter=None):
+        """
+        Args:
+            get_rate_limiter (callable): Returns the rate limiter of the request
+                being retried, if any. The retries take a token from it and
+                report the retried responses to it.
+
+        Returns:
+            retry (Retry): The urllib3 ``Retry`` applying the policy, for the
+                ``HTTPAdapter`` of a ``requests.Session``.
+        """
+        return PolicyRetry(
+            total=self.retries,
+            allowed_methods=IDEMPOTENT_METHODS,
+            # Return the last response once the retries are exhausted, so that
+            # it is mapped to an error like any other response.
+            raise_on_status=False,
+            policy=self,
+            get_rate_limiter=get_rate_limiter,
+        )
+
+
+class PolicyRetry(Retry):
+    """A urllib3 ``Retry`` deferring to a ``RetryPolicy``. Like the ``Retry``
+    objects, an instance tracks the retries of a single request.
+    """
+
+    def __init__(
+        self,
+        *args,
+        policy=None,
+        get_rate_limiter=None,
+        backoff=0,
+        wait=0,
+        waited=0,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+
+        self.policy = policy
+        self.get_rate_limiter = get_rate_limiter
+        # The last backoff, the wait before the next retry and the total wait
+        # so far.
+        self.backoff = backoff
+        self.wait = wait
+        self.waited = waited
+
+    def new(self, **kwargs):
+        kwargs.setdefault("policy", self.policy)
+        kwargs.setdefault("get_rate_limiter", self.get_rate_limiter)
+        kwargs.setdefault("backoff", self.backoff)
+        kwargs.setdefault("wait", self.wait)
+        kwargs.setdefault("waited", self.waited)
+
+        return super().new(**kwargs)
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        return self.policy.is_retryable_status(method, status_code)
+
+    def increment(
+        self,
+        method=None,
+        url=None,
+        response=None,
+        error=None,
+        _pool=None,
+        _stacktrace=None,
+    ):
+        new_retry = super().increment(
+            method=method,
+            url=url,
+            response=response,
+            error=error,
+            _pool=_pool,
+            _stacktrace=_stacktrace,
+        )
+
+        retry_after = None
+
+        if response is not None:
+            retry_after = self.policy.get_retry_after(
+                response.headers.get("Retry-After"),
+            )
+
+        if retry_after is None:
+            wait = self.policy.get_backoff(self.backoff)
+            new_retry.backoff = wait
+        else:
+            wait = retry_after
+
+        if (
+            retry_after is not None and not self.policy.accepts_retry_after(retry_after)
+        ) or not self.policy.fits_budget(self.waited, wait):
+            reason = error or ResponseError(
+                ResponseError.SPECIFIC_ERROR.format(status_code=response.status),
+            )
+            raise MaxRetryError(_pool, url, reason) from reason
+
+        new_retry.waited = self.waited + wait
+        new_retry.wait = wait
+        self.policy.record_retry(error)
+
+        # The response given up on is returned to the HTTP client, which reports
+        # it to the rate limiter. The retried ones are reported here.
+        rate_limiter = self._get_rate_limiter()
+
+        if rate_limiter is not None and response is not None:
+            rate_limiter.on_response(response.status, retry_after)
+
+        return new_retry
+
+    def _get_rate_limiter(self):
+        if self.get_rate_limiter is None:
+            return None
+
+        return self.get_rate_limiter()
+
+    def get_backoff_time(self):
+        return self.wait
+
+    def sleep(self, response=None):
+        # The Retry-After of the response was already taken into account by
+        # ``increment``, parsed like the Retry-After of the rate limiter.
+        self._sleep_backoff()
+
+        # Every attempt takes a token, like the first one.
+        rate_limiter = self._get_rate_limiter()
+
+        if rate_limiter is not None:
+            rate_limiter.acquire()
@@ -0,0 +1,201 @@
+"""Recovery of the address that signed a DID token claim.
+
+A DID token proof is an EIP-191 ``personal_sign`` signature of the claim. The
+backends below recover the signer of such a signature. The fastest available
+one is picked by default:
+
+- ``CoincurveRecoveryBackend`` runs ecrecover in libsecp256k1 through the
+  optional ``coincurve`` package (``pip install magic-admin[fast]``).
+- ``EthKeysRecoveryBackend`` runs ecrecover with ``eth_keys``, which is
+  installed along with web3.
+- ``Web3RecoveryBackend`` goes through ``web3.eth.account.recover_message``.
+
+Any object with a ``recover(message, signature)`` method can be installed with
+``set_recovery_backend``. It raises ``ValueError`` when no signer can be
+recovered from the signature.
+"""
+
+PERSONAL_MESSAGE_PREFIX = b"\x19Ethereum Signed Message:\n"
+
+SIGNATURE_LENGTH = 65
+
+
+def _keccak(data):
+    from eth_hash.auto import keccak
+
+    return keccak(data)
+
+
+def hash_personal_message(message):
+    """
+    Args:
+        message (bytes): The signed message.
+
+    Returns:
+        message_hash (bytes): The EIP-191 (version 0x45) hash of the message.
+    """
+    return _keccak(
+        PERSONAL_MESSAGE_PREFIX + str(len(message)).encode("utf-8") + message,
+    )
+
+
+def parse_signature(signature):
+    """
+    Args:
+        signature (str|bytes): A 65 bytes ``r || s || v`` signature, optionally
+            hex encoded.
+
+    Raises:
+        ValueError: If the signature is not 65 bytes long or has an unknown
+            recovery id.
+
+    Returns:
+        signature (bytes): The signature with a ``v`` of 0 or 1.
+    """
+    if isinstance(signature, str):
+        signature = bytes.fromhex(signature.removeprefix("0x"))
+
+    if len(signature) != SIGNATURE_LENGTH:
+        raise ValueError(
+            "Signature has to be {} bytes long, got {}.".format(
+                SIGNATURE_LENGTH,
+                len(signature),
+            ),
+        )
+
+    v = signature[-1]
+
+    if v >= 27:
+        v -= 27
+
+    if v not in (0, 1):
+        raise ValueError("Signature has an invalid recovery id: {}.".format(v))
+
+    return signature[:-1] + bytes([v])
+
+
+def to_checksum_address(address):
+    """
+    Args:
+        address (bytes): A 20 bytes address.
+
+    Returns:
+        address (str): The EIP-55 checksum encoded address.
+    """
+    address_hex = address.hex()
+    address_hash = _keccak(address_hex.encode("utf-8")).hex()
+
+    return "0x" + "".join(
+        char.upper() if int(address_hash[i], 16) >= 8 else char
+        for i, char in enumerate(address_hex)
+    )
+
+
+class CoincurveRecoveryBackend:
+    name = "coincurve"
+
+    def __init__(self):
+        from coincurve import PublicKey
+
+        self._public_key_cls = PublicKey
+
+    def recover(self, message, signature):
+        public_key = self._public_key_cls.from_signature_and_message(
+            parse_signature(signature),
+            hash_personal_message(message.encode("utf-8")),
+            hasher=None,
+        )
+
+        # Drop the 0x04 prefix of the uncompressed encoding.
+        return to_checksum_address(
+            _keccak(public_key.format(compressed=False)[1:])[-20:],
+        )
+
+
+class EthKeysRecoveryBackend:
+    name = "eth_keys"
+
+    def __init__(self):
+        from eth_keys import keys
+        from eth_keys.exceptions import BadSignature
+
+        self._signature_cls = keys.Signature
+        self._bad_signature_error = BadSignature
+
+    def recover(self, message, signature):
+        try:
+            public_key = self._signature_cls(
+                parse_signature(signature),
+            ).recover_public_key_from_msg_hash(
+                hash_personal_message(message.encode("utf-8")),
+            )
+        except self._bad_signature_error as e:
+            raise ValueError(str(e)) from e
+
+        return to_checksum_address(public_key.to_canonical_address())
+
+
+class Web3RecoveryBackend:
+    name = "web3"
+
+    def __init__(self):
+        from eth_account.messages import encode_defunct
+        from eth_keys.exceptions import BadSignature
+        from web3.auto import w3
+
+        self._encode_defunct = encode_defunct
+        self._w3 = w3
+        self._bad_signature_error = BadSignature
+
+    def recover(self, message, signature):
+        try:
+            return self._w3.eth.account.recover_message(
+                self._encode_defunct(text=message),
+                signature=signature,
+            )
+        except self._bad_signature_error as e:
+            raise ValueError(str(e)) from e
+
+
+RECOVERY_BACKENDS = (
+    CoincurveRecoveryBackend,
+    EthKeysRecoveryBackend,
+    Web3RecoveryBackend,
+)
+
+_recovery_backend = None
+
+
+def get_recovery_backend():
+    """
+    Returns:
+        backend: The installed recovery backend, or the first one of
+            ``RECOVERY_BACKENDS`` whose dependencies can be imported.
+    """
+    global _recovery_backend
+
+    if _recovery_backend is None:
+        for backend_cls in RECOVERY_BACKENDS:
+            try:
+                _recovery_backend = backend_cls()
+            except ImportError:
+                continue
+
+            break
+
+    return _recovery_backend
+
+
+def set_recovery_backend(backend):
+    """
+    Args:
+        backend: An object with a ``recover(message, signature)`` method that
+            returns the checksum address of the signer, or raises
+            ``ValueError`` if there is none. None restores the default backend.
+
+    Returns:
+        None.
+    """
+    global _recovery_backend
+
+    _recovery_backend = backend
@@ -1,3 +1,11 @@
+import base64
+import json
+
+from eth_keys import keys
+
+from magic_admin.utils.signature import hash_personal_message
+
+
 public_address = "0x4B73C58370AEfcEf86A6021afCDe5673511376B2"
 
 issuer = "did:ethr:0x4B73C58370AEfcEf86A6021afCDe5673511376B2"
@@ -32,3 +40,20 @@ future_did_token = (
     "BiN2ViMTE2ZTJmNWZjOGM1YTcyMmQxZmI5YWYyMzNhYTczYzVjMTcwODM5Y2U1YWQ4MTQxYjl"
     "iNDY0MzM4MDk4MmRhNGJmYmIwYjExMjg0OTg4ZjFiXCJ9Il0="
 )
+
+
+def sign_did_token(
+    claim,
+    private_key=keys.PrivateKey(b"\x01" * 32),
+):
+    """A DID token of the claim. The default key is not the one of the issuer
+    of ``claim``.
+    """
+    raw_claim = json.dumps(claim)
+    signature = private_key.sign_msg_hash(
+        hash_personal_message(raw_claim.encode("utf-8")),
+    )
+
+    return base64.urlsafe_b64encode(
+        json.dumps(["0x" + signature.to_bytes().hex(), raw_claim]).encode("utf-8"),
+    ).decode("utf-8")
@@ -0,0 +1,142 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from aiohttp import web
+
+from magic_admin.async_magic import AsyncMagic
+from magic_admin.config import client_id_missing_message
+from magic_admin.error import BadRequestError
+from magic_admin.error import MagicError
+from magic_admin.resources.base import AsyncResourceComponent
+from magic_admin.resources.token import TokenValidationResult
+from magic_admin.utils.hooks import TOKEN_VALIDATION_EVENT
+from testing.data.did_token import claim
+from testing.data.did_token import future_did_token
+from testing.data.did_token import issuer
+
+
+class TestAsyncMagic:
+    api_secret_key = "troll_goat"
+
+    @staticmethod
+    async def _get_user(request):
+        if request.headers["X-Magic-Secret-Key"] != TestAsyncMagic.api_secret_key:
+            return web.json_response({"status": "failed"}, status=401)
+
+        if request.query["issuer"] != issuer:
+            return web.json_response(
+                {"status": "failed", "error_code": "INVALID_ISSUER"},
+                status=400,
+            )
+
+        return web.json_response({"status": "ok", "data": {"issuer": issuer}})
+
+    @staticmethod
+    async def _get_client(request):
+        return web.json_response({"client_id": "1234"})
+
+    async def _run_against_server(self, func):
+        app = web.Application()
+        app.router.add_get("/v1/admin/user", self._get_user)
+        app.router.add_get("/v1/admin/client", self._get_client)
+
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        server_url = "http://127.0.0.1:{}".format(
+            site._server.sockets[0].getsockname()[1],
+        )
+
+        try:
+            with (
+                mock.patch.object(AsyncResourceComponent, "_base_url", server_url),
+                mock.patch.object(
+                    AsyncMagic,
+                    "v1_client_info",
+                    server_url + "/v1/admin/client",
+                ),
+            ):
+                async with AsyncMagic(api_secret_key=self.api_secret_key) as magic:
+                    return await func(magic)
+        finally:
+            await runner.cleanup()
+
+    def test_get_metadata_by_issuer(self):
+        async def get_metadata(magic):
+            return magic.Token._client_id, await asyncio.gather(
+                *[magic.User.get_metadata_by_issuer(issuer) for _ in range(5)],
+            )
+
+        client_id, responses = asyncio.run(self._run_against_server(get_metadata))
+
+        assert client_id == "1234"
+        assert [resp.data for resp in responses] == [
+            {"status": "ok", "data": {"issuer": issuer}},
+        ] * 5
+
+    def test_maps_error_response(self):
+        async def get_metadata(magic):
+            return await magic.User.get_metadata_by_issuer("troll_goat")
+
+        with pytest.raises(BadRequestError) as e:
+            asyncio.run(self._run_against_server(get_metadata))
+
+        assert e.value.http_code == 400
+        assert e.value.http_error_code == "INVALID_ISSUER"
+
+    def test_token_validate_without_client_id_raises_error(self):
+        magic = AsyncMagic(api_secret_key=self.api_secret_key)
+
+        with pytest.raises(MagicError) as e:
+            magic.Token.validate(future_did_token)
+
+        assert str(e.value) == client_id_missing_message
+
+    def test_for_tenant(self):
+        magic = AsyncMagic(
+            api_secret_key=self.api_secret_key,
+            client_id="1234",
+            ownership_check_limit=3,
+        )
+
+        tenant = magic.for_tenant("other_secret_key", client_id="4321")
+
+        assert isinstance(tenant, AsyncMagic)
+        assert tenant._request_client is magic._request_client
+        assert tenant.User._request_client is magic._request_client
+        assert tenant.User._api_secret_key == "other_secret_key"
+        assert tenant.Token.get_client_id() == "4321"
+        assert tenant.Token.verified_token_cache is magic.Token.verified_token_cache
+        assert tenant.Utils.ownership_cache is magic.Utils.ownership_cache
+        assert tenant.Utils.ownership_check_limit == 3
+        assert tenant.Utils.contract_pool is magic.Utils.contract_pool
+
+    def test_close_of_tenant_keeps_shared_sessions_open(self):
+        magic = AsyncMagic(api_secret_key=self.api_secret_key, client_id="1234")
+        tenant = magic.for_tenant("other_secret_key", client_id="4321")
+
+        with (
+            mock.patch.object(magic._request_client, "close") as mock_close,
+            mock.patch.object(
+                magic.Utils.contract_pool, "disconnect"
+            ) as mock_disconnect,
+        ):
+            asyncio.run(tenant.close())
+
+        mock_close.assert_not_called()
+        mock_disconnect.assert_not_called()
+
+    def test_token_validation_emits_events(self):
+        magic = AsyncMagic(api_secret_key=self.api_secret_key, client_id=claim["aud"])
+        events = []
+        magic.hooks.register(TOKEN_VALIDATION_EVENT, events.append)
+
+        magic.Token.validate(future_did_token)
+        magic.Token.try_validate("troll_goat")
+
+        assert [event.status for event in events] == [
+            TokenValidationResult.VALID,
+            TokenValidationResult.MALFORMED,
+        ]
@@ -6,32 +6,20 @@ import magic_admin
 from magic_admin.error import AuthenticationError
 from magic_admin.magic import Magic
 from magic_admin.resources.base import ResourceComponent
+from magic_admin.resources.token import Token
+from testing.data.did_token import claim
+from testing.data.did_token import future_did_token
+from testing.data.did_token import public_address
 
 
 class TestMagic:
     api_secret_key = "troll_goat"
 
-    @pytest.fixture(autouse=True)
-    def setup(self):
-        self.mocked_rc = mock.Mock(
-            request=mock.Mock(
-                return_value=mock.Mock(
-                    data={
-                        "client_id": "1234",
-                    },
-                ),
-            ),
-        )
-        # self.mocked_rc.request=
-        with mock.patch(
-            "magic_admin.magic.RequestsClient", return_value=self.mocked_rc
-        ):
-            yield
-
     def test_init_with_secret_key(self):
-        Magic(api_secret_key=self.api_secret_key)
+        magic = Magic(api_secret_key=self.api_secret_key)
 
-        assert magic_admin.api_secret_key == self.api_secret_key
+        assert magic._api_secret_key == self.api_secret_key
+        assert magic.User._api_secret_key == self.api_secret_key
 
     @pytest.mark.parametrize(
         "resource_name",
@@ -51,6 +39,109 @@ class TestMagic:
 
         assert getattr(magic, resource_name)
 
+    def test_fetches_client_id_once_with_resource_client(self):
+        magic = Magic(api_secret_key=self.api_secret_key)
+
+        with mock.patch.object(
+            magic.Token._request_client.http,
+            "request",
+            return_value=mock.Mock(
+                status_code=200,
+                json=mock.Mock(return_value={"client_id": "1234"}),
+            ),
+        ) as mock_request:
+            assert magic.Token.get_client_id() == "1234"
+            assert magic.Token.get_client_id() == "1234"
+
+        mock_request.assert_called_once_with(
+            "get",
+            Magic.v1_client_info,
+            params=None,
+            json=None,
+            headers=mock.ANY,
+            timeout=mock.ANY,
+        )
+
+    def test_magic_instances_do_not_share_credentials(self):
+        magic = Magic(api_secret_key=self.api_secret_key, client_id="1234")
+        other_magic = Magic(api_secret_key="other_secret_key", client_id="4321")
+
+        assert magic.Token.get_client_id() == "1234"
+        assert other_magic.Token.get_client_id() == "4321"
+
+        with mock.patch.object(
+            other_magic._request_client.http,
+            "request",
+            return_value=mock.Mock(
+                status_code=200,
+                json=mock.Mock(return_value={"data": {}}),
+            ),
+        ) as mock_request:
+            other_magic.User.logout_by_issuer("did:ethr:0x0")
+
+        assert (
+            mock_request.call_args.kwargs["headers"]["X-Magic-Secret-Key"]
+            == "other_secret_key"
+        )
+
+    def test_for_tenant_shares_request_client(self):
+        magic = Magic(api_secret_key=self.api_secret_key, client_id="1234")
+
+        tenant = magic.for_tenant("other_secret_key", client_id="4321")
+
+        assert tenant._request_client is magic._request_client
+        assert tenant.User._request_client is magic._request_client
+        assert tenant.User._api_secret_key == "other_secret_key"
+        assert tenant.Token.get_client_id() == "4321"
+        assert magic.Token.get_client_id() == "1234"
+
+    @pytest.fixture
+    def deprecated_globals(self):
+        with (
+            mock.patch.object(Token, "_default_token", None),
+            mock.patch.multiple(magic_admin, api_secret_key=None, client_id=None),
+        ):
+            yield
+
+    @pytest.mark.usefixtures("deprecated_globals")
+    def test_token_validate_on_class_uses_last_magic_instance(self):
+        Magic(api_secret_key="other_secret_key", client_id="4321")
+        magic = Magic(api_secret_key=self.api_secret_key, client_id=claim["aud"])
+
+        assert magic_admin.api_secret_key == self.api_secret_key
+        assert magic_admin.client_id == claim["aud"]
+        assert Token._default_token is magic.Token
+
+        with pytest.warns(DeprecationWarning):
+            decoded_did_token = Token.validate(future_did_token)
+
+        assert decoded_did_token.recovered_address == public_address
+
+    @pytest.mark.usefixtures("deprecated_globals")
+    def test_fetched_client_id_sets_deprecated_global(self):
+        magic = Magic(api_secret_key=self.api_secret_key)
+
+        with mock.patch.object(
+            magic.Token._request_client.http,
+            "request",
+            return_value=mock.Mock(
+                status_code=200,
+                json=mock.Mock(return_value={"client_id": "1234"}),
+            ),
+        ):
+            magic.Token.get_client_id()
+
+        assert magic_admin.client_id == "1234"
+
+    @pytest.mark.usefixtures("deprecated_globals")
+    def test_token_validate_on_class_without_magic_instance(self):
+        magic_admin.client_id = claim["aud"]
+
+        with pytest.warns(DeprecationWarning):
+            decoded_did_token = Token.validate(future_did_token)
+
+        assert decoded_did_token.recovered_address == public_address
+
     def test_raises_attr_error(self):
         with pytest.raises(AttributeError):
             Magic(api_secret_key=self.api_secret_key).troll_goat
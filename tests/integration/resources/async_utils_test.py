@@ -0,0 +1,90 @@
+import asyncio
+import threading
+from http.server import HTTPServer
+from unittest import mock
+
+import pytest
+
+from magic_admin.async_magic import AsyncMagic
+from magic_admin.resources.async_utils import AsyncUtils
+from magic_admin.utils.contract import ERC1155
+from magic_admin.utils.contract import ERC721
+from magic_admin.utils.contract import async_contract_pool
+from tests.integration.resources.utils_test import ERC1155_ADDRESS
+from tests.integration.resources.utils_test import ERC721_ADDRESS
+from tests.integration.resources.utils_test import WALLET_1
+from tests.integration.resources.utils_test import WALLET_2
+from tests.integration.resources.utils_test import JSONRPCHandler
+
+
+class TestAsyncUtilsValidateTokenOwnership:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        server = HTTPServer(("127.0.0.1", 0), JSONRPCHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        self.rpc_url = "http://127.0.0.1:{}".format(server.server_port)
+        self.utils = AsyncUtils()
+        JSONRPCHandler.http_requests = []
+
+        token = mock.Mock()
+        token.validate.side_effect = lambda did_token: mock.Mock(
+            public_address=did_token,
+        )
+
+        with mock.patch.object(AsyncUtils, "Token", token, create=True):
+            yield
+
+        server.shutdown()
+        server.server_close()
+        async_contract_pool.clear()
+
+    def test_validate_token_ownership_many(self):
+        async def validate():
+            try:
+                return await self.utils.validate_token_ownership_many(
+                    [
+                        # The mocked Token uses the DID token as wallet address.
+                        (WALLET_1, ERC721_ADDRESS, ERC721, self.rpc_url, None),
+                        (WALLET_2, ERC721_ADDRESS, ERC721, self.rpc_url, None),
+                        (WALLET_1, ERC1155_ADDRESS, ERC1155, self.rpc_url, "7"),
+                        (WALLET_2, ERC1155_ADDRESS, ERC1155, self.rpc_url, "8"),
+                    ],
+                )
+            finally:
+                await async_contract_pool.disconnect()
+
+        responses = asyncio.run(validate())
+
+        assert [response["valid"] for response in responses] == [
+            True,
+            False,
+            True,
+            True,
+        ]
+        assert [
+            rpc_request["method"] for rpc_request in JSONRPCHandler.http_requests
+        ].count("eth_call") == 4
+
+    def test_async_magic_closes_rpc_sessions(self):
+        magic = AsyncMagic(api_secret_key="troll_goat", client_id="1234")
+
+        async def validate():
+            async with magic:
+                response = await magic.Utils.validate_token_ownership(
+                    WALLET_1,
+                    ERC721_ADDRESS,
+                    ERC721,
+                    self.rpc_url,
+                )
+
+            return response
+
+        assert asyncio.run(validate())["valid"]
+        # The sessions of web3's provider.
+        assert not len(
+            magic.Utils.contract_pool.get_web3(
+                self.rpc_url,
+            ).provider._request_session_manager.session_cache,
+        )
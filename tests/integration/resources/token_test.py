@@ -1,13 +1,16 @@
 from unittest import mock
 
-from pretend import stub
+import pytest
 
+from magic_admin.error import DIDTokenMalformed
 from magic_admin.resources.token import Token
+from magic_admin.resources.token import TokenValidationResult
 from testing.data.did_token import claim
 from testing.data.did_token import future_did_token
 from testing.data.did_token import issuer
 from testing.data.did_token import proof
 from testing.data.did_token import public_address
+from testing.data.did_token import sign_did_token
 
 
 class TestToken:
@@ -23,9 +26,57 @@ class TestToken:
     def test_get_public_address(self):
         assert Token.get_public_address(future_did_token) == public_address
 
-    def test_validate(self):
+    @pytest.fixture
+    def token(self):
+        token = Token()
+        token.setup_client_id("did:magic:731848cc-084e-41ff-bbdf-7f103817ea6b")
+
+        return token
+
+    def test_validate(self, token):
+        decoded_did_token = token.validate(future_did_token)
+
+        assert decoded_did_token.issuer == issuer
+        assert decoded_did_token.public_address == public_address
+        assert decoded_did_token.recovered_address == public_address
+
+    def test_validate_with_decoded_token(self, token):
+        decoded_did_token = Token.parse(future_did_token)
+
+        with mock.patch.object(Token, "decode") as mock_decode:
+            assert token.validate(decoded_did_token) is decoded_did_token
+
+        mock_decode.assert_not_called()
+
+    def test_validate_many(self, token):
+        did_tokens = [future_did_token] * 8 + ["troll_goat"]
+
+        # Spread the few tokens across a real process pool.
         with mock.patch(
-            "magic_admin.resources.token.magic_admin",
-            new=stub(client_id="did:magic:731848cc-084e-41ff-bbdf-7f103817ea6b"),
+            "magic_admin.resources.token.MIN_SIGNATURES_PER_WORKER",
+            4,
         ):
-            Token.validate(future_did_token)
+            results = token.validate_many(did_tokens, workers=2)
+
+        assert [result.status for result in results] == [
+            TokenValidationResult.VALID,
+        ] * 8 + [TokenValidationResult.MALFORMED]
+        assert results[0].token.recovered_address == public_address
+
+    def test_try_validate_token_signed_by_another_key(self, token):
+        did_token = sign_did_token(claim)
+
+        assert token.try_validate(did_token).status == (TokenValidationResult.INVALID)
+
+    @pytest.mark.parametrize("iss", ["garbage", None, 1])
+    def test_validate_rejects_malformed_issuer(self, token, iss):
+        did_token = sign_did_token(dict(claim, iss=iss))
+
+        with pytest.raises(DIDTokenMalformed):
+            token.validate(did_token)
+
+        assert token.try_validate(did_token).status == (TokenValidationResult.MALFORMED)
+        assert [
+            result.status
+            for result in token.validate_many([did_token, future_did_token])
+        ] == [TokenValidationResult.MALFORMED, TokenValidationResult.VALID]
@@ -0,0 +1,173 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from unittest import mock
+
+import pytest
+from eth_abi import decode
+from eth_abi import encode
+
+from magic_admin.resources.utils import Utils
+from magic_admin.utils.contract import ERC1155
+from magic_admin.utils.contract import ERC721
+from magic_admin.utils.contract import contract_pool
+
+
+ERC721_ADDRESS = "0x00000000000000000000000000000000000000A1"
+ERC1155_ADDRESS = "0x00000000000000000000000000000000000000b2"
+WALLET_1 = "0x4B73C58370AEfcEf86A6021afCDe5673511376B2"
+WALLET_2 = "0x0000000000000000000000000000000000000002"
+
+BALANCES = {
+    (ERC721_ADDRESS.lower(), WALLET_1.lower(), None): 1,
+    (ERC1155_ADDRESS.lower(), WALLET_1.lower(), 7): 3,
+    (ERC1155_ADDRESS.lower(), WALLET_2.lower(), 8): 1,
+}
+
+
+class JSONRPCHandler(BaseHTTPRequestHandler):
+    """A JSON-RPC node answering the ``eth_call`` of the token contracts."""
+
+    http_requests = []
+
+    @staticmethod
+    def _eth_call(params):
+        address = params[0]["to"].lower()
+        data = bytes.fromhex(params[0]["data"][2:])
+        selector, args = data[:4].hex(), data[4:]
+
+        if selector == "70a08231":  # balanceOf(address)
+            (owner,) = decode(["address"], args)
+            return encode(["uint256"], [BALANCES.get((address, owner, None), 0)])
+        elif selector == "00fdd58e":  # balanceOf(address,uint256)
+            owner, token_id = decode(["address", "uint256"], args)
+            return encode(["uint256"], [BALANCES.get((address, owner, token_id), 0)])
+        elif selector == "4e1273f4":  # balanceOfBatch(address[],uint256[])
+            owners, token_ids = decode(["address[]", "uint256[]"], args)
+            return encode(
+                ["uint256[]"],
+                [
+                    [
+                        BALANCES.get((address, owner, token_id), 0)
+                        for owner, token_id in zip(owners, token_ids)
+                    ],
+                ],
+            )
+
+        raise ValueError(selector)
+
+    def _respond(self, rpc_request):
+        if rpc_request["method"] == "eth_chainId":
+            result = "0x1"
+        else:
+            result = "0x" + self._eth_call(rpc_request["params"]).hex()
+
+        return {"jsonrpc": "2.0", "id": rpc_request["id"], "result": result}
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.http_requests.append(body)
+
+        if isinstance(body, list):
+            response = [self._respond(rpc_request) for rpc_request in body]
+        else:
+            response = self._respond(body)
+
+        content = json.dumps(response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestUtilsCheckTokenOwnershipMany:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        server = HTTPServer(("127.0.0.1", 0), JSONRPCHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        self.rpc_url = "http://127.0.0.1:{}".format(server.server_port)
+        self.utils = Utils()
+        JSONRPCHandler.http_requests = []
+
+        yield
+
+        server.shutdown()
+        server.server_close()
+        contract_pool.clear()
+
+    def test_checks_in_one_batch_request(self):
+        assert self.utils.check_token_ownership_many(
+            [
+                (WALLET_1, ERC721_ADDRESS, ERC721, None),
+                (WALLET_2, ERC721_ADDRESS, ERC721, None),
+                (WALLET_1, ERC1155_ADDRESS, ERC1155, "7"),
+                (WALLET_2, ERC1155_ADDRESS, ERC1155, "7"),
+                (WALLET_2, ERC1155_ADDRESS, ERC1155, "8"),
+            ],
+            self.rpc_url,
+        ) == [True, False, True, False, True]
+
+        assert len(JSONRPCHandler.http_requests) == 1
+        # Two balanceOf calls and one balanceOfBatch call.
+        assert [
+            rpc_request["method"] for rpc_request in JSONRPCHandler.http_requests[0]
+        ] == ["eth_call"] * 3
+
+    def test_validate_token_ownership_fetches_chain_id_once(self):
+        self.utils.Token = mock.Mock()
+        self.utils.Token.validate.return_value.public_address = WALLET_1
+
+        for _ in range(3):
+            assert self.utils.validate_token_ownership(
+                "did_token",
+                ERC721_ADDRESS,
+                ERC721,
+                self.rpc_url,
+            )["valid"]
+
+        assert [
+            rpc_request["method"] for rpc_request in JSONRPCHandler.http_requests
+        ] == ["eth_chainId"] * 2 + ["eth_call"] * 3
+
+    def test_uses_ownership_cache(self):
+        self.utils.setup_ownership_cache(10)
+        self.utils.check_token_ownership_many(
+            [(WALLET_1, ERC721_ADDRESS, ERC721, None)],
+            self.rpc_url,
+        )
+
+        assert self.utils.check_token_ownership_many(
+            [
+                (WALLET_1, ERC721_ADDRESS, ERC721, None),
+                (WALLET_2, ERC1155_ADDRESS, ERC1155, "8"),
+            ],
+            self.rpc_url,
+        ) == [True, True]
+
+        assert len(JSONRPCHandler.http_requests) == 2
+        assert len(JSONRPCHandler.http_requests[1]) == 1
+
+    def test_does_not_request_when_all_cached(self):
+        self.utils.setup_ownership_cache(10)
+        checks = [(WALLET_1, ERC721_ADDRESS, ERC721, None)]
+
+        self.utils.check_token_ownership_many(checks, self.rpc_url)
+
+        assert self.utils.check_token_ownership_many(checks, self.rpc_url) == [True]
+        assert len(JSONRPCHandler.http_requests) == 1
+
+    def test_raises_error_if_erc1155_check_has_no_token_id(self):
+        with pytest.raises(ValueError):
+            self.utils.check_token_ownership_many(
+                [(WALLET_1, ERC1155_ADDRESS, ERC1155, None)],
+                self.rpc_url,
+            )
+
+        assert JSONRPCHandler.http_requests == []
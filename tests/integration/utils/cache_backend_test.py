@@ -0,0 +1,245 @@
+import socketserver
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from magic_admin.error import CacheBackendError
+from magic_admin.magic import Magic
+from magic_admin.response import MagicResponse
+from magic_admin.utils.cache_backend import RedisCacheBackend
+from testing.data.did_token import future_did_token
+from testing.data.did_token import public_address
+
+
+PASSWORD = b"troll_goat"
+
+
+class RESPHandler(socketserver.StreamRequestHandler):
+    """A Redis server answering the commands of ``RedisCacheBackend``."""
+
+    def _read_command(self):
+        line = self.rfile.readline()
+
+        if not line:
+            return None
+
+        args = []
+
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+
+        return args
+
+    def _reply(self, command, args):
+        db = self.server.db
+
+        if command == b"AUTH":
+            if args[-1] != PASSWORD:
+                return b"-WRONGPASS invalid password\r\n"
+
+            self.authenticated = True
+            return b"+OK\r\n"
+
+        if self.server.password and not self.authenticated:
+            return b"-NOAUTH Authentication required.\r\n"
+
+        if command == b"SELECT":
+            return b"+OK\r\n"
+        elif command == b"GET":
+            value, expires_at = db.get(args[0], (None, None))
+
+            if value is None or (expires_at and time.time() > expires_at):
+                return b"$-1\r\n"
+
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        elif command == b"SET":
+            ttl = int(args[3]) if len(args) > 2 else None
+            db[args[0]] = (args[1], ttl and time.time() + ttl)
+            return b"+OK\r\n"
+        elif command == b"DEL":
+            return b":%d\r\n" % sum(db.pop(key, None) is not None for key in args)
+
+        return b"-ERR unknown command\r\n"
+
+    def handle(self):
+        self.server.connections += 1
+        self.authenticated = False
+
+        while True:
+            args = self._read_command()
+
+            if args is None:
+                return
+
+            self.server.commands.append(args)
+            self.wfile.write(self._reply(args[0].upper(), args[1:]))
+
+
+class RESPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, password=None):
+        super().__init__(("127.0.0.1", 0), RESPHandler)
+
+        self.password = password
+        self.db = {}
+        self.commands = []
+        self.connections = 0
+
+
+@pytest.fixture
+def resp_server():
+    server = RESPServer()
+    threading.Thread(
+        target=server.serve_forever,
+        kwargs={"poll_interval": 0.05},
+        daemon=True,
+    ).start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+class TestRedisCacheBackend:
+    @pytest.fixture(autouse=True)
+    def setup(self, resp_server):
+        self.server = resp_server
+        self.backend = RedisCacheBackend(port=resp_server.server_address[1])
+
+        yield
+
+        self.backend.close()
+
+    def test_set_get_and_delete(self):
+        self.backend.set(b"troll", b"\x00goat\r\n", ttl=30)
+
+        assert self.backend.get(b"troll") == b"\x00goat\r\n"
+
+        self.backend.delete(b"troll")
+
+        assert self.backend.get(b"troll") is None
+        assert self.server.commands[0] == [
+            b"SET",
+            b"troll",
+            b"\x00goat\r\n",
+            b"EX",
+            b"30",
+        ]
+
+    def test_reuses_connections(self):
+        for _ in range(5):
+            self.backend.get(b"troll")
+
+        assert self.server.connections == 1
+
+    def test_error_reply_keeps_connection(self):
+        with pytest.raises(CacheBackendError) as e:
+            self.backend.execute("TROLL")
+
+        assert str(e.value) == "ERR unknown command"
+        assert self.backend.get(b"troll") is None
+        assert self.server.connections == 1
+
+    def test_authenticates_and_selects_db(self):
+        self.server.password = PASSWORD
+        backend = RedisCacheBackend(
+            port=self.server.server_address[1],
+            db=2,
+            password=PASSWORD.decode(),
+        )
+
+        backend.set(b"troll", b"goat")
+
+        assert self.server.commands == [
+            [b"AUTH", PASSWORD],
+            [b"SELECT", b"2"],
+            [b"SET", b"troll", b"goat"],
+        ]
+
+    def test_raises_error_on_wrong_password(self):
+        self.server.password = PASSWORD
+        backend = RedisCacheBackend(
+            port=self.server.server_address[1],
+            password="wrong",
+        )
+
+        with pytest.raises(CacheBackendError):
+            backend.get(b"troll")
+
+        assert backend._connections.empty()
+
+
+class TestSharedCacheBackend:
+    """Two Magic instances stand for two worker processes sharing a server."""
+
+    client_id = "did:magic:731848cc-084e-41ff-bbdf-7f103817ea6b"
+
+    @pytest.fixture(autouse=True)
+    def setup(self, resp_server):
+        self.server = resp_server
+        self.workers = [
+            Magic(
+                api_secret_key="troll_goat",
+                client_id=self.client_id,
+                cache_backend=RedisCacheBackend(port=resp_server.server_address[1]),
+            )
+            for _ in range(2)
+        ]
+
+    def test_shares_user_metadata(self):
+        content = b'{"data": {"email": "troll@goat.com"}, "status": "ok"}'
+
+        with mock.patch.object(
+            self.workers[0]._request_client,
+            "request",
+            return_value=MagicResponse(content, {"data": {}}, 200),
+        ) as mock_request:
+            self.workers[0].User.get_metadata_by_issuer("did:ethr:0x1")
+
+        with mock.patch.object(
+            self.workers[1]._request_client,
+            "request",
+        ) as other_mock_request:
+            response = self.workers[1].User.get_metadata_by_issuer("did:ethr:0x1")
+
+        mock_request.assert_called_once()
+        other_mock_request.assert_not_called()
+        assert response.data == {"data": {"email": "troll@goat.com"}, "status": "ok"}
+
+        with mock.patch.object(self.workers[1]._request_client, "request"):
+            self.workers[1].User.logout_by_issuer("did:ethr:0x1")
+
+        assert self.server.db == {}
+        # Every wallet type of the user is deleted at once.
+        assert self.server.commands[-1][0] == b"DEL"
+
+    def test_shares_verified_tokens(self):
+        self.workers[0].Token.validate(future_did_token)
+
+        with mock.patch(
+            "magic_admin.resources.token.recover_signer",
+        ) as mock_recover_signer:
+            token = self.workers[1].Token.validate(future_did_token)
+
+        mock_recover_signer.assert_not_called()
+        assert token.recovered_address == public_address
+
+    def test_fails_open_when_server_is_down(self):
+        self.server.shutdown()
+        self.server.server_close()
+        magic = Magic(
+            api_secret_key="troll_goat",
+            client_id=self.client_id,
+            cache_backend=RedisCacheBackend(port=self.server.server_address[1]),
+        )
+
+        assert magic.Token.validate(future_did_token).recovered_address == (
+            public_address
+        )
+        assert magic.Token.verified_token_cache.errors == 2
@@ -0,0 +1,466 @@
+import asyncio
+import json
+from unittest import mock
+
+import aiohttp
+import pytest
+
+from magic_admin.async_http_client import AiohttpClient
+from magic_admin.error import APIConnectionError
+from magic_admin.error import APIError
+from magic_admin.error import AuthenticationError
+from magic_admin.error import RateLimitingError
+from magic_admin.resources.wallet import WalletType
+from magic_admin.response import MagicResponse
+from magic_admin.utils.hooks import REQUEST_EVENT
+from magic_admin.utils.retry import BACKOFF_MAX
+from magic_admin.utils.retry import RetryPolicy
+
+
+class TestAiohttpClient:
+    retries = 2
+    timeout = 3
+    backoff_factor = 0.5
+
+    method = "get"
+    url = "https://api.toaster.magic.link/v1/admin/user"
+    params = {"issuer": "troll_goat"}
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.api_secret_key = "magic_secret_key"
+        self.client = AiohttpClient(self.retries, self.timeout, self.backoff_factor)
+        self.resp_data = {"data": {"issuer": "troll_goat"}, "status": "ok"}
+        self.resp = mock.Mock(
+            status=200,
+            headers={},
+            read=mock.AsyncMock(return_value=json.dumps(self.resp_data).encode()),
+        )
+        self.client._session = mock.Mock(
+            request=mock.AsyncMock(return_value=self.resp),
+        )
+
+        with mock.patch(
+            "magic_admin.async_http_client.asyncio.sleep",
+            new=mock.AsyncMock(),
+        ) as self.mock_sleep:
+            yield
+
+    def test_request_returns_api_response(self):
+        resp = asyncio.run(
+            self.client.request(
+                self.method,
+                self.url,
+                self.params,
+                api_secret_key=self.api_secret_key,
+            )
+        )
+
+        assert isinstance(resp, MagicResponse)
+        assert resp.status_code == 200
+        assert resp.data == self.resp_data
+        self.client._session.request.assert_called_once_with(
+            self.method,
+            self.url,
+            params=[("issuer", "troll_goat")],
+            json=None,
+            headers=self.client._get_request_headers(self.api_secret_key),
+            trace_request_ctx=mock.ANY,
+        )
+        self.resp.release.assert_called_once_with()
+
+    def test_request_maps_error_response(self):
+        self.resp.status = 429
+
+        with pytest.raises(RateLimitingError) as e:
+            asyncio.run(
+                self.client.request(
+                    self.method,
+                    self.url,
+                    self.params,
+                    api_secret_key=self.api_secret_key,
+                )
+            )
+
+        assert e.value.http_code == 429
+        assert e.value.http_status == "ok"
+        assert e.value.http_method == "GET"
+        assert e.value.http_request_params == self.params
+
+    def test_request_retries_connection_errors(self):
+        self.client._retryable_errors = (aiohttp.ClientConnectionError,)
+        self.client._session.request.side_effect = [
+            aiohttp.ClientConnectionError(),
+            aiohttp.ClientConnectionError(),
+            self.resp,
+        ]
+
+        resp = asyncio.run(
+            self.client.request(
+                self.method,
+                self.url,
+                api_secret_key=self.api_secret_key,
+            )
+        )
+
+        assert resp.data == self.resp_data
+        assert self.mock_sleep.call_count == 2
+        assert all(
+            self.backoff_factor <= call.args[0] <= BACKOFF_MAX
+            for call in self.mock_sleep.call_args_list
+        )
+        assert self.client.get_retry_stats() == {
+            "status_retries": 0,
+            "error_retries": 2,
+            "budget_exhausted": 0,
+            "retries": 2,
+        }
+
+    def test_request_retries_post_connect_errors(self):
+        self.client._retryable_errors = (
+            aiohttp.ClientConnectionError,
+            asyncio.TimeoutError,
+        )
+        self.client._connect_errors = (aiohttp.ClientConnectorError,)
+        self.client._session.request.side_effect = [
+            aiohttp.ClientConnectorError(mock.Mock(), OSError()),
+            self.resp,
+        ]
+
+        resp = asyncio.run(
+            self.client.request(
+                "post",
+                self.url,
+                data={"issuer": "troll_goat"},
+                api_secret_key=self.api_secret_key,
+            )
+        )
+
+        assert resp.data == self.resp_data
+        assert self.client._session.request.call_count == 2
+
+    @pytest.mark.parametrize(
+        "error",
+        [asyncio.TimeoutError(), aiohttp.ServerDisconnectedError()],
+    )
+    def test_request_does_not_retry_post_errors_after_sending(self, error):
+        self.client._retryable_errors = (
+            aiohttp.ClientConnectionError,
+            asyncio.TimeoutError,
+        )
+        self.client._connect_errors = (aiohttp.ClientConnectorError,)
+        self.client._session.request.side_effect = error
+
+        with pytest.raises(APIConnectionError):
+            asyncio.run(
+                self.client.request(
+                    "post",
+                    self.url,
+                    data={"issuer": "troll_goat"},
+                    api_secret_key=self.api_secret_key,
+                )
+            )
+
+        self.client._session.request.assert_called_once()
+        self.mock_sleep.assert_not_called()
+
+    def test_request_retries_retryable_statuses(self):
+        error_resp = mock.Mock(
+            status=503,
+            headers={},
+            read=mock.AsyncMock(return_value=b"{}"),
+        )
+        self.client._session.request.side_effect = [error_resp, self.resp]
+
+        resp = asyncio.run(
+            self.client.request(
+                self.method,
+                self.url,
+                api_secret_key=self.api_secret_key,
+            )
+        )
+
+        assert resp.data == self.resp_data
+        assert self.client._session.request.call_count == 2
+        assert self.client.get_retry_stats()["status_retries"] == 1
+
+    def test_request_does_not_retry_post_on_server_errors(self):
+        self.resp.status = 500
+
+        with pytest.raises(APIError):
+            asyncio.run(
+                self.client.request(
+                    "post",
+                    self.url,
+                    data={"issuer": "troll_goat"},
+                    api_secret_key=self.api_secret_key,
+                )
+            )
+
+        self.client._session.request.assert_called_once()
+        self.mock_sleep.assert_not_called()
+
+    def test_request_stops_retrying_when_budget_is_exhausted(self):
+        self.client._retry_policy = RetryPolicy(
+            self.retries,
+            self.backoff_factor,
+            budget=1,
+        )
+        self.resp.status = 503
+        self.resp.headers = {"Retry-After": "2"}
+
+        with pytest.raises(APIError):
+            asyncio.run(
+                self.client.request(
+                    self.method,
+                    self.url,
+                    api_secret_key=self.api_secret_key,
+                )
+            )
+
+        self.client._session.request.assert_called_once()
+        assert self.client.get_retry_stats()["budget_exhausted"] == 1
+
+    def test_request_raises_when_retries_are_exhausted(self):
+        self.client._retryable_errors = (aiohttp.ClientConnectionError,)
+        self.client._session.request.side_effect = aiohttp.ClientConnectionError()
+
+        with pytest.raises(APIConnectionError):
+            asyncio.run(
+                self.client.request(
+                    self.method,
+                    self.url,
+                    api_secret_key=self.api_secret_key,
+                )
+            )
+
+        assert self.client._session.request.call_count == self.retries + 1
+
+    def test_request_raises_error_if_secret_key_is_missing(self):
+        with pytest.raises(AuthenticationError):
+            asyncio.run(self.client.request(self.method, self.url))
+
+        self.client._session.request.assert_not_called()
+
+    def test_request_does_not_retry_other_errors(self):
+        self.client._session.request.side_effect = ValueError("troll_goat")
+
+        with pytest.raises(APIConnectionError):
+            asyncio.run(
+                self.client.request(
+                    self.method,
+                    self.url,
+                    api_secret_key=self.api_secret_key,
+                )
+            )
+
+        self.client._session.request.assert_called_once()
+
+    def test_request_updates_rate_limiter(self):
+        rate_limiter = mock.Mock(acquire_async=mock.AsyncMock())
+        self.client._rate_limit = 5
+        self.client._rate_limiters[self.api_secret_key] = rate_limiter
+        self.resp.status = 429
+        self.resp.headers = {"Retry-After": "7"}
+
+        with pytest.raises(RateLimitingError):
+            asyncio.run(
+                self.client.request(
+                    self.method,
+                    self.url,
+                    api_secret_key=self.api_secret_key,
+                ),
+            )
+
+        assert rate_limiter.acquire_async.call_count == self.retries + 1
+        assert rate_limiter.on_response.call_args_list == [mock.call(429, 7.0)] * 3
+        # The retries wait for the Retry-After.
+        assert self.mock_sleep.call_args_list == [mock.call(7.0)] * self.retries
+
+    def test_request_does_not_retry_retry_after_longer_than_backoff_max(self):
+        rate_limiter = mock.Mock(acquire_async=mock.AsyncMock())
+        self.client._rate_limit = 5
+        self.client._rate_limiters[self.api_secret_key] = rate_limiter
+        self.resp.status = 429
+        self.resp.headers = {"Retry-After": "3600"}
+
+        with pytest.raises(RateLimitingError):
+            asyncio.run(
+                self.client.request(
+                    self.method,
+                    self.url,
+                    api_secret_key=self.api_secret_key,
+                ),
+            )
+
+        self.client._session.request.assert_called_once()
+        self.mock_sleep.assert_not_called()
+        # The rate limiter pauses for the whole Retry-After.
+        rate_limiter.on_response.assert_called_once_with(429, 3600)
+
+    def test_request_acquires_rate_limiter_before_every_attempt(self):
+        rate_limiter = mock.Mock(acquire_async=mock.AsyncMock())
+        self.client._rate_limit = 5
+        self.client._rate_limiters[self.api_secret_key] = rate_limiter
+        self.client._session.request.side_effect = [
+            asyncio.TimeoutError(),
+            self.resp,
+        ]
+
+        asyncio.run(
+            self.client.request(
+                self.method,
+                self.url,
+                api_secret_key=self.api_secret_key,
+            ),
+        )
+
+        assert rate_limiter.acquire_async.call_count == 2
+        rate_limiter.on_response.assert_called_once_with(200, None)
+
+    def test_request_emits_request_event(self):
+        events = []
+        self.client.hooks.register(REQUEST_EVENT, events.append)
+        self.client._session.request.side_effect = [
+            asyncio.TimeoutError(),
+            self.resp,
+        ]
+
+        asyncio.run(
+            self.client.request(
+                self.method,
+                self.url,
+                self.params,
+                api_secret_key=self.api_secret_key,
+            ),
+        )
+
+        (event,) = events
+        assert event.method == "GET"
+        assert event.path == "/v1/admin/user"
+        assert event.status_code == 200
+        assert event.retries == 1
+        assert event.connect_time == 0
+        assert 0 <= event.ttfb <= event.total_time
+        assert event.error is None
+
+    def test_request_emits_request_event_on_error(self):
+        events = []
+        self.client.hooks.register(REQUEST_EVENT, events.append)
+        self.resp.status = 401
+
+        with pytest.raises(AuthenticationError) as e:
+            asyncio.run(
+                self.client.request(
+                    self.method,
+                    self.url,
+                    api_secret_key=self.api_secret_key,
+                ),
+            )
+
+        assert events[0].status_code == 401
+        assert events[0].retries == 0
+        assert events[0].error is e.value
+
+    def test_encode_params(self):
+        assert AiohttpClient._encode_params(None) is None
+        assert AiohttpClient._encode_params(
+            {"issuer": "did:ethr:0x1", "wallet_type": WalletType.NONE, "x": None},
+        ) == [("issuer", "did:ethr:0x1"), ("wallet_type", "WalletType.NONE")]
+
+    def test_setup_request_session(self):
+        client = AiohttpClient(self.retries, self.timeout, self.backoff_factor)
+
+        async def setup_and_close():
+            client._setup_request_session()
+            session = client._session
+            await client.close()
+
+            return session
+
+        session = asyncio.run(setup_and_close())
+
+        assert session.closed
+        assert session.timeout.total == self.timeout
+        assert client._session is None
+
+    def test_setup_request_session_with_pool_options(self):
+        client = AiohttpClient(
+            self.retries,
+            self.timeout,
+            self.backoff_factor,
+            pool_maxsize=8,
+            keep_alive=False,
+        )
+
+        async def setup_and_close():
+            client._setup_request_session()
+            connector = client._session.connector
+            pool_stats = client.get_pool_stats()
+            await client.close()
+
+            return connector, pool_stats
+
+        connector, pool_stats = asyncio.run(setup_and_close())
+
+        assert connector.limit == 8
+        assert connector.force_close
+        assert pool_stats == [
+            {
+                "host": None,
+                "maxsize": 8,
+                "in_use": 0,
+                "idle": None,
+                "num_connections": 0,
+                "num_requests": 0,
+            },
+        ]
+        assert client.get_pool_stats() == []
+
+    def test_on_connection_create_end_counts_connections(self):
+        trace_config_ctx = mock.Mock(
+            connect_start=0,
+            trace_request_ctx={"connect_time": 0},
+        )
+
+        with mock.patch(
+            "magic_admin.async_http_client.time.perf_counter",
+            return_value=0.25,
+        ):
+            asyncio.run(
+                self.client._on_connection_create_end(None, trace_config_ctx, None),
+            )
+
+        assert trace_config_ctx.trace_request_ctx["connect_time"] == 0.25
+        assert self.client._num_connections == 1
+
+    def test_get_pool_stats_counts_requests_in_flight(self):
+        self.client._session.connector.limit = 8
+        in_flight_stats = []
+
+        async def request(*args, **kwargs):
+            in_flight_stats.append(self.client.get_pool_stats()[0])
+
+            return self.resp
+
+        self.client._session.request.side_effect = request
+
+        asyncio.run(
+            self.client.request(
+                self.method,
+                self.url,
+                api_secret_key=self.api_secret_key,
+            )
+        )
+
+        assert in_flight_stats[0]["in_use"] == 1
+        assert self.client.get_pool_stats() == [
+            {
+                "host": None,
+                "maxsize": 8,
+                "in_use": 0,
+                "idle": None,
+                "num_connections": 0,
+                "num_requests": 1,
+            },
+        ]
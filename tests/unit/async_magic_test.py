@@ -0,0 +1,121 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from magic_admin.async_magic import AsyncMagic
+from magic_admin.async_magic import POOL_MAXSIZE
+from magic_admin.resources.async_utils import OWNERSHIP_CHECK_LIMIT
+from magic_admin.magic import BACKOFF_FACTOR
+from magic_admin.magic import KEEP_ALIVE
+from magic_admin.magic import RATE_LIMIT
+from magic_admin.magic import RETRIES
+from magic_admin.magic import TIMEOUT
+
+
+class TestAsyncMagic:
+    api_secret_key = "troll_goat"
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.mocked_request_client = mock.Mock(
+            request=mock.AsyncMock(
+                return_value=mock.Mock(data={"client_id": "1234"}),
+            ),
+            close=mock.AsyncMock(),
+        )
+        self.mocked_resource_component = mock.Mock()
+        self.mocked_resource_component.Token._client_id = None
+
+        with (
+            mock.patch(
+                "magic_admin.async_magic.AsyncResourceComponent",
+                return_value=self.mocked_resource_component,
+            ),
+            mock.patch(
+                "magic_admin.async_magic.AiohttpClient",
+                return_value=self.mocked_request_client,
+            ) as self.mocked_aiohttp_client,
+            mock.patch(
+                "magic_admin.async_magic.AsyncContractPool",
+                return_value=mock.Mock(disconnect=mock.AsyncMock()),
+            ) as self.mocked_contract_pool_class,
+        ):
+            yield
+
+    def test_init(self):
+        magic = AsyncMagic(api_secret_key=self.api_secret_key, client_id="4321")
+
+        self.mocked_aiohttp_client.assert_called_once_with(
+            RETRIES,
+            TIMEOUT,
+            BACKOFF_FACTOR,
+            pool_maxsize=POOL_MAXSIZE,
+            keep_alive=KEEP_ALIVE,
+            rate_limit=RATE_LIMIT,
+            rate_limit_burst=None,
+            retry_policy=None,
+            hooks=None,
+        )
+        assert magic._api_secret_key == self.api_secret_key
+        self.mocked_resource_component.setup_resources.assert_called_once_with(
+            self.mocked_request_client,
+            self.api_secret_key,
+            hooks=self.mocked_request_client.hooks,
+        )
+        self.mocked_resource_component.Token.setup_client_id.assert_called_once_with(
+            "4321",
+        )
+        self.mocked_resource_component.Utils.setup_ownership_check_limit.assert_called_once_with(
+            OWNERSHIP_CHECK_LIMIT,
+        )
+        assert (
+            self.mocked_resource_component.Utils.contract_pool
+            == self.mocked_contract_pool_class.return_value
+        )
+        self.mocked_request_client.request.assert_not_called()
+
+    def test_context_manager_fetches_client_id_and_closes(self):
+        async def run():
+            async with AsyncMagic(api_secret_key=self.api_secret_key):
+                pass
+
+        asyncio.run(run())
+
+        self.mocked_request_client.request.assert_called_once_with(
+            "get",
+            AsyncMagic.v1_client_info,
+            api_secret_key=self.api_secret_key,
+        )
+        self.mocked_resource_component.Token.setup_client_id.assert_called_with(
+            "1234",
+        )
+        self.mocked_request_client.close.assert_called_once_with()
+        self.mocked_contract_pool_class.return_value.disconnect.assert_called_once_with()
+
+    def test_close_keeps_given_request_client_open(self):
+        magic = AsyncMagic(
+            api_secret_key=self.api_secret_key,
+            request_client=self.mocked_request_client,
+        )
+
+        asyncio.run(magic.close())
+
+        self.mocked_request_client.close.assert_not_called()
+        self.mocked_contract_pool_class.assert_not_called()
+
+    def test_context_manager_keeps_given_client_id(self):
+        self.mocked_resource_component.Token._client_id = "4321"
+
+        async def run():
+            async with AsyncMagic(api_secret_key=self.api_secret_key, client_id="4321"):
+                pass
+
+        asyncio.run(run())
+
+        self.mocked_request_client.request.assert_not_called()
+
+    def test_gets_resource(self):
+        magic = AsyncMagic(api_secret_key=self.api_secret_key)
+
+        assert magic.User == self.mocked_resource_component.User
@@ -1,10 +1,12 @@
 import json
+import threading
 from collections import namedtuple
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 from unittest import mock
 
 import pytest
 
-import magic_admin
 from magic_admin import version
 from magic_admin.config import base_url
 from magic_admin.error import APIConnectionError
@@ -14,7 +16,9 @@ from magic_admin.error import BadRequestError
 from magic_admin.error import ForbiddenError
 from magic_admin.error import RateLimitingError
 from magic_admin.http_client import RequestsClient
+from magic_admin.http_client import _get_request_rate_limiter
 from magic_admin.response import MagicResponse
+from magic_admin.utils.hooks import REQUEST_EVENT
 
 
 class TestRequestsClient:
@@ -68,36 +72,96 @@ class TestRequestsClient:
                 "magic_admin.http_client.HTTPAdapter",
             ) as mock_http_adapter,
             mock.patch(
-                "magic_admin.http_client.Retry",
-            ) as mock_retry,
+                "magic_admin.http_client.RetryPolicy",
+            ) as mock_retry_policy,
         ):
             RequestsClient(self.retries, self.timeout, self.backoff_factor)
 
-        mock_retry.assert_called_once_with(
-            total=self.retries,
-            backoff_factor=self.backoff_factor,
+        mock_retry_policy.assert_called_once_with(
+            self.retries,
+            self.backoff_factor,
         )
         mock_http_adapter.assert_called_once_with(
-            max_retries=mock_retry.return_value,
+            pool_connections=10,
+            pool_maxsize=10,
+            pool_block=False,
+            max_retries=mock_retry_policy.return_value.to_urllib3_retry.return_value,
         )
         mock_session.return_value.mount.assert_called_once_with(
             base_url,
             mock_http_adapter.return_value,
         )
         mock_session.assert_called_once_with()
+        mock_session.return_value.headers.__setitem__.assert_not_called()
+
+    def test_setup_request_session_with_pool_options(self):
+        with (
+            mock.patch(
+                "magic_admin.http_client.HTTPAdapter",
+            ) as mock_http_adapter,
+            mock.patch(
+                "magic_admin.http_client.RetryPolicy",
+            ) as mock_retry_policy,
+        ):
+            rc = RequestsClient(
+                self.retries,
+                self.timeout,
+                self.backoff_factor,
+                pool_connections=2,
+                pool_maxsize=64,
+                pool_block=True,
+                keep_alive=False,
+            )
+
+        mock_http_adapter.assert_called_once_with(
+            pool_connections=2,
+            pool_maxsize=64,
+            pool_block=True,
+            max_retries=mock_retry_policy.return_value.to_urllib3_retry.return_value,
+        )
+        assert rc.http.headers["Connection"] == "close"
+
+    def test_get_pool_stats(self):
+        rc = RequestsClient(
+            self.retries,
+            self.timeout,
+            self.backoff_factor,
+            pool_maxsize=3,
+        )
+        assert rc.get_pool_stats() == []
+
+        pool = rc._adapter.poolmanager.connection_from_url(base_url)
+        conn = pool._get_conn()
+        pool.num_requests = 5
+
+        assert rc.get_pool_stats() == [
+            {
+                "host": pool.host,
+                "maxsize": 3,
+                "in_use": 1,
+                "idle": 0,
+                "num_connections": 1,
+                "num_requests": 5,
+            },
+        ]
+
+        pool._put_conn(conn)
+
+        assert rc.get_pool_stats()[0]["in_use"] == 0
+        assert rc.get_pool_stats()[0]["idle"] == 1
 
     def test_get_request_headers(self):
         rc = RequestsClient(self.retries, self.timeout, self.backoff_factor)
         platform_info = {"troll": "goat"}
-        magic_admin.api_secret_key = "magic_secret_key"
+        api_secret_key = "magic_secret_key"
 
         with mock.patch.object(
             rc,
             "_get_platform_info",
             return_value=platform_info,
         ) as mock_get_platform_info:
-            assert rc._get_request_headers() == {
-                "X-Magic-Secret-Key": magic_admin.api_secret_key,
+            assert rc._get_request_headers(api_secret_key) == {
+                "X-Magic-Secret-Key": api_secret_key,
                 "User-Agent": json.dumps(
                     {
                         "language": "python",
@@ -111,12 +175,64 @@ class TestRequestsClient:
 
         mock_get_platform_info.assert_called_once_with()
 
+    def test_get_request_headers_is_cached(self):
+        rc = RequestsClient(self.retries, self.timeout, self.backoff_factor)
+
+        with mock.patch.object(
+            rc,
+            "_get_platform_info",
+            return_value={},
+        ) as mock_get_platform_info:
+            headers = rc._get_request_headers("magic_secret_key")
+
+            assert rc._get_request_headers("magic_secret_key") is headers
+
+        mock_get_platform_info.assert_called_once_with()
+
+    def test_get_request_headers_per_secret_key(self):
+        rc = RequestsClient(self.retries, self.timeout, self.backoff_factor)
+
+        with mock.patch.object(
+            rc,
+            "_get_platform_info",
+            return_value={},
+        ) as mock_get_platform_info:
+            headers = rc._get_request_headers("magic_secret_key")
+            new_headers = rc._get_request_headers("another_magic_secret_key")
+
+            assert rc._get_request_headers("magic_secret_key") is headers
+
+        assert headers["X-Magic-Secret-Key"] == "magic_secret_key"
+        assert new_headers["X-Magic-Secret-Key"] == "another_magic_secret_key"
+        assert new_headers["User-Agent"] == headers["User-Agent"]
+        mock_get_platform_info.assert_called_once_with()
+
     def test_get_request_headers_raises_error(self):
         rc = RequestsClient(self.retries, self.timeout, self.backoff_factor)
-        magic_admin.api_secret_key = None
 
         with pytest.raises(AuthenticationError):
-            rc._get_request_headers()
+            rc._get_request_headers(None)
+
+    def test_get_rate_limiter_is_disabled_by_default(self):
+        rc = RequestsClient(self.retries, self.timeout, self.backoff_factor)
+
+        assert rc._get_rate_limiter("magic_secret_key") is None
+
+    def test_get_rate_limiter_per_secret_key(self):
+        rc = RequestsClient(
+            self.retries,
+            self.timeout,
+            self.backoff_factor,
+            rate_limit=5,
+            rate_limit_burst=3,
+        )
+
+        rate_limiter = rc._get_rate_limiter("magic_secret_key")
+
+        assert rate_limiter.max_rate == 5
+        assert rate_limiter.burst == 3
+        assert rc._get_rate_limiter("magic_secret_key") is rate_limiter
+        assert rc._get_rate_limiter("another_magic_secret_key") is not rate_limiter
 
     def test_handle_request_error(self):
         rc = RequestsClient(self.retries, self.timeout, self.backoff_factor)
@@ -152,6 +268,7 @@ class TestRequestClientRequest:
     @pytest.fixture(autouse=True)
     def setup(self):
         self.some_headers = {"troll": "goat"}
+        self.api_secret_key = "magic_secret_key"
         self.method = "post"
         self.url = "/path"
         self.params = "params"
@@ -190,11 +307,12 @@ class TestRequestClientRequest:
                 self.url,
                 params=self.params,
                 data=self.data,
+                api_secret_key=self.api_secret_key,
             )
             == mock_funcs.parse_and_convert_to_api_response.return_value
         )
 
-        mock_funcs.get_request_headers.assert_called_once_with()
+        mock_funcs.get_request_headers.assert_called_once_with(self.api_secret_key)
         self.rc.http.request.assert_called_once_with(
             self.method,
             self.url,
@@ -220,11 +338,12 @@ class TestRequestClientRequest:
                 self.url,
                 params=self.params,
                 data=self.data,
+                api_secret_key=self.api_secret_key,
             )
             == mock_funcs.handle_request_error.return_value
         )
 
-        mock_funcs.get_request_headers.assert_called_once_with()
+        mock_funcs.get_request_headers.assert_called_once_with(self.api_secret_key)
         self.rc.http.request.assert_called_once_with(
             self.method,
             self.url,
@@ -302,3 +421,164 @@ class TestParseAndConvertToAPIResponse:
             "http_method": self.resp.request.method,
             "message": mock.ANY,
         }
+
+
+class TestRequestClientRateLimiting:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.rc = RequestsClient(1, 2, 3, rate_limit=5)
+        self.rc.http = mock.Mock()
+        self.rate_limiter = mock.Mock()
+        self.rc._rate_limiters["magic_secret_key"] = self.rate_limiter
+
+        with mock.patch.object(self.rc, "_parse_and_convert_to_api_response"):
+            yield
+
+    def test_request_acquires_rate_limiter(self):
+        self.rc.http.request.return_value = mock.Mock(status_code=200, headers={})
+
+        self.rc.request("get", "/path", api_secret_key="magic_secret_key")
+
+        self.rate_limiter.acquire.assert_called_once_with()
+        self.rate_limiter.on_response.assert_called_once_with(200, None)
+
+    def test_request_honors_retry_after(self):
+        self.rc.http.request.return_value = mock.Mock(
+            status_code=429,
+            headers={"Retry-After": "7"},
+        )
+
+        self.rc.request("get", "/path", api_secret_key="magic_secret_key")
+
+        self.rate_limiter.on_response.assert_called_once_with(429, 7.0)
+
+    def test_request_does_not_cap_retry_after_of_rate_limiter(self):
+        self.rc.http.request.return_value = mock.Mock(
+            status_code=429,
+            headers={"Retry-After": "3600"},
+        )
+
+        self.rc.request("get", "/path", api_secret_key="magic_secret_key")
+
+        self.rate_limiter.on_response.assert_called_once_with(429, 3600)
+
+    def test_request_shares_rate_limiter_with_retries(self):
+        self.rc.http.request.side_effect = lambda *args, **kwargs: mock.Mock(
+            status_code=200,
+            headers={},
+            # The rate limiter the urllib3 retries of the request see.
+            rate_limiter=_get_request_rate_limiter(),
+        )
+
+        with mock.patch.object(
+            self.rc,
+            "_parse_and_convert_to_api_response",
+            side_effect=lambda resp, *args: resp,
+        ):
+            resp = self.rc.request("get", "/path", api_secret_key="magic_secret_key")
+
+        assert resp.rate_limiter is self.rate_limiter
+
+    def test_request_without_response_does_not_update_rate_limiter(self):
+        self.rc.http.request.side_effect = Exception()
+
+        with pytest.raises(APIConnectionError):
+            self.rc.request("get", "/path", api_secret_key="magic_secret_key")
+
+        self.rate_limiter.acquire.assert_called_once_with()
+        self.rate_limiter.on_response.assert_not_called()
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    # Keep the connections alive, so that the second request reuses one.
+    protocol_version = "HTTP/1.1"
+
+    status = 200
+
+    def do_GET(self):
+        body = b'{"data": {}, "status": "ok"}'
+
+        self.send_response(self.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRequestClientHooks:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        JSONHandler.status = 200
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), JSONHandler)
+        self.server.daemon_threads = True
+        base_url = "http://127.0.0.1:{}".format(self.server.server_port)
+        self.url = base_url + "/v1/admin/user"
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+
+        self.rc = RequestsClient(0, 2, 0)
+        self.rc.http.mount(base_url, self.rc._adapter)
+        self.events = []
+        self.rc.hooks.register(REQUEST_EVENT, self.events.append)
+
+        yield
+
+        self.rc.http.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def request(self, params=None):
+        return self.rc.request(
+            "get",
+            self.url,
+            params=params,
+            api_secret_key="magic_secret_key",
+        )
+
+    def test_request_emits_request_event(self):
+        self.request(params={"issuer": "troll_goat"})
+        self.request()
+
+        first, second = self.events
+        assert first.method == "GET"
+        assert first.path == "/v1/admin/user"
+        assert first.status_code == 200
+        assert first.retries == 0
+        assert first.connect_time > 0
+        assert 0 < first.ttfb <= first.total_time
+        assert first.error is None
+        # The pooled connection is reused.
+        assert second.connect_time == 0
+
+    def test_request_emits_request_event_on_error(self):
+        JSONHandler.status = 401
+
+        with pytest.raises(AuthenticationError) as e:
+            self.request()
+
+        assert self.events[0].status_code == 401
+        assert self.events[0].error is e.value
+
+    def test_request_emits_request_event_without_response(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+        with pytest.raises(APIConnectionError) as e:
+            self.request()
+
+        assert self.events[0].status_code is None
+        assert self.events[0].ttfb is None
+        assert self.events[0].error is e.value
+
+    def test_hook_errors_do_not_fail_request(self):
+        self.rc.hooks.register(REQUEST_EVENT, mock.Mock(side_effect=ValueError()))
+
+        with pytest.warns(RuntimeWarning):
+            resp = self.request()
+
+        assert resp.status_code == 200
+        assert len(self.events) == 1
@@ -0,0 +1,47 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+
+# Modules that are only needed once a DID token is validated or a token gating
+# check is made. Importing them takes over a second.
+LAZY_MODULES = ["web3", "eth_account", "eth_keys", "eth_utils", "coincurve", "aiohttp"]
+
+
+def _import_in_subprocess(statement):
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            "import json, sys\n{}\nprint(json.dumps(sorted(sys.modules)))".format(
+                statement
+            ),
+        ],
+    )
+
+    return set(json.loads(output))
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import magic_admin",
+        "from magic_admin import Magic",
+        "from magic_admin.resources import Token, User, Utils",
+    ],
+)
+def test_import_does_not_load_web3(statement):
+    loaded_modules = _import_in_subprocess(statement)
+
+    assert [module for module in LAZY_MODULES if module in loaded_modules] == []
+
+
+def test_validate_loads_recovery_backend_lazily():
+    loaded_modules = _import_in_subprocess(
+        "from magic_admin.utils.signature import get_recovery_backend\n"
+        "get_recovery_backend()",
+    )
+
+    assert loaded_modules & {"coincurve", "eth_keys", "web3"}
@@ -2,12 +2,19 @@ from unittest import mock
 
 import pytest
 
-import magic_admin
 from magic_admin.error import AuthenticationError
 from magic_admin.magic import BACKOFF_FACTOR
+from magic_admin.magic import KEEP_ALIVE
+from magic_admin.magic import METADATA_CACHE_SIZE
 from magic_admin.magic import Magic
+from magic_admin.magic import OWNERSHIP_CACHE_SIZE
+from magic_admin.magic import POOL_BLOCK
+from magic_admin.magic import POOL_CONNECTIONS
+from magic_admin.magic import POOL_MAXSIZE
+from magic_admin.magic import RATE_LIMIT
 from magic_admin.magic import RETRIES
 from magic_admin.magic import TIMEOUT
+from magic_admin.magic import VERIFIED_TOKEN_CACHE_SIZE
 
 
 class TestMagic:
@@ -16,15 +23,6 @@ class TestMagic:
     @pytest.fixture(autouse=True)
     def setup(self):
         self.mocked_resource_component = mock.Mock()
-        self.mocked_request_client = mock.Mock(
-            request=mock.Mock(
-                return_value=mock.Mock(
-                    data={
-                        "client_id": "1234",
-                    },
-                ),
-            ),
-        )
         with (
             mock.patch(
                 "magic_admin.magic.ResourceComponent",
@@ -32,47 +30,145 @@ class TestMagic:
             ),
             mock.patch(
                 "magic_admin.magic.RequestsClient",
-                return_value=self.mocked_request_client,
-            ),
+            ) as self.mocked_requests_client,
         ):
             yield
 
-    @pytest.fixture(autouse=True)
-    def teardown(self):
-        yield
-        magic_admin.api_secret_key = None
-
     def test_init(self):
-        with mock.patch(
-            "magic_admin.magic.Magic._set_api_secret_key",
-        ) as mock_set_api_secret_key:
-            Magic(api_secret_key=self.api_secret_key)
+        magic = Magic(api_secret_key=self.api_secret_key)
 
-        self.mocked_resource_component.setup_request_client.assert_called_once_with(
+        self.mocked_requests_client.assert_called_once_with(
             RETRIES,
             TIMEOUT,
             BACKOFF_FACTOR,
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            pool_block=POOL_BLOCK,
+            keep_alive=KEEP_ALIVE,
+            rate_limit=RATE_LIMIT,
+            rate_limit_burst=None,
+            retry_policy=None,
+            hooks=None,
+        )
+        assert magic._request_client == self.mocked_requests_client.return_value
+        self.mocked_resource_component.setup_resources.assert_called_once_with(
+            self.mocked_requests_client.return_value,
+            self.api_secret_key,
+            hooks=self.mocked_requests_client.return_value.hooks,
+        )
+        self.mocked_resource_component.Token.setup_client_id.assert_called_once_with(
+            None,
+        )
+        self.mocked_resource_component.Token.setup_verified_token_cache.assert_called_once_with(
+            VERIFIED_TOKEN_CACHE_SIZE,
+            backend=None,
+        )
+        self.mocked_resource_component.Utils.setup_ownership_cache.assert_called_once_with(
+            OWNERSHIP_CACHE_SIZE,
+        )
+        self.mocked_resource_component.User.setup_metadata_cache.assert_called_once_with(
+            METADATA_CACHE_SIZE,
+            backend=None,
         )
-        mock_set_api_secret_key.assert_called_once_with(self.api_secret_key)
 
-    def test_retrieves_secret_key_from_env_variable(self):
-        assert magic_admin.api_secret_key is None
+    def test_init_does_not_fetch_client_id(self):
+        Magic(api_secret_key=self.api_secret_key)
+
+        self.mocked_requests_client.return_value.request.assert_not_called()
+
+    def test_init_with_client_id(self):
+        Magic(api_secret_key=self.api_secret_key, client_id="1234")
+
+        self.mocked_resource_component.Token.setup_client_id.assert_called_once_with(
+            "1234",
+        )
+
+    def test_init_with_request_client(self):
+        request_client = mock.Mock()
+
+        magic = Magic(api_secret_key=self.api_secret_key, request_client=request_client)
+
+        self.mocked_requests_client.assert_not_called()
+        assert magic._request_client == request_client
+        self.mocked_resource_component.setup_resources.assert_called_once_with(
+            request_client,
+            self.api_secret_key,
+            hooks=request_client.hooks,
+        )
+
+    def test_for_tenant(self):
+        magic = Magic(api_secret_key=self.api_secret_key)
+        tenant_resource_component = mock.Mock()
 
+        with mock.patch(
+            "magic_admin.magic.ResourceComponent",
+            return_value=tenant_resource_component,
+        ):
+            tenant = magic.for_tenant("another_secret_key", client_id="4321")
+
+        assert tenant._api_secret_key == "another_secret_key"
+        assert tenant._request_client == magic._request_client
+        assert tenant.hooks == magic.hooks
+        self.mocked_requests_client.assert_called_once()
+        tenant_resource_component.setup_resources.assert_called_once_with(
+            magic._request_client,
+            "another_secret_key",
+            hooks=magic._request_client.hooks,
+        )
+        tenant_resource_component.Token.setup_client_id.assert_called_once_with(
+            "4321",
+        )
+        assert (
+            tenant.Token.verified_token_cache
+            == self.mocked_resource_component.Token.verified_token_cache
+        )
+        assert (
+            tenant.Utils.ownership_cache
+            == self.mocked_resource_component.Utils.ownership_cache
+        )
+        metadata_cache = self.mocked_resource_component.User.metadata_cache
+        tenant_resource_component.User.setup_metadata_cache.assert_called_with(
+            metadata_cache.maxsize,
+            ttl=metadata_cache.ttl,
+            stale_ttl=metadata_cache.stale_ttl,
+            backend=metadata_cache.store.backend,
+        )
+
+    def test_get_pool_stats(self):
+        magic = Magic(api_secret_key=self.api_secret_key)
+
+        assert (
+            magic.get_pool_stats()
+            == self.mocked_requests_client.return_value.get_pool_stats.return_value
+        )
+
+    def test_get_retry_stats(self):
+        magic = Magic(api_secret_key=self.api_secret_key)
+
+        assert (
+            magic.get_retry_stats()
+            == self.mocked_requests_client.return_value.get_retry_stats.return_value
+        )
+
+    def test_hooks(self):
+        magic = Magic(api_secret_key=self.api_secret_key)
+
+        assert magic.hooks == self.mocked_requests_client.return_value.hooks
+
+    def test_retrieves_secret_key_from_env_variable(self):
         with mock.patch(
             "os.environ.get",
             return_value=self.api_secret_key,
         ) as mock_env_get:
-            Magic()
+            magic = Magic()
 
-        assert magic_admin.api_secret_key == self.api_secret_key
+        assert magic._api_secret_key == self.api_secret_key
         mock_env_get.assert_called_once_with("MAGIC_API_SECRET_KEY")
 
     def test_retrieves_secret_key_from_the_passed_in_value(self):
-        assert magic_admin.api_secret_key is None
-
-        Magic(api_secret_key=self.api_secret_key)
+        magic = Magic(api_secret_key=self.api_secret_key)
 
-        assert magic_admin.api_secret_key == self.api_secret_key
+        assert magic._api_secret_key == self.api_secret_key
 
     def test_raises_authentication_error_if_secret_key_is_missing(self):
         with pytest.raises(AuthenticationError):
@@ -0,0 +1,123 @@
+import asyncio
+from unittest import mock
+from unittest.mock import sentinel
+
+import pytest
+
+from magic_admin.error import APIConnectionError
+from magic_admin.resources.async_user import AsyncUser
+from magic_admin.resources.base import AsyncResourceComponent
+from magic_admin.resources.wallet import WalletType
+from testing.data.did_token import future_did_token
+from testing.data.did_token import issuer
+from testing.data.did_token import public_address
+
+
+class TestAsyncUser:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.user = AsyncUser()
+        self.user.request = mock.AsyncMock(return_value=sentinel.response)
+
+    def test_registered_as_user(self):
+        assert isinstance(AsyncResourceComponent().User, AsyncUser)
+
+    def test_get_metadata_by_issuer_and_wallet(self):
+        assert (
+            asyncio.run(
+                self.user.get_metadata_by_issuer_and_wallet(issuer, WalletType.ANY),
+            )
+            == sentinel.response
+        )
+
+        self.user.request.assert_called_once_with(
+            "get",
+            self.user.v1_user_info,
+            params={"issuer": issuer, "wallet_type": WalletType.ANY},
+        )
+
+    @pytest.mark.parametrize(
+        "method,arg",
+        [
+            ("get_metadata_by_issuer", issuer),
+            ("get_metadata_by_public_address", public_address),
+            ("get_metadata_by_token", future_did_token),
+        ],
+    )
+    def test_get_metadata(self, method, arg):
+        assert asyncio.run(getattr(self.user, method)(arg)) == sentinel.response
+
+        self.user.request.assert_called_once_with(
+            "get",
+            self.user.v1_user_info,
+            params={"issuer": issuer, "wallet_type": WalletType.NONE},
+        )
+
+    @pytest.mark.parametrize(
+        "method,arg",
+        [
+            ("get_metadata_by_public_address_and_wallet", public_address),
+            ("get_metadata_by_token_and_wallet", future_did_token),
+        ],
+    )
+    def test_get_metadata_and_wallet(self, method, arg):
+        assert (
+            asyncio.run(getattr(self.user, method)(arg, WalletType.ETH))
+            == sentinel.response
+        )
+
+        self.user.request.assert_called_once_with(
+            "get",
+            self.user.v1_user_info,
+            params={"issuer": issuer, "wallet_type": WalletType.ETH},
+        )
+
+    @pytest.mark.parametrize(
+        "method,arg",
+        [
+            ("logout_by_issuer", issuer),
+            ("logout_by_public_address", public_address),
+            ("logout_by_token", future_did_token),
+        ],
+    )
+    def test_logout(self, method, arg):
+        assert asyncio.run(getattr(self.user, method)(arg)) == sentinel.response
+
+        self.user.request.assert_called_once_with(
+            "post",
+            self.user.v1_user_logout,
+            data={"issuer": issuer},
+        )
+
+    def test_get_metadata_many(self):
+        error = APIConnectionError(message="Connection error")
+
+        async def request(method, url_path, params=None, data=None):
+            if params["issuer"] == "did:ethr:1":
+                raise error
+
+            return params["wallet_type"]
+
+        self.user.request = mock.AsyncMock(side_effect=request)
+
+        async def collect():
+            return [
+                result
+                async for result in self.user.get_metadata_many(
+                    ["did:ethr:{}".format(i) for i in range(3)],
+                    wallet_type=WalletType.ETH,
+                    max_concurrency=2,
+                )
+            ]
+
+        results = asyncio.run(collect())
+
+        assert [result.issuer for result in results] == [
+            "did:ethr:{}".format(i) for i in range(3)
+        ]
+        assert [result.response for result in results] == [
+            WalletType.ETH,
+            None,
+            WalletType.ETH,
+        ]
+        assert [result.error for result in results] == [None, error, None]
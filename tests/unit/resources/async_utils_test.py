@@ -0,0 +1,145 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from magic_admin.error import DIDTokenMalformed
+from magic_admin.resources.async_utils import OWNERSHIP_CHECK_LIMIT
+from magic_admin.resources.async_utils import AsyncUtils
+from magic_admin.resources.base import AsyncResourceComponent
+from magic_admin.utils.contract import ERC1155
+from magic_admin.utils.contract import ERC721
+from testing.data.did_token import public_address
+
+
+class TestAsyncUtils:
+    did_token = "troll_goat"
+    contract_address = "0x4B73C58370AEfcEf86A6021afCDe5673511376B2"
+    rpc_url = "http://localhost:8545"
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.utils = AsyncUtils()
+        self.token = mock.Mock()
+        self.token.validate.return_value.public_address = public_address
+        self.balance_of = mock.Mock()
+        self.balance_of.return_value.call = mock.AsyncMock(return_value=1)
+        self.contract_pool = self.utils.contract_pool = mock.Mock()
+        self.contract_pool.get_contract.return_value.functions.balanceOf = (
+            self.balance_of
+        )
+
+        with mock.patch.object(
+            AsyncUtils,
+            "Token",
+            self.token,
+            create=True,
+        ):
+            yield
+
+    def _validate(self, contract_type=ERC1155, token_id="1"):
+        return asyncio.run(
+            self.utils.validate_token_ownership(
+                self.did_token,
+                self.contract_address,
+                contract_type,
+                self.rpc_url,
+                token_id=token_id,
+            ),
+        )
+
+    def test_registered_as_utils(self):
+        assert isinstance(AsyncResourceComponent().Utils, AsyncUtils)
+
+    def test_init(self):
+        assert self.utils.ownership_check_limit == OWNERSHIP_CHECK_LIMIT
+        assert self.utils.ownership_cache is None
+
+    @pytest.mark.parametrize(
+        ("contract_type", "token_id", "balance_of_args"),
+        [
+            (ERC721, None, (public_address,)),
+            (ERC1155, "1", (public_address, 1)),
+        ],
+    )
+    def test_validate_token_ownership(self, contract_type, token_id, balance_of_args):
+        assert self._validate(contract_type, token_id) == {
+            "valid": True,
+            "error_code": "",
+            "message": "",
+        }
+
+        self.token.validate.assert_called_once_with(self.did_token)
+        self.contract_pool.get_contract.assert_called_once_with(
+            self.rpc_url,
+            self.contract_address,
+            contract_type,
+        )
+        self.balance_of.assert_called_once_with(*balance_of_args)
+
+    def test_validate_token_ownership_fetches_client_id(self):
+        self.token._client_id = None
+        self.token.v1_client_info = "/v1/admin/client"
+
+        with mock.patch.object(
+            self.utils,
+            "request",
+            new=mock.AsyncMock(return_value=mock.Mock(data={"client_id": "1234"})),
+        ) as mock_request:
+            self._validate()
+
+        mock_request.assert_called_once_with("get", "/v1/admin/client")
+        self.token.setup_client_id.assert_called_once_with("1234")
+
+    def test_validate_token_ownership_without_ownership(self):
+        self.balance_of.return_value.call.return_value = 0
+
+        assert self._validate()["error_code"] == "NO_OWNERSHIP"
+
+    def test_validate_token_ownership_with_malformed_did_token(self):
+        self.token.validate.side_effect = DIDTokenMalformed(message="Malformed")
+
+        assert self._validate() == {
+            "valid": False,
+            "error_code": "UNAUTHORIZED",
+            "message": "Invalid DID token: ERROR_MALFORMED_TOKEN",
+        }
+        self.balance_of.assert_not_called()
+
+    def test_validate_token_ownership_requires_token_id_for_erc1155(self):
+        with pytest.raises(ValueError):
+            self._validate(token_id=None)
+
+    def test_validate_token_ownership_uses_ownership_cache(self):
+        self.utils.setup_ownership_cache(10)
+
+        self._validate()
+        self._validate()
+
+        self.balance_of.return_value.call.assert_called_once_with()
+
+    def test_validate_token_ownership_many_respects_limit(self):
+        self.utils.setup_ownership_check_limit(2)
+        in_flight = []
+        max_in_flight = []
+
+        async def call():
+            in_flight.append(None)
+            max_in_flight.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return 1
+
+        self.balance_of.return_value.call.side_effect = call
+
+        responses = asyncio.run(
+            self.utils.validate_token_ownership_many(
+                [
+                    (self.did_token, self.contract_address, ERC1155, self.rpc_url, i)
+                    for i in range(1, 7)
+                ],
+            ),
+        )
+
+        assert [response["valid"] for response in responses] == [True] * 6
+        assert max(max_in_flight) == 2
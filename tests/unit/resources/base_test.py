@@ -19,25 +19,37 @@ class TestResourceComponent:
     def setup(self):
         self.rc = ResourceComponent()
 
-    def test_setup_request_client(self):
-        with mock.patch(
-            "magic_admin.resources.base.RequestsClient",
-        ) as mock_request_client:
-            self.rc.setup_request_client(
-                self.retries,
-                self.timeout,
-                self.backoff_factor,
-            )
+    def test_setup_resources(self):
+        request_client = mock.Mock()
 
-        mock_request_client.assert_called_once_with(
-            self.retries,
-            self.timeout,
-            self.backoff_factor,
+        self.rc.setup_resources(
+            request_client,
+            "magic_secret_key",
+            hooks=mock.sentinel.hooks,
         )
-        for resource in self.rc._registry.values():
-            assert (
-                getattr(resource, "_request_client") == mock_request_client.return_value
-            )
+
+        assert self.rc._resources.keys() == self.rc._registry.keys()
+
+        for name, resource in self.rc._resources.items():
+            assert getattr(self.rc, name) is resource
+            assert resource is not self.rc._registry[name]
+            assert resource._request_client == request_client
+            assert resource._api_secret_key == "magic_secret_key"
+            assert resource._hooks is mock.sentinel.hooks
+            # Resources look each other up among the ones of the same Magic.
+            assert resource.Token is self.rc._resources["Token"]
+
+        assert self.rc._registry["Token"]._request_client is None
+
+    def test_setup_resources_isolates_magic_instances(self):
+        other_rc = ResourceComponent()
+
+        self.rc.setup_resources(mock.sentinel.request_client, "magic_secret_key")
+        other_rc.setup_resources(mock.sentinel.request_client, "other_secret_key")
+
+        assert self.rc.Token is not other_rc.Token
+        assert self.rc.User._api_secret_key == "magic_secret_key"
+        assert other_rc.User._api_secret_key == "other_secret_key"
 
     def test_construct_url(self):
         assert self.rc._construct_url(self.url_path) == "{}{}".format(
@@ -47,6 +59,7 @@ class TestResourceComponent:
 
     def test_request(self):
         self.rc._request_client = mock.Mock()
+        self.rc._api_secret_key = "magic_secret_key"
 
         with mock.patch.object(
             self.rc,
@@ -63,3 +76,10 @@ class TestResourceComponent:
             )
 
         mock_construct_url.assert_called_once_with(self.url_path)
+        self.rc._request_client.request.assert_called_once_with(
+            self.method,
+            mock_construct_url.return_value,
+            params=self.params,
+            data=self.data,
+            api_secret_key="magic_secret_key",
+        )
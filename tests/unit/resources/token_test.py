@@ -3,12 +3,26 @@ from collections import namedtuple
 from unittest import mock
 
 import pytest
-from pretend import stub
 
+from magic_admin.config import client_id_missing_message
+from magic_admin.error import DIDTokenAudienceMismatch
 from magic_admin.error import DIDTokenExpired
 from magic_admin.error import DIDTokenInvalid
 from magic_admin.error import DIDTokenMalformed
+from magic_admin.error import DIDTokenSignatureMismatch
+from magic_admin.error import MagicError
+from magic_admin.resources.token import MAX_DID_TOKEN_LENGTH
+from magic_admin.resources.token import MIN_SIGNATURES_PER_WORKER
+from magic_admin.resources.token import VERIFIED_TOKEN_CACHE_NAMESPACE
+from magic_admin.resources.token import DecodedDIDToken
 from magic_admin.resources.token import Token
+from magic_admin.resources.token import recover_signer
+from magic_admin.resources.token import TokenValidationResult
+from magic_admin.utils.cache import LRUCache
+from magic_admin.utils.cache_backend import InMemoryCacheBackend
+from magic_admin.utils.hooks import TOKEN_VALIDATION_EVENT
+from magic_admin.utils.hooks import Hooks
+from testing.data import did_token as did_token_data
 
 
 class TestToken:
@@ -44,14 +58,28 @@ class TestToken:
 
         with mock.patch.object(
             Token,
-            "decode",
-            return_value=(mock.ANY, mocked_claim),
+            "_decode",
+            return_value=(mock.ANY, mocked_claim, mock.ANY),
         ) as mock_decode:
             assert Token.get_issuer(self.did_token) == self.issuer
 
         mock_decode.assert_called_once_with(self.did_token)
 
+    def test_get_issuer_does_not_decode_a_decoded_token(self):
+        decoded_did_token = DecodedDIDToken(
+            self.did_token,
+            mock.ANY,
+            {"iss": self.issuer},
+        )
+
+        with mock.patch.object(Token, "_decode") as mock_decode:
+            assert Token.get_issuer(decoded_did_token) == self.issuer
+
+        mock_decode.assert_not_called()
+
     def test_get_public_address_passes(self):
+        mocked_claim = {"iss": self.issuer}
+
         with (
             mock.patch(
                 "magic_admin.resources.token.parse_public_address_from_issuer",
@@ -59,13 +87,211 @@ class TestToken:
             ) as mock_parse_public_address,
             mock.patch.object(
                 Token,
-                "get_issuer",
-            ) as mock_get_issuer,
+                "_decode",
+                return_value=(mock.ANY, mocked_claim, mock.ANY),
+            ) as mock_decode,
         ):
             assert Token.get_public_address(self.did_token) == self.public_address
 
-        mock_get_issuer.assert_called_once_with(self.did_token)
-        mock_parse_public_address.assert_called_once_with(mock_get_issuer.return_value)
+        mock_decode.assert_called_once_with(self.did_token)
+        mock_parse_public_address.assert_called_once_with(self.issuer)
+
+    def test_parse_passes(self):
+        with mock.patch.object(
+            Token,
+            "_decode",
+            return_value=(
+                mock.sentinel.proof,
+                mock.sentinel.claim,
+                mock.sentinel.raw_claim,
+            ),
+        ) as mock_decode:
+            decoded_did_token = Token.parse(self.did_token)
+
+        mock_decode.assert_called_once_with(self.did_token)
+        assert decoded_did_token.did_token == self.did_token
+        assert decoded_did_token.proof == mock.sentinel.proof
+        assert decoded_did_token.claim == mock.sentinel.claim
+        assert decoded_did_token.raw_claim == mock.sentinel.raw_claim
+        assert decoded_did_token.signed_claim == mock.sentinel.raw_claim
+        assert decoded_did_token.recovered_address is None
+
+    def test_get_client_id_raises_error_without_request_client(self):
+        with pytest.raises(MagicError) as e:
+            Token().get_client_id()
+
+        assert str(e.value) == client_id_missing_message
+
+    def test_signed_claim_serializes_claim_without_raw_claim(self):
+        decoded_did_token = DecodedDIDToken(
+            self.did_token,
+            mock.ANY,
+            {"iss": self.issuer, "ext": 8084},
+        )
+
+        assert decoded_did_token.signed_claim == (
+            '{"iss":"did:ethr:magic_address","ext":8084}'
+        )
+
+
+class TestTokenVerifiedTokenCache:
+    def test_setup_verified_token_cache(self):
+        token = Token()
+
+        token.setup_verified_token_cache(10)
+        assert isinstance(token.verified_token_cache, LRUCache)
+
+        token.setup_verified_token_cache(0)
+        assert token.verified_token_cache is None
+
+    def test_setup_verified_token_cache_with_backend(self):
+        token = Token()
+        backend = InMemoryCacheBackend()
+
+        token.setup_verified_token_cache(0, backend=backend)
+        token.verified_token_cache.set(b"digest", "0xAbC")
+
+        assert backend.get(VERIFIED_TOKEN_CACHE_NAMESPACE + b"digest") == b"0xAbC"
+        assert token.verified_token_cache.get(b"digest") == "0xAbC"
+
+    def test_validate_caches_bytes_did_tokens(self):
+        token = Token()
+        token.setup_client_id(did_token_data.claim["aud"])
+        token.setup_verified_token_cache(10)
+        did_token = did_token_data.future_did_token.encode("utf-8")
+
+        token.validate(did_token)
+        decoded_did_token = token.validate(did_token)
+
+        assert decoded_did_token.recovered_address == did_token_data.public_address
+        assert token.verified_token_cache.hits == 1
+        assert token._get_cache_key(did_token) == token._get_cache_key(
+            did_token_data.future_did_token,
+        )
+
+    def test_validate_skips_corrupt_verified_token_cache_entries(self):
+        token = Token()
+        token.setup_client_id(did_token_data.claim["aud"])
+        backend = InMemoryCacheBackend()
+        backend.get = mock.Mock(return_value=b"\xff")
+        token.setup_verified_token_cache(0, backend=backend)
+
+        decoded_did_token = token.validate(did_token_data.future_did_token)
+
+        assert decoded_did_token.recovered_address == did_token_data.public_address
+        assert token.verified_token_cache.errors == 1
+
+
+class TestTokenValidationHooks:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.token = Token()
+        self.token._hooks = Hooks()
+        self.token.setup_client_id(did_token_data.claim["aud"])
+        self.events = []
+        self.token._hooks.register(TOKEN_VALIDATION_EVENT, self.events.append)
+
+    def test_validate_emits_event(self):
+        self.token.setup_verified_token_cache(10)
+
+        self.token.validate(did_token_data.future_did_token)
+        self.token.validate(did_token_data.future_did_token)
+
+        first, second = self.events
+        assert not first.cached
+        assert second.cached
+        assert first.error is None
+        assert first.status == TokenValidationResult.VALID
+        assert first.recover_time > second.recover_time
+        assert (
+            first.decode_time + first.recover_time + first.claim_check_time
+            <= first.total_time
+        )
+
+    def test_validate_emits_event_on_error(self):
+        self.token.setup_client_id("another_client_id")
+
+        with pytest.raises(DIDTokenInvalid) as e:
+            self.token.validate(did_token_data.future_did_token)
+
+        (event,) = self.events
+        assert event.error is e.value
+        assert event.status == TokenValidationResult.INVALID
+        # The audience is checked before the signature recovery.
+        assert event.claim_check_time is not None
+        assert event.recover_time is None
+
+    def test_validate_emits_event_on_client_id_error(self):
+        self.token.setup_client_id(None)
+
+        with pytest.raises(MagicError) as e:
+            self.token.validate(did_token_data.future_did_token)
+
+        (event,) = self.events
+        assert event.error is e.value
+        assert event.status is None
+
+    def test_try_validate_emits_event(self):
+        self.token.try_validate(did_token_data.future_did_token)
+        self.token.try_validate("troll_goat")
+
+        valid, malformed = self.events
+        assert valid.status == TokenValidationResult.VALID
+        assert valid.recover_time is not None
+        assert malformed.status == TokenValidationResult.MALFORMED
+        assert malformed.error is None
+        assert malformed.decode_time is None
+        assert malformed.total_time is not None
+
+    def test_validate_many_emits_events(self):
+        self.token.setup_verified_token_cache(10)
+        self.token.validate(did_token_data.future_did_token)
+        del self.events[:]
+
+        self.token.validate_many(
+            [
+                did_token_data.future_did_token,
+                "troll_goat",
+                did_token_data.future_did_token,
+            ],
+            workers=1,
+        )
+
+        assert [event.status for event in self.events] == [
+            TokenValidationResult.VALID,
+            TokenValidationResult.MALFORMED,
+            TokenValidationResult.VALID,
+        ]
+        assert [event.cached for event in self.events] == [True, False, True]
+
+        for event in self.events:
+            assert event.error is None
+            assert event.total_time == sum(
+                phase_time or 0
+                for phase_time in (
+                    event.decode_time,
+                    event.claim_check_time,
+                    event.recover_time,
+                )
+            )
+
+    def test_validate_many_emits_events_for_recovered_tokens(self):
+        self.token.validate_many([did_token_data.future_did_token] * 2, workers=1)
+
+        assert [event.status for event in self.events] == [
+            TokenValidationResult.VALID,
+        ] * 2
+        assert not any(event.cached for event in self.events)
+        assert all(event.recover_time is not None for event in self.events)
+
+    def test_validate_without_hooks(self):
+        token = Token()
+        token.setup_client_id(did_token_data.claim["aud"])
+
+        assert token._get_hooks() is None
+        assert token.validate(did_token_data.future_did_token).claim == (
+            did_token_data.claim
+        )
 
 
 class TestTokenDecode:
@@ -113,10 +339,20 @@ class TestTokenDecode:
             "[proof, claim]."
         )
 
+    def test_decode_raises_error_if_did_token_is_not_a_list(self):
+        # "12" once decoded.
+        with pytest.raises(DIDTokenMalformed) as e:
+            Token.decode("MTI=")
+
+        assert (
+            str(e.value) == "DID token is malformed. It has to have two parts "
+            "[proof, claim]."
+        )
+
     def test_decode_raises_error_if_claim_is_not_json_serializable(self, setup_mocks):
         with pytest.raises(DIDTokenMalformed) as e:
             setup_mocks.json_loads.side_effect = [
-                ("proof_in_str", "claim_in_str"),  # Succeeds the first time.
+                ["proof_in_str", "claim_in_str"],  # Succeeds the first time.
                 Exception(),  # Fails the second time.
             ]
 
@@ -132,20 +368,45 @@ class TestTokenDecode:
             "a JSON serialized string. Exception (<empty message>)."
         )
 
+    def test_decode_raises_error_if_did_token_is_too_long(self, setup_mocks):
+        with pytest.raises(DIDTokenMalformed) as e:
+            Token.decode("a" * (MAX_DID_TOKEN_LENGTH + 1))
+
+        setup_mocks.urlsafe_b64decode.assert_not_called()
+        assert str(e.value) == (
+            "DID token is malformed. It is longer than 8192 characters."
+        )
+
+    def test_decode_raises_error_if_claim_is_not_an_object(self, setup_mocks):
+        setup_mocks.json_loads.side_effect = [
+            ["proof_in_str", "claim_in_str"],
+            ["claim"],
+        ]
+
+        with pytest.raises(DIDTokenMalformed) as e:
+            Token.decode(self.did_token)
+
+        assert str(e.value) == (
+            "DID token is malformed. Given claim should be a JSON serialized object."
+        )
+
     def test_decode_passes(self, setup_mocks):
         setup_mocks.json_loads.side_effect = [
-            ("proof_in_str", "claim_in_str"),
-            "claim",
+            ["proof_in_str", "claim_in_str"],
+            {"claim": "troll_goat"},
         ]
 
         with mock.patch.object(
             Token,
             "_check_required_fields",
         ) as mock_check_required_fields:
-            assert Token.decode(self.did_token) == ("proof_in_str", "claim")
+            assert Token.decode(self.did_token) == (
+                "proof_in_str",
+                {"claim": "troll_goat"},
+            )
 
         setup_mocks.urlsafe_b64decode.assert_called_once_with(self.did_token)
-        mock_check_required_fields.assert_called_once_with("claim")
+        mock_check_required_fields.assert_called_once_with({"claim": "troll_goat"})
         assert setup_mocks.json_loads.call_args_list == [
             mock.call(setup_mocks.urlsafe_b64decode.return_value.decode.return_value),
             mock.call("claim_in_str"),
@@ -161,9 +422,9 @@ class TestTokenValidate:
         [
             "proof",
             "claim",
+            "raw_claim",
             "decode",
             "recoverHash",
-            "defunct_hash_message",
             "get_public_address",
             "epoch_time_now",
             "apply_did_token_nbf_grace_period",
@@ -172,29 +433,29 @@ class TestTokenValidate:
 
     @pytest.fixture
     def setup_mocks(self):
-        proof = "proof"
+        proof = "0x" + "ab" * 65
         claim = {
             "ext": 8084,
             "nbf": 6666,
             "aud": "1234",
+            "iss": "did:ethr:{}".format(self.public_address),
         }
+        raw_claim = json.dumps(claim, separators=(",", ":"))
 
         with (
             mock.patch.object(
                 Token,
-                "decode",
-                return_value=(proof, claim),
+                "_decode",
+                return_value=(proof, claim, raw_claim),
             ) as decode,
             mock.patch(
-                "magic_admin.resources.token.w3.eth.account.recover_message",
-                return_value=self.public_address,
-            ) as recoverHash,
+                "magic_admin.resources.token.get_recovery_backend",
+                return_value=mock.Mock(
+                    recover=mock.Mock(return_value=self.public_address),
+                ),
+            ) as get_recovery_backend,
             mock.patch(
-                "magic_admin.resources.token.encode_defunct",
-            ) as defunct_hash_message,
-            mock.patch.object(
-                Token,
-                "get_public_address",
+                "magic_admin.resources.token.parse_public_address_from_issuer",
                 return_value=self.public_address,
             ) as get_public_address,
             mock.patch(
@@ -205,17 +466,16 @@ class TestTokenValidate:
                 "magic_admin.resources.token.apply_did_token_nbf_grace_period",
                 return_value=claim["nbf"],
             ) as apply_did_token_nbf_grace_period,
-            mock.patch(
-                "magic_admin.resources.token.magic_admin",
-                new=stub(client_id="1234"),
-            ),
         ):
+            self.token = Token()
+            self.token.setup_client_id("1234")
+
             yield self.mock_funcs(
                 proof,
                 claim,
+                raw_claim,
                 decode,
-                recoverHash,
-                defunct_hash_message,
+                get_recovery_backend.return_value.recover,
                 get_public_address,
                 epoch_time_now,
                 apply_did_token_nbf_grace_period,
@@ -226,18 +486,20 @@ class TestTokenValidate:
         setup_mocks,
         is_time_func_called=False,
         is_grace_period_func_called=False,
+        is_signer_recovered=True,
     ):
         setup_mocks.decode.assert_called_once_with(self.did_token)
-        setup_mocks.defunct_hash_message.assert_called_once_with(
-            text=json.dumps(setup_mocks.claim, separators=(",", ":")),
-        )
-        setup_mocks.recoverHash.assert_called_once_with(
-            setup_mocks.defunct_hash_message.return_value,
-            signature=setup_mocks.proof,
-        )
-        setup_mocks.get_public_address.assert_called_once_with(
-            self.did_token,
-        )
+
+        if is_signer_recovered:
+            setup_mocks.recoverHash.assert_called_once_with(
+                setup_mocks.raw_claim,
+                setup_mocks.proof,
+            )
+            setup_mocks.get_public_address.assert_called_once_with(
+                setup_mocks.claim["iss"],
+            )
+        else:
+            setup_mocks.recoverHash.assert_not_called()
 
         if is_time_func_called:
             setup_mocks.epoch_time_now.assert_called_once_with()
@@ -254,10 +516,14 @@ class TestTokenValidate:
     def test_validate_raises_error_if_signature_mismatch(self, setup_mocks):
         setup_mocks.get_public_address.return_value = "random_public_address"
 
-        with pytest.raises(DIDTokenInvalid) as e:
-            Token.validate(self.did_token)
+        with pytest.raises(DIDTokenSignatureMismatch) as e:
+            self.token.validate(self.did_token)
 
-        self._assert_validate_funcs_called(setup_mocks)
+        self._assert_validate_funcs_called(
+            setup_mocks,
+            is_time_func_called=True,
+            is_grace_period_func_called=True,
+        )
         assert (
             str(e.value) == 'Signature mismatch between "proof" and "claim". '
             "Please generate a new token with an intended issuer."
@@ -267,11 +533,12 @@ class TestTokenValidate:
         setup_mocks.epoch_time_now.return_value = setup_mocks.claim["ext"] + 1
 
         with pytest.raises(DIDTokenExpired) as e:
-            Token.validate(self.did_token)
+            self.token.validate(self.did_token)
 
         self._assert_validate_funcs_called(
             setup_mocks,
             is_time_func_called=True,
+            is_signer_recovered=False,
         )
         assert str(e.value) == "Given DID token has expired. Please generate a new one."
 
@@ -279,7 +546,7 @@ class TestTokenValidate:
         setup_mocks.claim["ext"] = None
 
         with pytest.raises(DIDTokenInvalid) as e:
-            Token.validate(self.did_token)
+            self.token.validate(self.did_token)
 
         assert (
             str(e.value) == 'Please check the "ext" field and regenerate a new'
@@ -290,12 +557,13 @@ class TestTokenValidate:
         setup_mocks.epoch_time_now.return_value = setup_mocks.claim["nbf"] - 1
 
         with pytest.raises(DIDTokenInvalid) as e:
-            Token.validate(self.did_token)
+            self.token.validate(self.did_token)
 
         self._assert_validate_funcs_called(
             setup_mocks,
             is_time_func_called=True,
             is_grace_period_func_called=True,
+            is_signer_recovered=False,
         )
         assert (
             str(e.value) == "Given DID token cannot be used at this time. "
@@ -303,11 +571,383 @@ class TestTokenValidate:
             "suitable value."
         )
 
+    @pytest.fixture
+    def verified_token_cache(self, setup_mocks):
+        self.token.setup_verified_token_cache(10)
+
+        with mock.patch(
+            "magic_admin.utils.cache.epoch_time_now",
+            new=setup_mocks.epoch_time_now,
+        ):
+            yield self.token.verified_token_cache
+
+    def test_validate_caches_recovered_address(
+        self,
+        setup_mocks,
+        verified_token_cache,
+    ):
+        self.token.validate(self.did_token)
+        self.token.validate(self.did_token)
+
+        setup_mocks.recoverHash.assert_called_once()
+        assert setup_mocks.epoch_time_now.call_count == 3
+
+    def test_validate_evicts_cache_entry_when_token_expires(
+        self,
+        setup_mocks,
+        verified_token_cache,
+    ):
+        self.token.validate(self.did_token)
+        setup_mocks.epoch_time_now.return_value = setup_mocks.claim["ext"] + 1
+
+        with pytest.raises(DIDTokenExpired):
+            self.token.validate(self.did_token)
+
+        # Expired tokens are rejected before the cache lookup.
+        setup_mocks.recoverHash.assert_called_once()
+
+    def test_validate_checks_claim_on_cache_hit(
+        self,
+        setup_mocks,
+        verified_token_cache,
+    ):
+        self.token.validate(self.did_token)
+        setup_mocks.claim["aud"] = "4321"
+
+        with pytest.raises(DIDTokenAudienceMismatch):
+            self.token.validate(self.did_token)
+
+        setup_mocks.recoverHash.assert_called_once()
+
+    def test_validate_ignores_cache_hit_for_another_address(
+        self,
+        setup_mocks,
+        verified_token_cache,
+    ):
+        verified_token_cache.set(
+            self.token._get_cache_key(self.did_token),
+            "0xtroll_goat",
+        )
+
+        self.token.validate(self.did_token)
+
+        setup_mocks.recoverHash.assert_called_once()
+
+    def test_validate_does_not_cache_signature_mismatch(
+        self,
+        setup_mocks,
+        verified_token_cache,
+    ):
+        setup_mocks.get_public_address.return_value = "random_public_address"
+
+        for _ in range(2):
+            with pytest.raises(DIDTokenInvalid):
+                self.token.validate(self.did_token)
+
+        assert len(verified_token_cache) == 0
+        assert setup_mocks.recoverHash.call_count == 2
+
     def test_validate_passes(self, setup_mocks):
-        Token.validate(self.did_token)
+        decoded_did_token = self.token.validate(self.did_token)
 
         self._assert_validate_funcs_called(
             setup_mocks,
             is_time_func_called=True,
             is_grace_period_func_called=True,
         )
+        assert decoded_did_token.proof == setup_mocks.proof
+        assert decoded_did_token.claim == setup_mocks.claim
+        assert decoded_did_token.recovered_address == self.public_address
+
+
+class TestTokenTryValidate:
+    proof = did_token_data.proof
+    claim = did_token_data.claim
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.token = Token()
+        self.token.setup_client_id(self.claim["aud"])
+
+        with mock.patch(
+            "magic_admin.resources.token.recover_signer",
+            wraps=recover_signer,
+        ) as self.recover_signer:
+            yield
+
+    def try_validate(self, proof=None, **claim_fields):
+        return self.token.try_validate(
+            DecodedDIDToken(
+                did_token_data.future_did_token,
+                proof or self.proof,
+                dict(self.claim, **claim_fields),
+            ),
+        )
+
+    def test_valid(self):
+        result = self.token.try_validate(did_token_data.future_did_token)
+
+        assert result.status == TokenValidationResult.VALID
+        assert result.reason is None
+        assert result.token.recovered_address == did_token_data.public_address
+        self.recover_signer.assert_called_once_with(
+            json.dumps(self.claim, separators=(",", ":")),
+            self.proof,
+        )
+
+    def test_recovers_signer_from_raw_claim(self):
+        raw_claim = json.dumps(self.claim, separators=(",", ":"))
+        # The same claim in another key order does not serialize back to the
+        # signed string.
+        reordered_claim = dict(reversed(list(self.claim.items())))
+        token = DecodedDIDToken(
+            did_token_data.future_did_token,
+            self.proof,
+            reordered_claim,
+            raw_claim=raw_claim,
+        )
+
+        assert self.token.try_validate(token).valid
+
+        # Without the raw claim, the claim is serialized again.
+        result = self.token.try_validate(
+            DecodedDIDToken(
+                did_token_data.future_did_token,
+                self.proof,
+                reordered_claim,
+            ),
+        )
+
+        assert result.status == TokenValidationResult.INVALID
+        assert result.reason.startswith("Signature mismatch")
+
+    @pytest.mark.parametrize(
+        "did_token",
+        [
+            "troll_goat",
+            "a" * (MAX_DID_TOKEN_LENGTH + 1),
+            # A JSON number instead of a [proof, claim] list.
+            "MTI=",
+            None,
+            123,
+        ],
+    )
+    def test_malformed(self, did_token):
+        result = self.token.try_validate(did_token)
+
+        assert result.status == TokenValidationResult.MALFORMED
+        assert result.reason.startswith("DID token is malformed.")
+        assert result.token is None
+
+    @pytest.mark.parametrize(
+        ("proof", "claim_fields", "expected"),
+        [
+            ("0x1234", {}, TokenValidationResult.MALFORMED),
+            (None, {"ext": "8084"}, TokenValidationResult.MALFORMED),
+            (None, {"aud": None}, TokenValidationResult.MALFORMED),
+            (None, {"ext": None}, TokenValidationResult.INVALID),
+            (None, {"ext": 8000}, TokenValidationResult.EXPIRED),
+            (None, {"nbf": 2**40}, TokenValidationResult.INVALID),
+            (None, {"aud": "troll_goat"}, TokenValidationResult.INVALID),
+        ],
+    )
+    def test_rejects_before_recovery(self, proof, claim_fields, expected):
+        result = self.try_validate(proof, **claim_fields)
+
+        assert result.status == expected
+        self.recover_signer.assert_not_called()
+
+    def test_signature_mismatch(self):
+        result = self.try_validate(iss="did:ethr:0x" + "0" * 40)
+
+        assert result.status == TokenValidationResult.INVALID
+        assert result.reason.startswith("Signature mismatch")
+        assert result.token.recovered_address is None
+
+    def test_unrecoverable_signature(self):
+        # A recovery id of 5.
+        result = self.try_validate(self.proof[:-2] + "05")
+
+        assert result.status == TokenValidationResult.INVALID
+
+    def test_does_not_hide_unexpected_errors(self):
+        self.recover_signer.side_effect = TypeError
+
+        with pytest.raises(TypeError):
+            self.try_validate()
+
+    def test_validate_raises_error_on_malformed_structure(self):
+        with pytest.raises(DIDTokenMalformed):
+            self.token.validate(
+                DecodedDIDToken(
+                    did_token_data.future_did_token,
+                    "0x1234",
+                    self.claim,
+                ),
+            )
+
+
+class TestTokenValidationResult:
+    did_token = "magic_token"
+
+    @pytest.mark.parametrize(
+        "error,status",
+        [
+            (DIDTokenMalformed("malformed"), TokenValidationResult.MALFORMED),
+            (DIDTokenExpired("expired"), TokenValidationResult.EXPIRED),
+            (DIDTokenInvalid("invalid"), TokenValidationResult.INVALID),
+        ],
+    )
+    def test_set_error(self, error, status):
+        result = TokenValidationResult(self.did_token)
+
+        result.set_error(error)
+
+        assert result.status == status
+        assert result.reason == str(error)
+        assert not result.valid
+
+    def test_valid(self):
+        assert TokenValidationResult(
+            self.did_token,
+            status=TokenValidationResult.VALID,
+        ).valid
+
+
+class TestTokenValidateMany:
+    public_address = "magic_address"
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.claims = {
+            "valid_token": {"ext": 8084, "nbf": 6666, "aud": "1234"},
+            "expired_token": {"ext": 8000, "nbf": 6666, "aud": "1234"},
+            "other_aud_token": {"ext": 8084, "nbf": 6666, "aud": "4321"},
+            "no_ext_token": {"ext": None, "nbf": 6666, "aud": "1234"},
+            "mismatch_token": {"ext": 8084, "nbf": 6666, "aud": "1234"},
+        }
+        for did_token, claim in self.claims.items():
+            claim["iss"] = "did:ethr:{}".format(did_token)
+
+        def decode(did_token):
+            if did_token not in self.claims:
+                raise DIDTokenMalformed("malformed")
+
+            claim = self.claims[did_token]
+
+            return "0x" + "ab" * 65, claim, json.dumps(claim)
+
+        def recover_signer_or_error(claim_and_proof):
+            raw_claim, _ = claim_and_proof
+            if json.loads(raw_claim)["iss"] == "did:ethr:mismatch_token":
+                return "random_public_address", None
+
+            return self.public_address, None
+
+        with (
+            mock.patch.object(Token, "_decode", side_effect=decode),
+            mock.patch(
+                "magic_admin.resources.token.parse_public_address_from_issuer",
+                return_value=self.public_address,
+            ),
+            mock.patch(
+                "magic_admin.resources.token._recover_signer_or_error",
+                side_effect=recover_signer_or_error,
+            ) as self.recover_signer_or_error,
+            mock.patch(
+                "magic_admin.resources.token.epoch_time_now",
+                return_value=8083,
+            ),
+            mock.patch(
+                "magic_admin.resources.token.apply_did_token_nbf_grace_period",
+                return_value=6666,
+            ),
+        ):
+            self.token = Token()
+            self.token.setup_client_id("1234")
+
+            yield
+
+    def test_validate_many_returns_results_in_input_order(self):
+        did_tokens = [
+            "valid_token",
+            "malformed_token",
+            "expired_token",
+            "other_aud_token",
+            "no_ext_token",
+            "mismatch_token",
+        ]
+
+        results = self.token.validate_many(did_tokens, workers=1)
+
+        assert [result.did_token for result in results] == did_tokens
+        assert [result.status for result in results] == [
+            TokenValidationResult.VALID,
+            TokenValidationResult.MALFORMED,
+            TokenValidationResult.EXPIRED,
+            TokenValidationResult.INVALID,
+            TokenValidationResult.INVALID,
+            TokenValidationResult.INVALID,
+        ]
+        assert results[0].reason is None
+        assert results[0].token.recovered_address == self.public_address
+        assert results[3].reason == (
+            '"aud" field does not match your client. Please check your secret key.'
+        )
+        assert results[5].reason == (
+            'Signature mismatch between "proof" and "claim". Please generate a '
+            "new token with an intended issuer."
+        )
+        # Only the tokens passing the claim checks reach the recovery.
+        assert self.recover_signer_or_error.call_count == 2
+
+    def test_validate_many_reports_recovery_errors(self):
+        self.recover_signer_or_error.side_effect = None
+        self.recover_signer_or_error.return_value = (None, "ValueError (bad)")
+
+        (result,) = self.token.validate_many(["valid_token"], workers=1)
+
+        assert result.status == TokenValidationResult.INVALID
+        assert result.reason == (
+            'Signature could not be recovered from the "proof". ValueError (bad)'
+        )
+
+    def test_validate_many_reports_issuer_errors_per_token(self):
+        with mock.patch(
+            "magic_admin.resources.token.parse_public_address_from_issuer",
+            side_effect=[DIDTokenMalformed("bad issuer"), self.public_address],
+        ):
+            results = self.token.validate_many(["valid_token"] * 2, workers=1)
+
+        assert [result.status for result in results] == [
+            TokenValidationResult.MALFORMED,
+            TokenValidationResult.VALID,
+        ]
+        assert results[0].reason == "bad issuer"
+
+    def test_validate_many_uses_process_pool(self):
+        did_tokens = ["valid_token"] * (MIN_SIGNATURES_PER_WORKER * 2)
+
+        with mock.patch(
+            "magic_admin.resources.token.ProcessPoolExecutor",
+        ) as mock_executor:
+            mock_executor.return_value.__enter__.return_value.map.return_value = [
+                (self.public_address, None),
+            ] * len(did_tokens)
+
+            results = self.token.validate_many(did_tokens, workers=8)
+
+        mock_executor.assert_called_once_with(max_workers=2)
+        assert all(result.valid for result in results)
+
+    def test_validate_many_skips_process_pool_for_few_tokens(self):
+        with mock.patch(
+            "magic_admin.resources.token.ProcessPoolExecutor",
+        ) as mock_executor:
+            results = self.token.validate_many(
+                ["valid_token"] * (MIN_SIGNATURES_PER_WORKER * 2 - 1),
+                workers=8,
+            )
+
+        mock_executor.assert_not_called()
+        assert all(result.valid for result in results)
@@ -1,11 +1,22 @@
+import json
 from unittest import mock
 from unittest.mock import sentinel
 
 import pytest
 from pretend import stub
 
+from magic_admin.error import APIConnectionError
+from magic_admin.error import APIError
+from magic_admin.error import DIDTokenMalformed
+from magic_admin.error import RateLimitingError
+from magic_admin.resources.user import BulkLogoutSummary
 from magic_admin.resources.user import User
+from magic_admin.resources.user import UserRequestResult
+from magic_admin.resources.user import _deserialize_metadata_entry
+from magic_admin.resources.user import _serialize_metadata_entry
 from magic_admin.resources.wallet import WalletType
+from magic_admin.response import MagicResponse
+from magic_admin.utils.cache_backend import InMemoryCacheBackend
 from testing.data.did_token import future_did_token
 from testing.data.did_token import public_address
 
@@ -196,6 +207,16 @@ class TestUser:
             },
         )
 
+    def test_logout_by_issuer_invalidates_metadata(self):
+        self.user.request = mock.Mock(side_effect=[sentinel.metadata, APIError()])
+        self.user.setup_metadata_cache(2)
+        self.user.get_metadata_by_issuer_and_wallet("did:ethr:0x1", WalletType.ETH)
+
+        with pytest.raises(APIError):
+            self.user.logout_by_issuer("did:ethr:0x1")
+
+        assert len(self.user.metadata_cache) == 0
+
     def test_logout_by_public_address(
         self,
         mock_construct_issuer_with_public_address,
@@ -230,3 +251,362 @@ class TestUser:
         self.user.logout_by_issuer.assert_called_once_with(
             self.user.Token.get_issuer.return_value,
         )
+
+    def test_get_metadata_many(self):
+        error = APIConnectionError(message="Connection error")
+
+        def get_metadata(issuer, wallet_type):
+            if issuer == "did:ethr:2":
+                raise error
+
+            return (issuer, wallet_type)
+
+        self.user.get_metadata_by_issuer_and_wallet = mock.Mock(
+            side_effect=get_metadata,
+        )
+
+        results = list(
+            self.user.get_metadata_many(
+                ["did:ethr:{}".format(i) for i in range(5)],
+                wallet_type=WalletType.ETH,
+                max_concurrency=2,
+            ),
+        )
+
+        assert [result.issuer for result in results] == [
+            "did:ethr:{}".format(i) for i in range(5)
+        ]
+        assert [result.ok for result in results] == [True, True, False, True, True]
+        assert results[0].response == ("did:ethr:0", WalletType.ETH)
+        assert results[2].response is None
+        assert results[2].error is error
+
+    def test_get_metadata_many_as_completed(self):
+        self.user.get_metadata_by_issuer_and_wallet = mock.Mock(
+            return_value=sentinel.response,
+        )
+
+        results = list(
+            self.user.get_metadata_many(
+                ["did:ethr:{}".format(i) for i in range(5)],
+                ordered=False,
+            ),
+        )
+
+        assert sorted(result.issuer for result in results) == [
+            "did:ethr:{}".format(i) for i in range(5)
+        ]
+        assert all(result.response == sentinel.response for result in results)
+        self.user.get_metadata_by_issuer_and_wallet.assert_called_with(
+            mock.ANY,
+            WalletType.NONE,
+        )
+
+    def test_get_metadata_many_raises_unexpected_error(self):
+        self.user.get_metadata_by_issuer_and_wallet = mock.Mock(
+            side_effect=ValueError,
+        )
+
+        with pytest.raises(ValueError):
+            list(self.user.get_metadata_many([sentinel.issuer]))
+
+
+class TestUserMetadataCache:
+    issuer = "did:ethr:0x1"
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.user = User()
+        self.user.request = mock.Mock(return_value=sentinel.metadata)
+
+    def test_metadata_cache_is_disabled_by_default(self):
+        self.user.get_metadata_by_issuer(self.issuer)
+        self.user.get_metadata_by_issuer(self.issuer)
+
+        assert self.user.request.call_count == 2
+        assert self.user.get_metadata_cache_stats() is None
+
+    def test_setup_metadata_cache(self):
+        self.user.setup_metadata_cache(8, ttl=1, stale_ttl=2)
+
+        assert self.user.metadata_cache.maxsize == 8
+        assert self.user.metadata_cache.ttl == 1
+        assert self.user.metadata_cache.stale_ttl == 2
+
+        self.user.setup_metadata_cache(0)
+
+        assert self.user.metadata_cache is None
+
+    def test_caches_metadata_per_issuer_and_wallet_type(self):
+        self.user.setup_metadata_cache(8)
+
+        assert self.user.get_metadata_by_issuer(self.issuer) == sentinel.metadata
+        self.user.get_metadata_by_issuer_and_wallet(self.issuer, WalletType.NONE)
+        self.user.get_metadata_by_issuer_and_wallet(self.issuer, "NONE")
+        self.user.get_metadata_by_issuer_and_wallet(self.issuer, WalletType.ETH)
+
+        assert self.user.request.call_args_list == [
+            mock.call(
+                "get",
+                User.v1_user_info,
+                params={"issuer": self.issuer, "wallet_type": WalletType.NONE},
+            ),
+            mock.call(
+                "get",
+                User.v1_user_info,
+                params={"issuer": self.issuer, "wallet_type": WalletType.ETH},
+            ),
+        ]
+        assert self.user.get_metadata_cache_stats() == {
+            "hits": 2,
+            "stale_hits": 0,
+            "misses": 2,
+            "refresh_errors": 0,
+            "size": 2,
+        }
+
+    def test_setup_metadata_cache_with_backend(self):
+        backend = InMemoryCacheBackend()
+        self.user._api_secret_key = "troll_goat"
+
+        self.user.setup_metadata_cache(0, backend=backend)
+
+        assert self.user.metadata_cache.store.backend == backend
+        assert self.user.metadata_cache.store.namespace.startswith(b"magic:metadata:")
+
+        other_user = User()
+        other_user._api_secret_key = "other_troll_goat"
+        other_user.setup_metadata_cache(0, backend=backend)
+
+        assert (
+            other_user.metadata_cache.store.namespace
+            != self.user.metadata_cache.store.namespace
+        )
+
+    def test_metadata_cache_skips_corrupt_backend_entries(self):
+        backend = InMemoryCacheBackend()
+        backend.get = mock.Mock(return_value=b"\x00")
+        response = MagicResponse(b"{}", {}, 200)
+        self.user.request.return_value = response
+        self.user._api_secret_key = "troll_goat"
+        self.user.setup_metadata_cache(8, backend=backend)
+
+        assert self.user.get_metadata_by_issuer(self.issuer) == response
+        assert self.user.metadata_cache.store.errors == 1
+
+    @pytest.mark.parametrize("content_size", [1, 1000])
+    def test_serialize_metadata_entry(self, content_size):
+        content = json.dumps({"data": {"email": "a" * content_size}}).encode()
+        response = MagicResponse(content, json.loads(content), 200)
+
+        data = _serialize_metadata_entry((response, 8084))
+        deserialized_response, fresh_until = _deserialize_metadata_entry(data)
+
+        if content_size > 1:
+            assert len(data) < len(content)
+
+        assert fresh_until == 8084
+        assert deserialized_response.content == content
+        assert deserialized_response.data == response.data
+        assert deserialized_response.status_code == 200
+
+    def test_serialize_metadata_entry_rounds_fresh_until_up(self):
+        response = MagicResponse(b"{}", {}, 200)
+
+        data = _serialize_metadata_entry((response, 8084.5))
+
+        assert _deserialize_metadata_entry(data)[1] == 8085
+
+    def test_invalidate_metadata(self):
+        self.user.setup_metadata_cache(8)
+        self.user.get_metadata_by_issuer(self.issuer)
+        self.user.get_metadata_by_issuer_and_wallet(self.issuer, WalletType.ETH)
+        self.user.get_metadata_by_issuer("did:ethr:0x2")
+
+        self.user.invalidate_metadata(self.issuer)
+
+        assert len(self.user.metadata_cache) == 1
+        self.user.get_metadata_by_issuer(self.issuer)
+        assert self.user.request.call_count == 4
+
+
+class TestUserLogoutMany:
+    issuers = ["did:ethr:{}".format(i) for i in range(7)]
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.user = User()
+        self.user.Token = mock.Mock()
+        self.user.logout_by_issuer = mock.Mock(return_value=sentinel.response)
+
+    def test_logout_many_by_issuer(self):
+        error = APIConnectionError(message="Connection error")
+        self.user.logout_by_issuer.side_effect = lambda issuer: (
+            self._raise(error) if issuer == "did:ethr:3" else sentinel.response
+        )
+
+        summary = self.user.logout_many_by_issuer(self.issuers, max_concurrency=3)
+
+        assert summary.processed == 7
+        assert summary.succeeded == 6
+        assert summary.failed == [
+            {"index": 3, "issuer": "did:ethr:3", "error": "Connection error"},
+        ]
+        assert (
+            sorted(call.args[0] for call in self.user.logout_by_issuer.call_args_list)
+            == self.issuers
+        )
+
+    @staticmethod
+    def _raise(error):
+        raise error
+
+    def test_logout_many_does_not_retry_rate_limited_logouts(self):
+        # The retry policy of the request client already retried them.
+        self.user.logout_by_issuer.side_effect = RateLimitingError(
+            message="Rate limited",
+        )
+
+        summary = self.user.logout_many_by_issuer(["did:ethr:0"])
+
+        assert summary.succeeded == 0
+        assert summary.failed[0]["error"] == "Rate limited"
+        self.user.logout_by_issuer.assert_called_once_with("did:ethr:0")
+
+    def test_logout_many_by_public_address(self):
+        summary = self.user.logout_many_by_public_address([public_address])
+
+        assert summary.succeeded == 1
+        self.user.logout_by_issuer.assert_called_once_with(
+            "did:ethr:{}".format(public_address),
+        )
+
+    def test_logout_many_by_token(self):
+        self.user.Token.get_issuer.side_effect = [
+            "did:ethr:0",
+            DIDTokenMalformed(message="Malformed"),
+        ]
+
+        summary = self.user.logout_many_by_token([future_did_token, "troll_goat"])
+
+        assert summary.succeeded == 1
+        assert summary.failed == [{"index": 1, "issuer": None, "error": "Malformed"}]
+        self.user.logout_by_issuer.assert_called_once_with("did:ethr:0")
+
+    def test_logout_many_saves_checkpoints(self, tmp_path):
+        checkpoint_path = str(tmp_path / "logout.json")
+
+        with mock.patch.object(
+            BulkLogoutSummary,
+            "save",
+            autospec=True,
+            side_effect=BulkLogoutSummary.save,
+        ) as mock_save:
+            summary = self.user.logout_many_by_issuer(
+                self.issuers,
+                checkpoint_path=checkpoint_path,
+                checkpoint_interval=3,
+            )
+
+        # Every 3 users and at the end.
+        assert mock_save.call_count == 3
+        assert BulkLogoutSummary.load(checkpoint_path).to_dict() == summary.to_dict()
+
+    def test_logout_many_resumes_from_checkpoint(self, tmp_path):
+        checkpoint_path = str(tmp_path / "logout.json")
+
+        def logout_by_issuer(issuer):
+            if issuer == "did:ethr:4":
+                raise KeyboardInterrupt
+
+            return sentinel.response
+
+        self.user.logout_by_issuer.side_effect = logout_by_issuer
+
+        with pytest.raises(KeyboardInterrupt):
+            self.user.logout_many_by_issuer(
+                self.issuers,
+                max_concurrency=1,
+                checkpoint_path=checkpoint_path,
+            )
+
+        assert BulkLogoutSummary.load(checkpoint_path).processed == 4
+
+        self.user.logout_by_issuer = mock.Mock(return_value=sentinel.response)
+
+        summary = self.user.logout_many_by_issuer(
+            iter(self.issuers),
+            checkpoint_path=checkpoint_path,
+        )
+
+        assert summary.processed == 7
+        assert summary.succeeded == 7
+        assert (
+            sorted(call.args[0] for call in self.user.logout_by_issuer.call_args_list)
+            == self.issuers[4:]
+        )
+
+
+class TestBulkLogoutSummary:
+    def test_load_missing_checkpoint(self, tmp_path):
+        summary = BulkLogoutSummary.load(str(tmp_path / "missing.json"))
+
+        assert summary.to_dict() == {"processed": 0, "succeeded": 0, "failed": []}
+
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / "logout.json")
+        summary = BulkLogoutSummary()
+        summary.add_result(0, UserRequestResult("did:ethr:0", response=sentinel.ok))
+        summary.add_result(
+            1,
+            UserRequestResult("did:ethr:1", error=APIConnectionError(message="Down")),
+        )
+
+        summary.save(path)
+
+        assert BulkLogoutSummary.load(path).to_dict() == {
+            "processed": 2,
+            "succeeded": 1,
+            "failed": [{"index": 1, "issuer": "did:ethr:1", "error": "Down"}],
+        }
+        assert repr(summary) == "BulkLogoutSummary(processed=2, succeeded=1, failed=1)"
+
+    def test_save_appends_only_new_failures(self, tmp_path):
+        path = str(tmp_path / "logout.json")
+        summary = BulkLogoutSummary()
+        summary.add_result(
+            0,
+            UserRequestResult("did:ethr:0", error=APIConnectionError(message="Down")),
+        )
+        summary.save(path)
+        summary.add_result(1, UserRequestResult("did:ethr:1", response=sentinel.ok))
+        summary.save(path)
+
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+
+        assert lines == [
+            {"index": 0, "issuer": "did:ethr:0", "error": "Down"},
+            {"processed": 1, "succeeded": 0},
+            {"processed": 2, "succeeded": 1},
+        ]
+
+    def test_load_drops_interrupted_save(self, tmp_path):
+        path = str(tmp_path / "logout.json")
+        summary = BulkLogoutSummary()
+        summary.add_result(0, UserRequestResult("did:ethr:0", response=sentinel.ok))
+        summary.save(path)
+
+        with open(path, "a") as f:
+            f.write('{"index": 1, "issuer": "did:ethr:1", "error": "Down"}\n')
+            f.write('{"processed": 2, "succ')
+
+        loaded = BulkLogoutSummary.load(path)
+        loaded.add_result(1, UserRequestResult("did:ethr:1", response=sentinel.ok))
+        loaded.save(path)
+
+        assert BulkLogoutSummary.load(path).to_dict() == {
+            "processed": 2,
+            "succeeded": 2,
+            "failed": [],
+        }
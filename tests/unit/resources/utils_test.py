@@ -0,0 +1,222 @@
+from unittest import mock
+
+import pytest
+
+from magic_admin.error import DIDTokenExpired
+from magic_admin.resources.utils import OWNERSHIP_CACHE_NEGATIVE_TTL
+from magic_admin.resources.utils import OWNERSHIP_CACHE_TTL
+from magic_admin.resources.utils import Utils
+from magic_admin.utils.contract import ERC1155
+from magic_admin.utils.contract import ERC721
+from testing.data.did_token import public_address
+
+
+class TestUtilsValidateTokenOwnership:
+    did_token = "troll_goat"
+    contract_address = "0x4B73C58370AEfcEf86A6021afCDe5673511376B2"
+    rpc_url = "http://localhost:8545"
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.utils = Utils()
+        self.token = mock.Mock()
+        self.token.validate.return_value.public_address = public_address
+        self.contract = mock.Mock()
+
+        with (
+            mock.patch.object(
+                Utils,
+                "Token",
+                self.token,
+                create=True,
+            ),
+            mock.patch(
+                "magic_admin.resources.utils.contract_pool",
+            ) as self.contract_pool,
+        ):
+            self.contract_pool.get_contract.return_value = self.contract
+            yield
+
+    def test_erc721_owner(self):
+        self.contract.functions.balanceOf.return_value.call.return_value = 1
+
+        assert self.utils.validate_token_ownership(
+            self.did_token,
+            self.contract_address,
+            ERC721,
+            self.rpc_url,
+        ) == {"valid": True, "error_code": "", "message": ""}
+
+        self.token.validate.assert_called_once_with(self.did_token)
+        self.contract_pool.get_contract.assert_called_once_with(
+            self.rpc_url,
+            self.contract_address,
+            ERC721,
+        )
+        self.contract.functions.balanceOf.assert_called_once_with(public_address)
+
+    def test_erc1155_not_owner(self):
+        self.contract.functions.balanceOf.return_value.call.return_value = 0
+
+        assert self.utils.validate_token_ownership(
+            self.did_token,
+            self.contract_address,
+            ERC1155,
+            self.rpc_url,
+            token_id="1",
+        ) == {
+            "valid": False,
+            "error_code": "NO_OWNERSHIP",
+            "message": "User does not own this token.",
+        }
+
+        self.contract_pool.get_contract.assert_called_once_with(
+            self.rpc_url,
+            self.contract_address,
+            ERC1155,
+        )
+        self.contract.functions.balanceOf.assert_called_once_with(public_address, 1)
+
+    def test_erc1155_requires_token_id(self):
+        with pytest.raises(ValueError):
+            self.utils.validate_token_ownership(
+                self.did_token,
+                self.contract_address,
+                ERC1155,
+                self.rpc_url,
+            )
+
+    def test_expired_did_token(self):
+        self.token.validate.side_effect = DIDTokenExpired(message="Expired")
+
+        assert self.utils.validate_token_ownership(
+            self.did_token,
+            self.contract_address,
+            ERC721,
+            self.rpc_url,
+        ) == {
+            "valid": False,
+            "error_code": "UNAUTHORIZED",
+            "message": "Invalid DID token: ERROR_DIDT_EXPIRED",
+        }
+        self.contract_pool.get_contract.assert_not_called()
+
+
+class TestUtilsOwnershipCache:
+    did_token = "troll_goat"
+    contract_address = "0x4B73C58370AEfcEf86A6021afCDe5673511376B2"
+    rpc_url = "http://localhost:8545"
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.utils = Utils()
+        self.utils.setup_ownership_cache(10)
+        self.token = mock.Mock()
+        self.token.validate.return_value.public_address = public_address
+        self.balance_of = mock.Mock()
+        self.balance_of.return_value.call.return_value = 1
+
+        with (
+            mock.patch.object(
+                Utils,
+                "Token",
+                self.token,
+                create=True,
+            ),
+            mock.patch(
+                "magic_admin.resources.utils.contract_pool",
+            ) as contract_pool,
+            mock.patch(
+                "magic_admin.resources.utils.epoch_time_now",
+                return_value=1000,
+            ),
+            mock.patch(
+                "magic_admin.utils.cache.epoch_time_now",
+                return_value=1000,
+            ) as self.cache_time_now,
+        ):
+            contract_pool.get_contract.return_value.functions.balanceOf = (
+                self.balance_of
+            )
+            yield
+
+    def _validate(self, contract_type=ERC1155, token_id="1"):
+        return self.utils.validate_token_ownership(
+            self.did_token,
+            self.contract_address,
+            contract_type,
+            self.rpc_url,
+            token_id=token_id,
+        )["valid"]
+
+    def test_setup_ownership_cache(self):
+        assert self.utils.ownership_cache.maxsize == 10
+        assert self.utils.ownership_cache_ttl == OWNERSHIP_CACHE_TTL
+        assert self.utils.ownership_cache_negative_ttl == OWNERSHIP_CACHE_NEGATIVE_TTL
+
+        self.utils.setup_ownership_cache(0)
+
+        assert self.utils.ownership_cache is None
+
+    def test_caches_ownership(self):
+        assert self._validate() is True
+        assert self._validate() is True
+
+        self.balance_of.assert_called_once_with(public_address, 1)
+        assert self.token.validate.call_count == 2
+
+    def test_does_not_share_entries_across_token_ids(self):
+        self._validate(token_id="1")
+        self._validate(token_id="2")
+
+        assert self.balance_of.call_count == 2
+
+    def test_erc721_entries_ignore_token_id(self):
+        self._validate(contract_type=ERC721, token_id=None)
+        self._validate(contract_type=ERC721, token_id="2")
+
+        self.balance_of.assert_called_once_with(public_address)
+
+    @pytest.mark.parametrize(
+        ("balance", "ttl"),
+        [(1, OWNERSHIP_CACHE_TTL), (0, OWNERSHIP_CACHE_NEGATIVE_TTL)],
+    )
+    def test_entries_expire_after_ttl(self, balance, ttl):
+        self.balance_of.return_value.call.return_value = balance
+
+        self._validate()
+        self.cache_time_now.return_value = 1000 + ttl
+        self._validate()
+
+        assert self.balance_of.call_count == 1
+
+        self.cache_time_now.return_value = 1000 + ttl + 1
+        self._validate()
+
+        assert self.balance_of.call_count == 2
+
+    def test_invalidate_ownership(self):
+        self.balance_of.return_value.call.return_value = 0
+        assert self._validate() is False
+
+        self.balance_of.return_value.call.return_value = 1
+        self.utils.invalidate_ownership(
+            public_address.lower(),
+            self.contract_address,
+            ERC1155,
+            self.rpc_url,
+            token_id=1,
+        )
+
+        assert self._validate() is True
+        assert self.balance_of.call_count == 2
+
+    def test_invalidate_ownership_without_cache(self):
+        self.utils.setup_ownership_cache(0)
+
+        self.utils.invalidate_ownership(
+            public_address,
+            self.contract_address,
+            ERC721,
+            self.rpc_url,
+        )
@@ -0,0 +1,164 @@
+import io
+from unittest import mock
+
+import pytest
+
+from magic_admin.error import CacheBackendError
+from magic_admin.utils.cache_backend import BackendCache
+from magic_admin.utils.cache_backend import InMemoryCacheBackend
+from magic_admin.utils.cache_backend import RedisCacheBackend
+
+
+class TestInMemoryCacheBackend:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.backend = InMemoryCacheBackend(2)
+
+    def test_set_get_and_delete(self):
+        self.backend.set(b"troll", b"goat")
+
+        assert self.backend.get(b"troll") == b"goat"
+        assert len(self.backend) == 1
+
+        self.backend.delete(b"troll")
+
+        assert self.backend.get(b"troll") is None
+
+    def test_set_with_ttl(self):
+        with mock.patch(
+            "magic_admin.utils.cache_backend.epoch_time_now",
+            return_value=8000,
+        ):
+            self.backend.set(b"troll", b"goat", ttl=10)
+
+        with mock.patch(
+            "magic_admin.utils.cache.epoch_time_now",
+            return_value=8011,
+        ):
+            assert self.backend.get(b"troll") is None
+
+
+class TestRedisCacheBackend:
+    def test_encode_command(self):
+        assert RedisCacheBackend._encode_command("SET", b"k\r\n", "v", "EX", 30) == (
+            b"*5\r\n$3\r\nSET\r\n$3\r\nk\r\n\r\n$1\r\nv\r\n$2\r\nEX\r\n$2\r\n30\r\n"
+        )
+
+    def test_encode_command_raises_error_on_unsupported_argument(self):
+        with pytest.raises(CacheBackendError):
+            RedisCacheBackend._encode_command("SET", "k", "v", "EX", 29.5)
+
+    def test_set_rounds_ttl_up(self):
+        backend = RedisCacheBackend()
+
+        with mock.patch.object(backend, "execute") as mock_execute:
+            backend.set(b"troll", b"goat", ttl=29.5)
+
+        mock_execute.assert_called_once_with("SET", b"troll", b"goat", "EX", 30)
+
+    @pytest.mark.parametrize(
+        ("reply", "expected"),
+        [
+            (b"+OK\r\n", b"OK"),
+            (b":3\r\n", 3),
+            (b"$4\r\ngo\r\n\r\n", b"go\r\n"),
+            (b"$-1\r\n", None),
+            (b"*2\r\n$1\r\na\r\n:1\r\n", [b"a", 1]),
+        ],
+    )
+    def test_read_reply(self, reply, expected):
+        assert RedisCacheBackend._read_reply(io.BytesIO(reply)) == expected
+
+    def test_read_reply_raises_error_reply(self):
+        with pytest.raises(CacheBackendError) as e:
+            RedisCacheBackend._read_reply(io.BytesIO(b"-ERR troll goat\r\n"))
+
+        assert str(e.value) == "ERR troll goat"
+
+    def test_read_reply_raises_error_if_connection_is_closed(self):
+        with pytest.raises(ConnectionError):
+            RedisCacheBackend._read_reply(io.BytesIO(b"$4\r\ngo"))
+
+    def test_execute_raises_error_if_server_is_unreachable(self):
+        backend = RedisCacheBackend(port=1, timeout=0.1)
+
+        with pytest.raises(CacheBackendError):
+            backend.get(b"troll")
+
+
+class TestBackendCache:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.backend = mock.Mock(get=mock.Mock(return_value=b"goat"))
+        self.cache = BackendCache(
+            self.backend,
+            b"ns:",
+            lambda value: value.encode("ascii"),
+            lambda data: data.decode("ascii"),
+        )
+
+        with mock.patch(
+            "magic_admin.utils.cache_backend.epoch_time_now",
+            return_value=8000,
+        ):
+            yield
+
+    def test_get(self):
+        assert self.cache.get("troll") == "goat"
+        self.backend.get.assert_called_once_with(b"ns:troll")
+
+    def test_get_returns_default_if_missing(self):
+        self.backend.get.return_value = None
+
+        assert self.cache.get(b"troll", "default") == "default"
+
+    def test_counts_hits_and_misses(self):
+        self.cache.get(b"troll")
+        self.backend.get.return_value = None
+        self.cache.get(b"troll")
+        self.backend.get.side_effect = CacheBackendError()
+        self.cache.get(b"troll")
+
+        assert (self.cache.hits, self.cache.misses) == (1, 2)
+
+    def test_set_converts_expiration_to_ttl(self):
+        self.cache.set(b"troll", "goat", expires_at=8030)
+        self.cache.set(b"troll", "goat")
+
+        assert self.backend.set.call_args_list == [
+            mock.call(b"ns:troll", b"goat", ttl=30),
+            mock.call(b"ns:troll", b"goat", ttl=None),
+        ]
+
+    def test_set_rounds_ttl_up(self):
+        self.cache.set(b"troll", "goat", expires_at=8029.5)
+
+        self.backend.set.assert_called_once_with(b"ns:troll", b"goat", ttl=30)
+
+    def test_set_skips_expired_values(self):
+        self.cache.set(b"troll", "goat", expires_at=8000)
+
+        self.backend.set.assert_not_called()
+
+    def test_delete(self):
+        self.cache.delete(b"troll")
+
+        self.backend.delete.assert_called_once_with(b"ns:troll")
+
+    def test_backend_errors_are_misses(self):
+        self.backend.get.side_effect = CacheBackendError()
+        self.backend.set.side_effect = CacheBackendError()
+        self.backend.delete.side_effect = CacheBackendError()
+
+        assert self.cache.get(b"troll") is None
+        self.cache.set(b"troll", "goat")
+        self.cache.delete(b"troll")
+
+        assert self.cache.errors == 3
+
+    def test_undeserializable_entries_are_misses(self):
+        self.backend.get.return_value = b"\xff"
+
+        assert self.cache.get(b"troll", "default") == "default"
+        self.backend.delete.assert_called_once_with(b"ns:troll")
+        assert (self.cache.hits, self.cache.misses, self.cache.errors) == (0, 1, 1)
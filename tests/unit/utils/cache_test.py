@@ -0,0 +1,189 @@
+from unittest import mock
+
+import pytest
+
+from magic_admin.utils.cache import LRUCache
+from magic_admin.utils.cache import StaleWhileRevalidateCache
+
+
+class TestLRUCache:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.cache = LRUCache(2)
+
+    def test_init_raises_error_if_maxsize_is_not_positive(self):
+        with pytest.raises(ValueError):
+            LRUCache(0)
+
+    def test_get_returns_default_if_missing(self):
+        assert self.cache.get("troll") is None
+        assert self.cache.get("troll", "goat") == "goat"
+
+    def test_set_and_get(self):
+        self.cache.set("troll", "goat")
+
+        assert self.cache.get("troll") == "goat"
+        assert len(self.cache) == 1
+
+    def test_counts_hits_and_misses(self):
+        self.cache.set("troll", "goat")
+        self.cache.get("troll")
+        self.cache.get("goat")
+        self.cache.get("sheep")
+
+        assert (self.cache.hits, self.cache.misses) == (1, 2)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+
+        assert self.cache.get("a") == 1
+        assert self.cache.get("b") is None
+        assert self.cache.get("c") == 3
+        assert len(self.cache) == 2
+
+    def test_evicts_expired_entry(self):
+        self.cache.set("troll", "goat", expires_at=8084)
+
+        with mock.patch(
+            "magic_admin.utils.cache.epoch_time_now",
+            return_value=8084,
+        ):
+            assert self.cache.get("troll") == "goat"
+
+        with mock.patch(
+            "magic_admin.utils.cache.epoch_time_now",
+            return_value=8085,
+        ):
+            assert self.cache.get("troll") is None
+
+        assert len(self.cache) == 0
+
+    def test_values(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2, expires_at=8084)
+
+        assert self.cache.values() == [1, 2]
+
+    def test_delete_and_clear(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+
+        self.cache.delete("a")
+        self.cache.delete("missing")
+        assert self.cache.get("a") is None
+
+        self.cache.clear()
+        assert len(self.cache) == 0
+
+
+class SyncThread:
+    """Runs the background refreshes right away."""
+
+    def __init__(self, target, args, daemon):
+        self.target = target
+        self.args = args
+
+    def start(self):
+        self.target(*self.args)
+
+
+class TestStaleWhileRevalidateCache:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.cache = StaleWhileRevalidateCache(2, ttl=10, stale_ttl=20)
+        self.fetch = mock.Mock(side_effect=["goat", "new_goat"])
+
+        with (
+            mock.patch(
+                "magic_admin.utils.cache.epoch_time_now",
+                return_value=8000,
+            ) as self.mock_epoch_time_now,
+            mock.patch("magic_admin.utils.cache.threading.Thread", new=SyncThread),
+        ):
+            yield
+
+    def test_fetches_on_miss_and_returns_fresh_hits(self):
+        assert self.cache.get_or_fetch("troll", self.fetch) == "goat"
+
+        self.mock_epoch_time_now.return_value = 8010
+
+        assert self.cache.get_or_fetch("troll", self.fetch) == "goat"
+        self.fetch.assert_called_once_with()
+        assert self.cache.get_stats() == {
+            "hits": 1,
+            "stale_hits": 0,
+            "misses": 1,
+            "refresh_errors": 0,
+            "size": 1,
+        }
+
+    def test_returns_stale_value_and_refreshes_it(self):
+        self.cache.get_or_fetch("troll", self.fetch)
+        self.mock_epoch_time_now.return_value = 8011
+
+        assert self.cache.get_or_fetch("troll", self.fetch) == "goat"
+        assert self.cache.get_or_fetch("troll", self.fetch) == "new_goat"
+        assert self.fetch.call_count == 2
+        assert self.cache.get_stats()["stale_hits"] == 1
+        assert self.cache.get_stats()["hits"] == 1
+
+    def test_refetches_after_stale_ttl(self):
+        self.cache.get_or_fetch("troll", self.fetch)
+        self.mock_epoch_time_now.return_value = 8031
+
+        assert self.cache.get_or_fetch("troll", self.fetch) == "new_goat"
+        assert self.cache.get_stats()["misses"] == 2
+
+    def test_keeps_stale_value_when_refresh_fails(self):
+        self.fetch.side_effect = ["goat", ValueError()]
+        self.cache.get_or_fetch("troll", self.fetch)
+        self.mock_epoch_time_now.return_value = 8011
+
+        assert self.cache.get_or_fetch("troll", self.fetch) == "goat"
+        assert self.cache.get_stats()["refresh_errors"] == 1
+        assert self.cache._refreshing == set()
+
+    def test_refreshes_once_at_a_time(self):
+        self.cache.get_or_fetch("troll", self.fetch)
+        self.mock_epoch_time_now.return_value = 8011
+        self.cache._refreshing.add("troll")
+
+        assert self.cache.get_or_fetch("troll", self.fetch) == "goat"
+        self.fetch.assert_called_once_with()
+
+    def test_refresh_does_not_restore_deleted_key(self):
+        def fetch():
+            self.cache.delete("troll")
+
+            return "new_goat"
+
+        self.cache.set("troll", "goat")
+        self.mock_epoch_time_now.return_value = 8011
+
+        assert self.cache.get_or_fetch("troll", fetch) == "goat"
+        assert len(self.cache) == 0
+
+    def test_miss_does_not_restore_deleted_key(self):
+        def fetch():
+            self.cache.delete("troll")
+
+            return "goat"
+
+        assert self.cache.get_or_fetch("troll", fetch) == "goat"
+        assert len(self.cache) == 0
+        assert self.cache._fetching == {}
+
+        assert self.cache.get_or_fetch("troll", self.fetch) == "goat"
+        assert len(self.cache) == 1
+
+    def test_does_not_cache_failed_fetches(self):
+        self.fetch.side_effect = ValueError()
+
+        with pytest.raises(ValueError):
+            self.cache.get_or_fetch("troll", self.fetch)
+
+        assert len(self.cache) == 0
+        assert self.cache._fetching == {}
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from magic_admin.utils.concurrency import map_concurrently
+from magic_admin.utils.concurrency import map_concurrently_async
+
+
+class InFlightCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __enter__(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def __exit__(self, *args):
+        with self._lock:
+            self.in_flight -= 1
+
+
+class TestMapConcurrently:
+    def test_yields_results_in_order(self):
+        def func(item):
+            # The first items are the slowest.
+            time.sleep((5 - item) * 0.005)
+            return item * 2
+
+        assert list(map_concurrently(func, range(5), 5)) == [0, 2, 4, 6, 8]
+
+    def test_yields_results_as_completed(self):
+        def func(item):
+            time.sleep((5 - item) * 0.01)
+            return item
+
+        results = list(map_concurrently(func, range(5), 5, ordered=False))
+
+        assert sorted(results) == [0, 1, 2, 3, 4]
+        assert results[0] == 4
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_limits_concurrency(self, ordered):
+        counter = InFlightCounter()
+
+        def func(item):
+            with counter:
+                time.sleep(0.005)
+                return item
+
+        assert sorted(map_concurrently(func, range(20), 3, ordered=ordered)) == list(
+            range(20),
+        )
+        assert counter.max_in_flight == 3
+
+    def test_consumes_items_lazily(self):
+        consumed = []
+
+        def items():
+            for item in range(1000):
+                consumed.append(item)
+                yield item
+
+        results = map_concurrently(lambda item: item, items(), 2)
+
+        assert next(results) == 0
+        assert len(consumed) <= 5
+
+        results.close()
+
+    def test_raises_error_of_a_call(self):
+        def func(item):
+            raise ValueError(item)
+
+        with pytest.raises(ValueError):
+            list(map_concurrently(func, range(3), 2))
+
+
+class TestMapConcurrentlyAsync:
+    @staticmethod
+    def _collect(results):
+        async def collect():
+            return [result async for result in results]
+
+        return asyncio.run(collect())
+
+    def test_yields_results_in_order(self):
+        async def func(item):
+            await asyncio.sleep((5 - item) * 0.005)
+            return item * 2
+
+        assert self._collect(map_concurrently_async(func, range(5), 5)) == [
+            0,
+            2,
+            4,
+            6,
+            8,
+        ]
+
+    def test_yields_results_as_completed(self):
+        async def func(item):
+            await asyncio.sleep((5 - item) * 0.01)
+            return item
+
+        results = self._collect(
+            map_concurrently_async(func, range(5), 5, ordered=False),
+        )
+
+        assert sorted(results) == [0, 1, 2, 3, 4]
+        assert results[0] == 4
+
+    @pytest.mark.parametrize("ordered", [True, False])
+    def test_limits_concurrency(self, ordered):
+        counter = InFlightCounter()
+
+        async def func(item):
+            with counter:
+                await asyncio.sleep(0.005)
+                return item
+
+        assert sorted(
+            self._collect(
+                map_concurrently_async(func, range(20), 3, ordered=ordered),
+            ),
+        ) == list(range(20))
+        assert counter.max_in_flight == 3
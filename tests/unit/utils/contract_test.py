@@ -0,0 +1,101 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from magic_admin.utils.contract import ERC1155
+from magic_admin.utils.contract import ERC721
+from magic_admin.utils.contract import AsyncContractPool
+from magic_admin.utils.contract import ContractPool
+
+
+class TestContractPool:
+    rpc_url = "http://localhost:8545"
+    contract_address = "0x4B73C58370AEfcEf86A6021afCDe5673511376B2"
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.pool = ContractPool(maxsize=2)
+
+    def test_get_web3_is_pooled_per_rpc_url(self):
+        w3 = self.pool.get_web3(self.rpc_url)
+
+        assert w3.provider.endpoint_uri == self.rpc_url
+        assert w3.provider.cache_allowed_requests
+        assert self.pool.get_web3(self.rpc_url) is w3
+        assert self.pool.get_web3("http://localhost:8546") is not w3
+
+    def test_get_web3_evicts_least_recently_used(self):
+        w3 = self.pool.get_web3(self.rpc_url)
+        self.pool.get_web3("http://localhost:8546")
+        self.pool.get_web3("http://localhost:8547")
+
+        assert self.pool.get_web3(self.rpc_url) is not w3
+
+    @pytest.mark.parametrize(
+        ("contract_type", "balance_of_inputs"),
+        [(ERC721, 1), (ERC1155, 2)],
+    )
+    def test_get_contract(self, contract_type, balance_of_inputs):
+        contract = self.pool.get_contract(
+            self.rpc_url,
+            self.contract_address,
+            contract_type,
+        )
+
+        assert contract.address == self.contract_address
+        assert contract.w3 is self.pool.get_web3(self.rpc_url)
+        assert len(contract.functions.balanceOf.abi["inputs"]) == balance_of_inputs
+
+    def test_get_contract_is_pooled(self):
+        contract = self.pool.get_contract(self.rpc_url, self.contract_address, ERC721)
+
+        assert (
+            self.pool.get_contract(self.rpc_url, self.contract_address, ERC721)
+            is contract
+        )
+        assert (
+            self.pool.get_contract(self.rpc_url, self.contract_address, ERC1155)
+            is not contract
+        )
+
+    def test_get_contract_raises_error_if_contract_type_is_unknown(self):
+        with pytest.raises(KeyError):
+            self.pool.get_contract(self.rpc_url, self.contract_address, "ERC20")
+
+    def test_clear(self):
+        w3 = self.pool.get_web3(self.rpc_url)
+        contract = self.pool.get_contract(self.rpc_url, self.contract_address, ERC721)
+
+        self.pool.clear()
+
+        assert self.pool.get_web3(self.rpc_url) is not w3
+        assert (
+            self.pool.get_contract(self.rpc_url, self.contract_address, ERC721)
+            is not contract
+        )
+
+
+class TestAsyncContractPool:
+    rpc_url = "http://localhost:8545"
+
+    def test_get_web3(self):
+        from web3 import AsyncWeb3
+
+        w3 = AsyncContractPool().get_web3(self.rpc_url)
+
+        assert isinstance(w3, AsyncWeb3)
+        assert w3.provider.endpoint_uri == self.rpc_url
+        assert w3.provider.cache_allowed_requests
+
+    def test_disconnect(self):
+        pool = AsyncContractPool()
+        w3 = pool.get_web3(self.rpc_url)
+
+        with mock.patch.object(
+            w3.provider,
+            "disconnect",
+        ) as mock_disconnect:
+            asyncio.run(pool.disconnect())
+
+        mock_disconnect.assert_called_once_with()
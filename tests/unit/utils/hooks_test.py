@@ -0,0 +1,92 @@
+from unittest import mock
+
+import pytest
+
+from magic_admin.error import DIDTokenAudienceMismatch
+from magic_admin.error import DIDTokenExpired
+from magic_admin.error import DIDTokenInvalid
+from magic_admin.error import DIDTokenMalformed
+from magic_admin.error import DIDTokenSignatureMismatch
+from magic_admin.utils.hooks import REQUEST_EVENT
+from magic_admin.utils.hooks import TOKEN_VALIDATION_EVENT
+from magic_admin.utils.hooks import Hooks
+from magic_admin.utils.hooks import RequestEvent
+from magic_admin.utils.hooks import TokenValidationEvent
+
+
+class TestHooks:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.hooks = Hooks()
+        self.event = RequestEvent("GET", "/v1/admin/user", 200, 0, 0, 0.1, 0.2)
+
+    def test_register_and_emit(self):
+        callback = mock.Mock()
+
+        assert self.hooks.register(REQUEST_EVENT, callback) is callback
+        assert self.hooks.has_callbacks(REQUEST_EVENT)
+        assert not self.hooks.has_callbacks(TOKEN_VALIDATION_EVENT)
+
+        self.hooks.emit(REQUEST_EVENT, self.event)
+
+        callback.assert_called_once_with(self.event)
+
+    def test_register_raises_error_on_unknown_event(self):
+        with pytest.raises(ValueError):
+            self.hooks.register("troll_goat", mock.Mock())
+
+    def test_unregister(self):
+        callback = self.hooks.register(REQUEST_EVENT, mock.Mock())
+
+        self.hooks.unregister(REQUEST_EVENT, callback)
+        self.hooks.emit(REQUEST_EVENT, self.event)
+
+        assert not self.hooks.has_callbacks(REQUEST_EVENT)
+        callback.assert_not_called()
+
+    def test_emit_warns_on_callback_error(self):
+        self.hooks.register(REQUEST_EVENT, mock.Mock(side_effect=ValueError("goat")))
+        callback = self.hooks.register(REQUEST_EVENT, mock.Mock())
+
+        with pytest.warns(RuntimeWarning, match="ValueError: goat"):
+            self.hooks.emit(REQUEST_EVENT, self.event)
+
+        # The next callbacks are still called.
+        callback.assert_called_once_with(self.event)
+
+    def test_event_repr(self):
+        assert repr(self.event) == (
+            "RequestEvent(method='GET', path='/v1/admin/user', status_code=200, "
+            "total_time=0.200000)"
+        )
+
+    def test_token_validation_event_repr(self):
+        event = TokenValidationEvent(
+            0.1,
+            0.2,
+            0.3,
+            0.6,
+            False,
+            status="invalid",
+            outcome="aud_mismatch",
+        )
+
+        assert repr(event) == (
+            "TokenValidationEvent(total_time=0.600000, cached=False, "
+            "outcome='aud_mismatch', error=None)"
+        )
+
+
+@pytest.mark.parametrize(
+    ("error_class", "expected"),
+    [
+        (None, TokenValidationEvent.VALID),
+        (DIDTokenMalformed, TokenValidationEvent.MALFORMED),
+        (DIDTokenExpired, TokenValidationEvent.EXPIRED),
+        (DIDTokenSignatureMismatch, TokenValidationEvent.SIGNATURE_MISMATCH),
+        (DIDTokenAudienceMismatch, TokenValidationEvent.AUD_MISMATCH),
+        (DIDTokenInvalid, TokenValidationEvent.INVALID),
+    ],
+)
+def test_get_outcome(error_class, expected):
+    assert TokenValidationEvent.get_outcome(error_class) == expected
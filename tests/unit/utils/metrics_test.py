@@ -0,0 +1,286 @@
+from unittest import mock
+
+import pytest
+
+from magic_admin.async_magic import AsyncMagic
+from magic_admin.error import APIConnectionError
+from magic_admin.error import DIDTokenAudienceMismatch
+from magic_admin.error import DIDTokenMalformed
+from magic_admin.error import DIDTokenSignatureMismatch
+from magic_admin.error import MagicError
+from magic_admin.error import RateLimitingError
+from magic_admin.magic import Magic
+from magic_admin.response import MagicResponse
+from magic_admin.utils.hooks import REQUEST_EVENT
+from magic_admin.utils.hooks import TOKEN_VALIDATION_EVENT
+from magic_admin.utils.hooks import RequestEvent
+from magic_admin.utils.hooks import TokenValidationEvent
+from magic_admin.utils.metrics import MagicMetrics
+from magic_admin.utils.metrics import MetricsRegistry
+from testing.data.did_token import claim
+from testing.data.did_token import future_did_token
+from testing.data.did_token import sign_did_token
+
+
+class TestMetricsRegistry:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.registry = MetricsRegistry()
+
+    def test_render_counter(self):
+        counter = self.registry.counter(
+            "troll_total",
+            "Trolls.\nWith a \\ backslash.",
+            ("goat",),
+        )
+        counter.inc(goat='say "hi"\n')
+        counter.inc(2, goat="a")
+
+        assert counter.get(goat="a") == 2
+        assert self.registry.render() == (
+            "# HELP troll_total Trolls.\\nWith a \\\\ backslash.\n"
+            "# TYPE troll_total counter\n"
+            'troll_total{goat="a"} 2\n'
+            'troll_total{goat="say \\"hi\\"\\n"} 1\n'
+        )
+
+    def test_render_histogram(self):
+        histogram = self.registry.histogram("troll_seconds", "Trolls.", buckets=(1, 2))
+        histogram.observe(0.5)
+        histogram.observe(1)
+        histogram.observe(3)
+
+        assert histogram.get() == (3, 4.5)
+        assert self.registry.render() == (
+            "# HELP troll_seconds Trolls.\n"
+            "# TYPE troll_seconds histogram\n"
+            'troll_seconds_bucket{le="1.0"} 2\n'
+            'troll_seconds_bucket{le="2.0"} 2\n'
+            'troll_seconds_bucket{le="+Inf"} 3\n'
+            "troll_seconds_sum 4.5\n"
+            "troll_seconds_count 3\n"
+        )
+
+    def test_render_collectors(self):
+        gauge = mock.Mock(
+            type="gauge",
+            documentation="Goats.",
+            samples=mock.Mock(return_value=[("", [], 0.5)]),
+        )
+        gauge.name = "goat_ratio"
+        self.registry.add_collector(lambda: [gauge])
+
+        assert self.registry.render() == (
+            "# HELP goat_ratio Goats.\n# TYPE goat_ratio gauge\ngoat_ratio 0.5\n"
+        )
+
+    def test_register_raises_error_on_duplicate_name(self):
+        self.registry.counter("troll_total", "Trolls.")
+
+        with pytest.raises(ValueError):
+            self.registry.gauge("troll_total", "Trolls.")
+
+    def test_raises_error_on_wrong_labels(self):
+        counter = self.registry.counter("troll_total", "Trolls.", ("goat",))
+
+        with pytest.raises(ValueError):
+            counter.inc(sheep="a")
+
+        with pytest.raises(ValueError):
+            counter.inc(-1, goat="a")
+
+
+class TestMagicMetrics:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.magic = Magic(
+            api_secret_key="troll_goat",
+            client_id=claim["aud"],
+            verified_token_cache_size=10,
+            metadata_cache_size=10,
+        )
+        self.metrics = MagicMetrics()
+        self.metrics.instrument(self.magic)
+
+    def test_records_requests(self):
+        self.magic.hooks.emit(
+            REQUEST_EVENT,
+            RequestEvent("GET", "/v1/admin/user", 200, 0, 0, 0.01, 0.02),
+        )
+        self.magic.hooks.emit(
+            REQUEST_EVENT,
+            RequestEvent(
+                "GET",
+                "/v1/admin/user",
+                429,
+                3,
+                0,
+                0.01,
+                0.3,
+                error=RateLimitingError(),
+            ),
+        )
+        self.magic.hooks.emit(
+            REQUEST_EVENT,
+            RequestEvent(
+                "POST",
+                "/v1/admin/user/logout",
+                None,
+                None,
+                0,
+                None,
+                5,
+                error=APIConnectionError(),
+            ),
+        )
+
+        assert self.metrics.request_duration.get(
+            method="GET",
+            path="/v1/admin/user",
+        ) == (2, pytest.approx(0.32))
+        assert (
+            self.metrics.request_errors.get(
+                method="GET",
+                path="/v1/admin/user",
+                error="RateLimitingError",
+            )
+            == 1
+        )
+        assert (
+            'magic_api_request_errors_total{method="POST",'
+            'path="/v1/admin/user/logout",error="APIConnectionError"} 1'
+        ) in self.metrics.render()
+
+    def test_records_token_validations_and_cache_hits(self):
+        self.magic.Token.validate(future_did_token)
+        self.magic.Token.validate(future_did_token)
+
+        with pytest.raises(DIDTokenMalformed):
+            self.magic.Token.validate("troll_goat")
+
+        text = self.metrics.render()
+
+        assert (
+            self.metrics.token_validations.get(outcome=TokenValidationEvent.VALID) == 2
+        )
+        assert (
+            self.metrics.token_validations.get(outcome=TokenValidationEvent.MALFORMED)
+            == 1
+        )
+        assert self.metrics.token_validation_duration.get()[0] == 3
+        assert 'magic_cache_hits_total{cache="verified_token"} 1' in text
+        assert 'magic_cache_misses_total{cache="verified_token"} 1' in text
+        assert 'magic_cache_hit_ratio{cache="verified_token"} 0.5' in text
+        # No lookups yet.
+        assert 'magic_cache_hits_total{cache="metadata"} 0' in text
+        assert 'magic_cache_hit_ratio{cache="metadata"}' not in text
+
+    def test_records_aud_mismatch(self):
+        self.magic.Token.setup_client_id("another_client_id")
+
+        with pytest.raises(DIDTokenAudienceMismatch):
+            self.magic.Token.validate(future_did_token)
+
+        assert (
+            self.metrics.token_validations.get(
+                outcome=TokenValidationEvent.AUD_MISMATCH,
+            )
+            == 1
+        )
+
+    def test_records_signature_mismatch_of_every_method(self):
+        did_token = sign_did_token(claim)
+
+        self.magic.Token.try_validate(did_token)
+        self.magic.Token.validate_many([did_token], workers=1)
+
+        with pytest.raises(DIDTokenSignatureMismatch):
+            self.magic.Token.validate(did_token)
+
+        assert (
+            self.metrics.token_validations.get(
+                outcome=TokenValidationEvent.SIGNATURE_MISMATCH,
+            )
+            == 3
+        )
+
+    def test_records_try_validate(self):
+        self.magic.Token.try_validate(future_did_token)
+        self.magic.Token.try_validate("troll_goat")
+
+        assert (
+            self.metrics.token_validations.get(outcome=TokenValidationEvent.VALID) == 1
+        )
+        assert (
+            self.metrics.token_validations.get(
+                outcome=TokenValidationEvent.MALFORMED,
+            )
+            == 1
+        )
+
+    def test_records_validate_many(self):
+        self.magic.Token.validate_many(
+            [future_did_token, future_did_token, "troll_goat"],
+            workers=1,
+        )
+
+        assert (
+            self.metrics.token_validations.get(outcome=TokenValidationEvent.VALID) == 2
+        )
+        assert (
+            self.metrics.token_validations.get(
+                outcome=TokenValidationEvent.MALFORMED,
+            )
+            == 1
+        )
+        assert self.metrics.token_validation_duration.get()[0] == 3
+
+    def test_does_not_record_outcome_of_incomplete_validation(self):
+        self.magic.hooks.emit(
+            TOKEN_VALIDATION_EVENT,
+            TokenValidationEvent(None, None, None, 0.001, False, error=MagicError()),
+        )
+
+        assert "magic_token_validations_total{" not in self.metrics.render()
+        assert self.metrics.token_validation_duration.get()[0] == 1
+
+    def test_records_async_magic_token_validations(self):
+        magic = AsyncMagic(api_secret_key="troll_goat", client_id=claim["aud"])
+        self.metrics.instrument(magic)
+
+        magic.Token.validate(future_did_token)
+        magic.Token.try_validate("troll_goat")
+
+        assert (
+            self.metrics.token_validations.get(outcome=TokenValidationEvent.VALID) == 1
+        )
+        assert (
+            self.metrics.token_validations.get(
+                outcome=TokenValidationEvent.MALFORMED,
+            )
+            == 1
+        )
+
+    def test_instrument_tenants(self):
+        tenant = self.magic.for_tenant("another_troll_goat")
+        self.metrics.instrument(tenant)
+
+        for magic in (self.magic, tenant):
+            with mock.patch.object(
+                magic._request_client,
+                "request",
+                return_value=MagicResponse(b"{}", {"data": {}}, 200),
+            ):
+                magic.User.get_metadata_by_issuer("did:ethr:0x1")
+                magic.User.get_metadata_by_issuer("did:ethr:0x1")
+
+        self.magic.Token.validate(future_did_token)
+
+        # The hooks of the tenant are those of its parent, recorded once.
+        assert (
+            self.metrics.token_validations.get(outcome=TokenValidationEvent.VALID) == 1
+        )
+        assert self.metrics._get_cache_counts() == {
+            "verified_token": (0, 1),
+            "metadata": (2, 2),
+        }
@@ -0,0 +1,157 @@
+import asyncio
+from email.utils import formatdate
+from unittest import mock
+
+import pytest
+
+from magic_admin.utils.rate_limit import DEFAULT_RETRY_AFTER
+from magic_admin.utils.rate_limit import RateLimiter
+from magic_admin.utils.rate_limit import parse_retry_after
+
+
+class TestParseRetryAfter:
+    @pytest.mark.parametrize(
+        ("retry_after", "expected"),
+        [
+            (None, None),
+            ("2", 2.0),
+            ("0.5", 0.5),
+            ("-1", 0.0),
+            ("troll_goat", None),
+        ],
+    )
+    def test_parse_retry_after(self, retry_after, expected):
+        assert parse_retry_after(retry_after) == expected
+
+    def test_parse_retry_after_http_date(self):
+        with mock.patch(
+            "magic_admin.utils.rate_limit.time.time",
+            return_value=1000000000,
+        ):
+            assert parse_retry_after(formatdate(1000000030, usegmt=True)) == 30.0
+            assert parse_retry_after(formatdate(999999970, usegmt=True)) == 0.0
+
+
+class TestRateLimiter:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.now = 100.0
+
+        with (
+            mock.patch(
+                "magic_admin.utils.rate_limit.time.monotonic",
+                side_effect=lambda: self.now,
+            ),
+            mock.patch(
+                "magic_admin.utils.rate_limit.time.sleep",
+                side_effect=self._sleep,
+            ) as self.mock_sleep,
+        ):
+            self.rate_limiter = RateLimiter(10, burst=2)
+            yield
+
+    def _sleep(self, seconds):
+        self.now += seconds
+
+    def test_init_raises_error_if_rate_is_not_positive(self):
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+
+    def test_default_burst_is_one_second_of_requests(self):
+        assert RateLimiter(10).burst == 10
+        assert RateLimiter(0.5).burst == 1
+
+    def test_reserve_allows_burst_then_paces(self):
+        assert self.rate_limiter.reserve() == 0
+        assert self.rate_limiter.reserve() == 0
+        assert self.rate_limiter.reserve() == pytest.approx(0.1)
+        assert self.rate_limiter.reserve() == pytest.approx(0.2)
+
+    def test_reserve_refills_tokens_up_to_burst(self):
+        self.rate_limiter.reserve()
+        self.rate_limiter.reserve()
+        self.now += 10
+
+        assert self.rate_limiter.reserve() == 0
+        assert self.rate_limiter.reserve() == 0
+        assert self.rate_limiter.reserve() == pytest.approx(0.1)
+
+    def test_acquire_waits(self):
+        for _ in range(3):
+            self.rate_limiter.acquire()
+
+        self.mock_sleep.assert_called_once_with(pytest.approx(0.1))
+
+    def test_on_rate_limited_pauses_and_slows_down(self):
+        self.rate_limiter.on_rate_limited(3)
+
+        assert self.rate_limiter.rate == 5
+        assert self.rate_limiter.reserve() == pytest.approx(3.2)
+
+    def test_on_rate_limited_without_retry_after(self):
+        self.rate_limiter.on_rate_limited()
+
+        assert self.rate_limiter.reserve() == pytest.approx(
+            DEFAULT_RETRY_AFTER + 0.2,
+        )
+
+    def test_on_response(self):
+        with (
+            mock.patch.object(
+                self.rate_limiter,
+                "on_rate_limited",
+            ) as mock_on_rate_limited,
+            mock.patch.object(self.rate_limiter, "on_success") as mock_on_success,
+        ):
+            self.rate_limiter.on_response(429, 7.0)
+            self.rate_limiter.on_response(503)
+
+        mock_on_rate_limited.assert_called_once_with(7.0)
+        mock_on_success.assert_called_once_with()
+
+    def test_rate_does_not_drop_below_minimum(self):
+        for _ in range(10):
+            self.rate_limiter.on_rate_limited(0)
+
+        assert self.rate_limiter.rate == pytest.approx(0.5)
+
+    def test_on_success_grows_rate_back(self):
+        self.rate_limiter.on_rate_limited(0)
+
+        for _ in range(9):
+            self.rate_limiter.on_success()
+
+        assert self.rate_limiter.rate == pytest.approx(9.5)
+
+        self.rate_limiter.on_success()
+        self.rate_limiter.on_success()
+
+        assert self.rate_limiter.rate == 10
+
+    def test_acquire_waits_for_pause_started_while_waiting(self):
+        self.rate_limiter.reserve()
+        self.rate_limiter.reserve()
+
+        def sleep(seconds):
+            self._sleep(seconds)
+            # A 429 is received while the request is waiting for its token.
+            if self.mock_sleep.call_count == 1:
+                self.rate_limiter.on_rate_limited(2)
+
+        self.mock_sleep.side_effect = sleep
+
+        self.rate_limiter.acquire()
+
+        assert self.mock_sleep.call_args_list == [
+            mock.call(pytest.approx(0.1)),
+            mock.call(pytest.approx(2)),
+        ]
+
+    def test_acquire_async(self):
+        with mock.patch(
+            "magic_admin.utils.rate_limit.asyncio.sleep",
+        ) as mock_async_sleep:
+            for _ in range(3):
+                asyncio.run(self.rate_limiter.acquire_async())
+
+        mock_async_sleep.assert_called_once_with(pytest.approx(0.1))
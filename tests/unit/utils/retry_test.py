@@ -0,0 +1,241 @@
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from unittest import mock
+
+import pytest
+from requests.packages.urllib3 import PoolManager
+from requests.packages.urllib3.exceptions import MaxRetryError
+from requests.packages.urllib3.exceptions import ReadTimeoutError
+
+from magic_admin.utils.retry import RETRY_STATUSES
+from magic_admin.utils.retry import RetryPolicy
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """Answer with the queued statuses, then with 200."""
+
+    statuses = []
+    retry_after = None
+
+    def _respond(self):
+        self.server.requests.append(self.command)
+        status = self.statuses.pop(0) if self.statuses else 200
+
+        self.send_response(status)
+
+        if self.retry_after is not None:
+            self.send_header("Retry-After", self.retry_after)
+
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRetryPolicy:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.policy = RetryPolicy(3, 0.1, backoff_max=1)
+
+    def test_init(self):
+        assert self.policy.retry_statuses == RETRY_STATUSES
+        assert self.policy.budget is None
+
+    @pytest.mark.parametrize(
+        ("method", "status_code", "expected"),
+        [
+            ("get", 503, True),
+            ("GET", 500, True),
+            ("GET", 404, False),
+            ("post", 429, True),
+            ("POST", 503, True),
+            ("POST", 500, False),
+            ("DELETE", 503, False),
+        ],
+    )
+    def test_is_retryable_status(self, method, status_code, expected):
+        assert self.policy.is_retryable_status(method, status_code) is expected
+
+    @pytest.mark.parametrize(
+        ("method", "expected"),
+        [("get", True), ("DELETE", True), ("post", False), ("PATCH", False)],
+    )
+    def test_is_idempotent(self, method, expected):
+        assert self.policy.is_idempotent(method) is expected
+
+    def test_get_backoff(self):
+        with mock.patch(
+            "magic_admin.utils.retry.random.uniform",
+            side_effect=lambda low, high: high,
+        ) as mock_uniform:
+            assert self.policy.get_backoff() == 0.1
+            assert self.policy.get_backoff(0.2) == pytest.approx(0.6)
+            assert self.policy.get_backoff(0.5) == 1
+
+        assert mock_uniform.call_args_list[0] == mock.call(0.1, 0.1)
+        assert mock_uniform.call_args_list[1] == mock.call(0.1, pytest.approx(0.6))
+
+    @pytest.mark.parametrize(
+        ("retry_after", "expected"),
+        [
+            (None, None),
+            ("troll", None),
+            ("0.5", 0.5),
+            ("3600", 3600),
+        ],
+    )
+    def test_get_retry_after(self, retry_after, expected):
+        assert self.policy.get_retry_after(retry_after) == expected
+
+    def test_accepts_retry_after(self):
+        assert self.policy.accepts_retry_after(1)
+        assert not self.policy.accepts_retry_after(1.5)
+
+    def test_fits_budget(self):
+        assert self.policy.fits_budget(100, 100)
+
+        self.policy.budget = 1
+
+        assert self.policy.fits_budget(0.5, 0.5)
+        assert not self.policy.fits_budget(0.5, 0.6)
+        assert self.policy.get_stats()["budget_exhausted"] == 1
+
+    def test_get_stats(self):
+        self.policy.record_retry()
+        self.policy.record_retry(ValueError())
+
+        assert self.policy.get_stats() == {
+            "status_retries": 1,
+            "error_retries": 1,
+            "budget_exhausted": 0,
+            "retries": 2,
+        }
+
+
+class TestPolicyRetry:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        StatusHandler.statuses = []
+        StatusHandler.retry_after = None
+
+        self.server = HTTPServer(("127.0.0.1", 0), StatusHandler)
+        self.server.requests = []
+        self.url = "http://127.0.0.1:{}/".format(self.server.server_port)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+
+        self.policy = RetryPolicy(2, 0.001)
+
+        yield
+
+        self.server.shutdown()
+        self.server.server_close()
+
+    def request(self, method, get_rate_limiter=None):
+        retry = self.policy.to_urllib3_retry(get_rate_limiter=get_rate_limiter)
+
+        with PoolManager(retries=retry) as http:
+            return http.request(method, self.url)
+
+    def test_retries_get_on_server_errors(self):
+        StatusHandler.statuses = [500, 503]
+
+        resp = self.request("GET")
+
+        assert resp.status == 200
+        assert self.server.requests == ["GET"] * 3
+        assert self.policy.get_stats()["status_retries"] == 2
+
+    def test_does_not_retry_post_on_server_errors(self):
+        StatusHandler.statuses = [500]
+
+        resp = self.request("POST")
+
+        assert resp.status == 500
+        assert self.server.requests == ["POST"]
+        assert self.policy.get_stats()["retries"] == 0
+
+    def test_returns_last_response_when_retries_are_exhausted(self):
+        StatusHandler.statuses = [503] * 3
+
+        resp = self.request("POST")
+
+        assert resp.status == 503
+        assert self.server.requests == ["POST"] * 3
+
+    def test_waits_for_retry_after(self):
+        StatusHandler.statuses = [429]
+        StatusHandler.retry_after = "0.01"
+
+        with mock.patch(
+            "magic_admin.utils.retry.PolicyRetry._sleep_backoff",
+        ) as mock_sleep_backoff:
+            resp = self.request("GET")
+
+        assert resp.status == 200
+        mock_sleep_backoff.assert_called_once_with()
+
+    def test_does_not_retry_retry_after_longer_than_backoff_max(self):
+        StatusHandler.statuses = [429]
+        StatusHandler.retry_after = "3600"
+        self.policy.backoff_max = 0.01
+        rate_limiter = mock.Mock()
+
+        resp = self.request("GET", get_rate_limiter=lambda: rate_limiter)
+
+        assert resp.status == 429
+        assert self.server.requests == ["GET"]
+        # The response is returned to the HTTP client, which reports it.
+        rate_limiter.on_response.assert_not_called()
+        assert self.policy.get_stats()["retries"] == 0
+
+    def test_shares_rate_limiter_with_retries(self):
+        StatusHandler.statuses = [429, 503]
+        StatusHandler.retry_after = "0.01"
+        rate_limiter = mock.Mock()
+
+        resp = self.request("POST", get_rate_limiter=lambda: rate_limiter)
+
+        assert resp.status == 200
+        # Every retry takes a token, and the retried responses are reported.
+        # The last one is reported by the HTTP client.
+        assert rate_limiter.acquire.call_count == 2
+        assert rate_limiter.on_response.call_args_list == [
+            mock.call(429, 0.01),
+            mock.call(503, 0.01),
+        ]
+
+    def test_stops_retrying_when_budget_is_exhausted(self):
+        self.policy.budget = 1
+        StatusHandler.statuses = [503] * 3
+        StatusHandler.retry_after = "2"
+
+        resp = self.request("GET")
+
+        assert resp.status == 503
+        assert self.server.requests == ["GET"]
+        assert self.policy.get_stats()["budget_exhausted"] == 1
+
+    def test_retries_connection_errors(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+        with pytest.raises(MaxRetryError):
+            self.request("POST")
+
+        assert self.policy.get_stats()["error_retries"] == 2
+
+    @pytest.mark.parametrize(("method", "retried"), [("GET", True), ("POST", False)])
+    def test_retries_read_errors_of_idempotent_methods(self, method, retried):
+        retry = self.policy.to_urllib3_retry()
+        error = ReadTimeoutError(None, self.url, "Read timed out.")
+
+        if retried:
+            assert retry.increment(method, self.url, error=error).total == 1
+        else:
+            with pytest.raises(ReadTimeoutError):
+                retry.increment(method, self.url, error=error)
@@ -0,0 +1,110 @@
+import json
+from unittest import mock
+
+import pytest
+
+from magic_admin.utils import signature
+from magic_admin.utils.signature import CoincurveRecoveryBackend
+from magic_admin.utils.signature import EthKeysRecoveryBackend
+from magic_admin.utils.signature import get_recovery_backend
+from magic_admin.utils.signature import parse_signature
+from magic_admin.utils.signature import set_recovery_backend
+from magic_admin.utils.signature import to_checksum_address
+from magic_admin.utils.signature import Web3RecoveryBackend
+from testing.data.did_token import claim
+from testing.data.did_token import proof
+from testing.data.did_token import public_address
+
+
+class TestParseSignature:
+    signature = bytes(64)
+
+    @pytest.mark.parametrize("v,expected_v", [(0, 0), (1, 1), (27, 0), (28, 1)])
+    def test_normalizes_recovery_id(self, v, expected_v):
+        assert parse_signature(self.signature + bytes([v])) == self.signature + bytes(
+            [expected_v],
+        )
+
+    def test_decodes_hex_string(self):
+        assert parse_signature(proof) == parse_signature(bytes.fromhex(proof[2:]))
+
+    def test_raises_error_if_length_is_invalid(self):
+        with pytest.raises(ValueError) as e:
+            parse_signature(self.signature)
+
+        assert str(e.value) == "Signature has to be 65 bytes long, got 64."
+
+    def test_raises_error_if_recovery_id_is_invalid(self):
+        with pytest.raises(ValueError) as e:
+            parse_signature(self.signature + bytes([29]))
+
+        assert str(e.value) == "Signature has an invalid recovery id: 2."
+
+
+def test_to_checksum_address():
+    assert (
+        to_checksum_address(bytes.fromhex(public_address[2:].lower())) == public_address
+    )
+
+
+class TestRecoveryBackends:
+    message = json.dumps(claim, separators=(",", ":"))
+
+    @pytest.mark.parametrize(
+        "backend_cls",
+        [CoincurveRecoveryBackend, EthKeysRecoveryBackend, Web3RecoveryBackend],
+    )
+    def test_recover(self, backend_cls):
+        try:
+            backend = backend_cls()
+        except ImportError:
+            pytest.skip("{} is not installed.".format(backend_cls.name))
+
+        assert backend.recover(self.message, proof) == public_address
+
+    @pytest.mark.parametrize(
+        "backend_cls",
+        [CoincurveRecoveryBackend, EthKeysRecoveryBackend, Web3RecoveryBackend],
+    )
+    def test_recover_raises_error_without_signer(self, backend_cls):
+        try:
+            backend = backend_cls()
+        except ImportError:
+            pytest.skip("{} is not installed.".format(backend_cls.name))
+
+        # r and s out of the range of the curve order.
+        with pytest.raises(ValueError):
+            backend.recover(self.message, "0x" + "ff" * 64 + "1c")
+
+    def test_recover_other_message(self):
+        assert (
+            EthKeysRecoveryBackend().recover(self.message + " ", proof)
+            != public_address
+        )
+
+
+class TestGetRecoveryBackend:
+    @pytest.fixture(autouse=True)
+    def reset_backend(self):
+        set_recovery_backend(None)
+        yield
+        set_recovery_backend(None)
+
+    def test_returns_first_importable_backend(self):
+        class MissingBackend:
+            def __init__(self):
+                raise ImportError()
+
+        with mock.patch.object(
+            signature,
+            "RECOVERY_BACKENDS",
+            (MissingBackend, EthKeysRecoveryBackend),
+        ):
+            assert isinstance(get_recovery_backend(), EthKeysRecoveryBackend)
+
+    def test_returns_installed_backend(self):
+        backend = mock.Mock()
+
+        set_recovery_backend(backend)
+
+        assert get_recovery_backend() is backend